@@ -0,0 +1,66 @@
+"""Benchmark: classification d'un arbre, fichier par fichier vs classify_files().
+
+Usage:
+    python benchmarks/bench_classify.py --root <dossier> [--workers 8] [--runs 3]
+
+La reference appelle is_probably_binary puis detect_text_encoding pour chaque
+fichier (deux ouvertures, boucle Python par octet). classify_files() ouvre
+chaque fichier une fois, compte les controles via bytes.translate et parallelise
+les lectures disque dans un pool de threads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Permet de lancer le script depuis la racine du depot.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from usbide.encoding import classify_files, detect_text_encoding, is_probably_binary  # noqa: E402
+
+
+def sequential(paths: list[Path]) -> None:
+    for path in paths:
+        try:
+            if not is_probably_binary(path):
+                detect_text_encoding(path)
+        except (OSError, SyntaxError):
+            continue
+
+
+def collect(root: Path) -> list[Path]:
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in {".git", "__pycache__"}]
+        paths.extend(Path(dirpath) / name for name in filenames)
+    return paths
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--root", type=Path, default=Path.cwd())
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+
+    paths = collect(args.root.resolve())
+    for label, fn in (
+        ("fichier par fichier", lambda: sequential(paths)),
+        ("classify_files", lambda: classify_files(paths, workers=args.workers)),
+    ):
+        durations = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+        print(f"{label:<20} {len(paths)} fichiers: median {statistics.median(durations) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Benchmark: recherche floue (Ctrl+P) sur un workspace reel ou synthetique.
+
+Usage:
+    python benchmarks/bench_fuzzy.py [--root <dossier>] [--synthetic 100000] [--runs 5]
+
+Sans --root, genere une liste de chemins synthetiques. Affiche le temps de
+construction du FuzzyMatcher puis le temps median par requete, en simulant
+la frappe lettre par lettre.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Permet de lancer le script depuis la racine du depot.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from usbide.fuzzy import FuzzyMatcher  # noqa: E402
+from usbide.index import WorkspaceIndex  # noqa: E402
+
+_WORDS = ["src", "lib", "usbide", "app", "tests", "core", "utils", "models", "views", "config", "widgets", "main"]
+_QUERIES = ["app", "mainpy", "tests/app", "usbcfg", "zzq"]
+
+
+def synthetic(count: int) -> list[str]:
+    rng = random.Random(1)
+    paths = []
+    for i in range(count):
+        folder = "/".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 5)))
+        paths.append(f"{folder}/{rng.choice(_WORDS)}_{i}.{rng.choice(['py', 'md', 'txt', 'json'])}")
+    return paths
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--root", type=Path, default=None)
+    p.add_argument("--synthetic", type=int, default=100_000)
+    p.add_argument("--runs", type=int, default=5)
+    args = p.parse_args()
+
+    if args.root is not None:
+        index = WorkspaceIndex(args.root.resolve())
+        index.refresh()
+        paths = index.paths()
+    else:
+        paths = synthetic(args.synthetic)
+
+    start = time.perf_counter()
+    matcher = FuzzyMatcher(paths)
+    print(f"construction ({len(paths)} chemins): {(time.perf_counter() - start) * 1000:.0f} ms")
+    for query in _QUERIES:
+        durations = []
+        for _ in range(args.runs):
+            # Frappe lettre par lettre, comme dans la palette.
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                matcher.search(query[:end])
+                durations.append(time.perf_counter() - start)
+        print(
+            f"{query:<12} median {statistics.median(durations) * 1000:6.2f} ms"
+            f"  max {max(durations) * 1000:6.2f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
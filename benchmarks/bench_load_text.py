@@ -0,0 +1,97 @@
+"""Benchmark: ouverture de gros fichiers, sequence historique vs load_text().
+
+Usage:
+    python benchmarks/bench_load_text.py [--sizes 10 100] [--runs 3]
+
+La sequence historique (is_probably_binary + detect_text_encoding + read_text)
+relit et redecode le fichier plusieurs fois; load_text() lit les bytes une
+seule fois. Deux profils sont mesures: UTF-8 et cp1252 (pire cas historique,
+qui decode le fichier en entier pour chaque candidat echoue).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+# Permet de lancer le script depuis la racine du depot.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from usbide.encoding import is_probably_binary, load_text  # noqa: E402
+
+
+def legacy_detect(path: Path) -> str:
+    """Detection d'origine: decodage complet du fichier par candidat."""
+    for enc in ("utf-8", "utf-8-sig", "cp1252", "latin-1"):
+        try:
+            path.read_text(encoding=enc)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return "utf-8"
+
+
+def legacy_open(path: Path) -> str:
+    """Sequence d'ouverture d'origine de l'editeur."""
+    if is_probably_binary(path):
+        return ""
+    encoding = legacy_detect(path)
+    try:
+        return path.read_text(encoding=encoding)
+    except UnicodeDecodeError:
+        return path.read_text(encoding=encoding, errors="replace")
+
+
+def single_pass_open(path: Path) -> str:
+    return load_text(path).text
+
+
+def make_file(path: Path, size_mb: int, encoding: str) -> None:
+    line = "2026-01-31T18:23:39 INFO café crème brûlée - ligne de journal €\n"
+    chunk = (line * 1024).encode(encoding)
+    with path.open("wb") as handle:
+        for _ in range(max(1, size_mb * 1024 * 1024 // len(chunk))):
+            handle.write(chunk)
+    if encoding == "cp1252":
+        # Un seul octet invalide en UTF-8, en fin de fichier: pire cas de detection.
+        with path.open("ab") as handle:
+            handle.write(b"\xe9\n")
+
+
+def bench(fn: Callable[[Path], str], path: Path, runs: int) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(path)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100], help="Tailles en Mo.")
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in args.sizes:
+            for encoding in ("utf-8", "cp1252"):
+                path = Path(tmp_dir) / f"bench-{size_mb}-{encoding}.log"
+                make_file(path, size_mb, encoding)
+                legacy = bench(legacy_open, path, args.runs)
+                single = bench(single_pass_open, path, args.runs)
+                print(
+                    f"{size_mb:>4} Mo {encoding:<7} historique {legacy * 1000:8.1f} ms | "
+                    f"load_text {single * 1000:8.1f} ms | gain x{legacy / single:.1f}"
+                )
+                path.unlink()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
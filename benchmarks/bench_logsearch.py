@@ -0,0 +1,67 @@
+"""Benchmark: filtre des journaux sur un gros historique.
+
+Usage:
+    python benchmarks/bench_logsearch.py [--lines 1000000] [--runs 3]
+
+Genere un historique synthetique (sortie pip/PyInstaller), mesure la
+construction du corpus (texte + index des debuts de ligne), puis le temps
+median par requete: texte, texte sans casse, regex avec et sans fragment fixe.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Permet de lancer le script depuis la racine du depot.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from usbide.logsearch import LogCorpus  # noqa: E402
+
+_LINES = [
+    "Collecting {name}=={major}.{minor}",
+    "  Downloading {name}-{major}.{minor}-py3-none-any.whl (120 kB)",
+    "INFO: Analyzing hidden import '{name}.core'",
+    "Requirement already satisfied: {name} in ./vendor",
+]
+_QUERIES = [("ERROR: Failed", False), ("error", False), ("^ERROR.*build", True), ("hook-\\w+\\.py", True)]
+
+
+def synthetic(count: int) -> list[str]:
+    rng = random.Random(1)
+    lines = []
+    for i in range(count):
+        if i % 20_000 == 0:
+            lines.append(f"ERROR: Failed building wheel for pkg{i}")
+        else:
+            line = rng.choice(_LINES)
+            lines.append(line.format(name=f"pkg{rng.randrange(500)}", major=rng.randrange(9), minor=i % 30))
+    return lines
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--lines", type=int, default=1_000_000)
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+
+    lines = synthetic(args.lines)
+    start = time.perf_counter()
+    corpus = LogCorpus(lines)
+    print(f"construction ({len(lines)} lignes): {(time.perf_counter() - start) * 1000:.0f} ms")
+    for query, regex in _QUERIES:
+        durations = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            matches, _ = corpus.find(query, regex=regex)
+            durations.append(time.perf_counter() - start)
+        print(f"{query:<16} {len(matches):>6} ligne(s)  median {statistics.median(durations) * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
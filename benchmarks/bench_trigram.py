@@ -0,0 +1,87 @@
+"""Benchmark: recherche plein texte avec et sans index de trigrammes.
+
+Usage:
+    python benchmarks/bench_trigram.py [--root <dossier>] [--synthetic 5000] [--runs 3]
+
+Sans --root, genere un workspace synthetique dans un dossier temporaire.
+Affiche le temps de construction de l'index, sa taille sur disque, puis le
+temps median par requete (lecture de tous les fichiers vs candidats seuls).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Permet de lancer le script depuis la racine du depot.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from usbide.index import WorkspaceIndex  # noqa: E402
+from usbide.search import WorkspaceSearch  # noqa: E402
+from usbide.trigram import TrigramIndex  # noqa: E402
+
+_WORDS = ["def", "return", "import", "class", "self", "value", "total", "config", "widget", "render", "path"]
+_QUERIES = ["compute_total", "class Widget", "zzq_absent", "def"]
+
+
+def synthetic(root: Path, count: int) -> None:
+    rng = random.Random(1)
+    for i in range(count):
+        folder = root / f"pkg{i % 50}"
+        folder.mkdir(exist_ok=True)
+        lines = [" ".join(rng.choice(_WORDS) for _ in range(8)) for _ in range(120)]
+        if i % 500 == 0:
+            lines.append("result = compute_total(values)")
+        (folder / f"mod_{i}.py").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def bench(root: Path, runs: int) -> None:
+    index = WorkspaceIndex(root)
+    index.refresh()
+    paths = index.paths()
+    trigrams = TrigramIndex(root)
+    start = time.perf_counter()
+    trigrams.update(paths)
+    print(f"construction ({len(paths)} fichiers): {(time.perf_counter() - start) * 1000:.0f} ms")
+    trigrams.save()
+    print(f"taille sur disque: {trigrams.path.stat().st_size / 1024:.0f} Ko")
+    start = time.perf_counter()
+    TrigramIndex(root).load()
+    print(f"chargement: {(time.perf_counter() - start) * 1000:.0f} ms")
+    for label, engine in (
+        ("scan complet", WorkspaceSearch(root, lambda: paths)),
+        ("trigrammes", WorkspaceSearch(root, lambda: paths, trigrams=trigrams)),
+    ):
+        for query in _QUERIES:
+            durations = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                engine.run(query, lambda hits: None, threading.Event())
+                durations.append(time.perf_counter() - start)
+            print(f"{label:<13} {query:<14} median {statistics.median(durations) * 1000:8.1f} ms")
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--root", type=Path, default=None)
+    p.add_argument("--synthetic", type=int, default=5000)
+    p.add_argument("--runs", type=int, default=3)
+    args = p.parse_args()
+
+    if args.root is not None:
+        bench(args.root.resolve(), args.runs)
+        return 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        synthetic(Path(tmp_dir), args.synthetic)
+        bench(Path(tmp_dir), args.runs)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
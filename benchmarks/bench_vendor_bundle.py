@@ -0,0 +1,73 @@
+"""Benchmark: demarrage a froid avec et sans bundle zipimport du vendor.
+
+Usage:
+    python benchmarks/bench_vendor_bundle.py --root <workspace> [--module textual.app] [--runs 5]
+
+Chaque mesure lance un interpreteur neuf (-S: sans site-packages) qui importe le
+module cible depuis `.usbide/vendor` seul, puis depuis `vendor.zip` + vendor.
+Sur une cle FAT32/exFAT, debrancher/rebrancher la cle entre deux series donne
+la mesure "cache froid" la plus realiste.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Permet de lancer le script depuis la racine du depot.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from usbide.vendor_bundle import build_vendor_bundle, fresh_vendor_bundle, vendor_dir  # noqa: E402
+
+_SNIPPET = (
+    "import sys, time\n"
+    "sys.path[:0] = {paths!r}\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - t)\n"
+)
+
+
+def measure(paths: list[str], module: str, runs: int) -> tuple[list[float], list[float]]:
+    """Retourne (durees d'import, durees totales du process) en secondes."""
+    imports: list[float] = []
+    totals: list[float] = []
+    code = _SNIPPET.format(paths=paths, module=module)
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-S", "-c", code], check=True, capture_output=True, text=True)
+        totals.append(time.perf_counter() - start)
+        imports.append(float(out.stdout.strip().splitlines()[-1]))
+    return imports, totals
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--root", type=Path, default=Path.cwd())
+    p.add_argument("--module", default="textual.app")
+    p.add_argument("--runs", type=int, default=5)
+    args = p.parse_args()
+
+    root_dir = args.root.resolve()
+    vendor = str(vendor_dir(root_dir).resolve())
+    bundle = fresh_vendor_bundle(root_dir)
+    if bundle is None:
+        print(build_vendor_bundle(root_dir).summary())
+        bundle = fresh_vendor_bundle(root_dir)
+    assert bundle is not None
+
+    for label, paths in (("vendor", [vendor]), ("vendor.zip", [str(bundle), vendor])):
+        imports, totals = measure(paths, args.module, args.runs)
+        print(
+            f"{label:<11} import {args.module}: median {statistics.median(imports) * 1000:.1f} ms "
+            f"(min {min(imports) * 1000:.1f}) | process: median {statistics.median(totals) * 1000:.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
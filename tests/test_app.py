@@ -5,6 +5,9 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from usbide.app import OpenFile, USBIDEApp
+from usbide.encoding import load_text
+from usbide.filecache import ClassificationCache
+from usbide.fileio import content_hash
 
 
 class TestUSBIDEAppTitle(unittest.TestCase):
@@ -36,8 +39,8 @@ class TestUSBIDEAppTitle(unittest.TestCase):
             self.assertIn("utf-8", app.sub_title)
 
 
-class TestUSBIDEAppSave(unittest.TestCase):
-    def test_action_save_ok(self) -> None:
+class TestUSBIDEAppSave(unittest.IsolatedAsyncioTestCase):
+    async def test_action_save_ok(self) -> None:
         # Une sauvegarde reussie doit retourner True et ecrire le contenu.
         with tempfile.TemporaryDirectory() as tmp_dir:
             root_dir = Path(tmp_dir)
@@ -48,11 +51,14 @@ class TestUSBIDEAppSave(unittest.TestCase):
             fake_editor.text = "Bonjour"
 
             with patch.object(app, "query_one", return_value=fake_editor):
-                self.assertTrue(app.action_save())
+                self.assertTrue(await app.action_save())
 
             self.assertEqual(path.read_text(encoding="utf-8"), "Bonjour")
+            self.assertFalse(app.current.dirty)
+            # Aucun fichier temporaire ne doit rester a cote de la cible.
+            self.assertEqual([p.name for p in root_dir.iterdir()], ["note.txt"])
 
-    def test_action_save_fallback_utf8(self) -> None:
+    async def test_action_save_fallback_utf8(self) -> None:
         # Un encodage incompatible doit declencher un fallback UTF-8.
         with tempfile.TemporaryDirectory() as tmp_dir:
             root_dir = Path(tmp_dir)
@@ -64,11 +70,12 @@ class TestUSBIDEAppSave(unittest.TestCase):
             fake_editor.text = accent
 
             with patch.object(app, "query_one", return_value=fake_editor):
-                self.assertTrue(app.action_save())
+                self.assertTrue(await app.action_save())
 
             self.assertEqual(path.read_text(encoding="utf-8"), accent)
+            self.assertEqual(app.current.encoding, "utf-8")
 
-    def test_action_save_oserror(self) -> None:
+    async def test_action_save_oserror(self) -> None:
         # Une erreur d'ecriture doit retourner False.
         with tempfile.TemporaryDirectory() as tmp_dir:
             root_dir = Path(tmp_dir)
@@ -79,8 +86,482 @@ class TestUSBIDEAppSave(unittest.TestCase):
             fake_editor.text = "Bonjour"
 
             with patch.object(app, "query_one", return_value=fake_editor):
-                with patch.object(Path, "write_text", side_effect=OSError("boom")):
-                    self.assertFalse(app.action_save())
+                with patch("usbide.app.save_text", side_effect=OSError("boom")):
+                    self.assertFalse(await app.action_save())
+            self.assertTrue(app.current.dirty)
+
+    async def test_action_save_contenu_inchange_non_ecrit(self) -> None:
+        # Meme empreinte que la version chargee: aucune ecriture sur la cle.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "note.txt"
+            path.write_text("Bonjour", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            app.current = OpenFile(path=path, encoding="utf-8", dirty=True, saved_hash=content_hash("Bonjour"))
+            fake_editor = MagicMock()
+            fake_editor.text = "Bonjour"
+
+            with patch.object(app, "query_one", return_value=fake_editor):
+                with patch("usbide.fileio.atomic_write_bytes") as write:
+                    self.assertTrue(await app.action_save())
+
+            write.assert_not_called()
+            self.assertFalse(app.current.dirty)
+
+
+class TestUSBIDEAppOpenFile(unittest.IsolatedAsyncioTestCase):
+    async def _attendre_ouverture(self, app: USBIDEApp, pilot) -> None:
+        # Le chargeur de DirectoryTree ne se termine jamais: on n'attend que l'ouverture
+        # (les chargements perimes sont annules par le worker exclusif).
+        workers = [w for w in app.workers if w.group == "open_file" and not w.is_cancelled]
+        # Liste vide = attente de TOUS les workers: seulement si un chargement est encore en cours.
+        if workers:
+            await app.workers.wait_for_complete(workers)
+        await pilot.pause()
+
+    async def test_ouverture_hors_boucle_ui(self) -> None:
+        # Le fichier est charge par un worker, puis l'indicateur disparait.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "main.py"
+            path.write_text("print('ok')\n", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                app._open_path(path)
+                self.assertTrue(app.query_one("#editor").loading)
+                await self._attendre_ouverture(app, pilot)
+
+                editor = app.query_one("#editor")
+                self.assertFalse(editor.loading)
+                self.assertEqual(editor.text, "print('ok')\n")
+                self.assertEqual(app.current.path, path)
+
+    async def test_resultat_perime_ignore(self) -> None:
+        # Seule la derniere selection met a jour l'editeur.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            premier = root_dir / "a.py"
+            second = root_dir / "b.py"
+            premier.write_text("A = 1\n", encoding="utf-8")
+            second.write_text("B = 2\n", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                app._open_path(premier)
+                app._open_path(second)
+                await self._attendre_ouverture(app, pilot)
+                # Un resultat tardif du premier chargement arrive apres coup.
+                app._apply_loaded(1, premier, load_text(premier))
+
+                self.assertEqual(app.query_one("#editor").text, "B = 2\n")
+                self.assertEqual(app.current.path, second)
+
+    async def test_fichier_absent_journalise(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                with patch.object(app, "_log_issue") as log_issue:
+                    app._open_path(root_dir / "absent.py")
+                    await self._attendre_ouverture(app, pilot)
+
+                self.assertIn("Acces fichier impossible", log_issue.call_args.args[0])
+                self.assertFalse(app.query_one("#editor").loading)
+                self.assertIsNone(app.current)
+
+
+    async def test_ouverture_ne_marque_pas_modifie(self) -> None:
+        # Le Changed emis par le chargement de l'editeur n'est pas une edition.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "main.py"
+            path.write_text("x = 1\n", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                app._open_path(path)
+                await self._attendre_ouverture(app, pilot)
+                await pilot.pause()
+
+                self.assertFalse(app.current.dirty)
+
+    async def test_buffers_restaures_depuis_le_cache(self) -> None:
+        # Revenir sur un buffer restaure texte, curseur, etat modifie et annulation sans relire le disque.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            premier = root_dir / "a.py"
+            second = root_dir / "b.py"
+            premier.write_text("A = 1\n", encoding="utf-8")
+            second.write_text("B = 2\n", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                app._open_path(premier)
+                await self._attendre_ouverture(app, pilot)
+                editor = app.query_one("#editor")
+                editor.insert("# modif\n", (0, 0))
+                await pilot.pause()
+                self.assertTrue(app.current.dirty)
+
+                app._open_path(second)
+                await self._attendre_ouverture(app, pilot)
+                self.assertEqual(editor.text, "B = 2\n")
+
+                with patch("usbide.app.load_text", side_effect=AssertionError("relecture disque")):
+                    app._open_path(premier)
+                    await pilot.pause()
+
+                self.assertEqual(editor.text, "# modif\nA = 1\n")
+                self.assertEqual(editor.cursor_location, (1, 0))
+                self.assertTrue(app.current.dirty)
+                self.assertEqual(app.query_one("#buffers").tab_count, 2)
+                editor.undo()
+                self.assertEqual(editor.text, "A = 1\n")
+
+
+    async def test_classification_memorisee(self) -> None:
+        # Le premier chargement alimente le cache; l'encodage est ensuite reutilise.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "note.txt"
+            path.write_bytes("caf\u00e9\n".encode("cp1252"))
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                app._open_path(path)
+                await self._attendre_ouverture(app, pilot)
+
+            connu = ClassificationCache(root_dir).lookup(path)
+            self.assertIsNotNone(connu)
+            self.assertEqual(connu.encoding, "cp1252")
+
+
+class TestUSBIDEAppExternalChange(unittest.IsolatedAsyncioTestCase):
+    async def _attendre(self, pilot, condition, timeout: float = 5.0) -> bool:
+        # Evenement du watcher (thread) puis relecture (worker): on scrute l'etat de l'UI.
+        for _ in range(int(timeout / 0.05)):
+            if condition():
+                return True
+            await pilot.pause(0.05)
+        return condition()
+
+    async def _ouvrir(self, app: USBIDEApp, pilot, path: Path) -> None:
+        app._open_path(path)
+        await self._attendre(pilot, lambda: app.current is not None and app.current.path == path)
+        await pilot.pause()
+
+    async def test_buffer_propre_recharge(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "main.py"
+            path.write_text("a = 1\n", encoding="utf-8")
+            with patch.dict(os.environ, {"USBIDE_WATCHER": "poll", "USBIDE_WATCH_INTERVAL": "0.05"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await self._ouvrir(app, pilot, path)
+                    editor = app.query_one("#editor")
+
+                    path.write_text("a = 2  # codex\n", encoding="utf-8")
+
+                    self.assertTrue(await self._attendre(pilot, lambda: editor.text == "a = 2  # codex\n"))
+                    await pilot.pause()
+                    self.assertFalse(app.current.dirty)
+                    self.assertEqual(app.current.saved_hash, content_hash("a = 2  # codex\n"))
+
+    async def test_buffer_modifie_demande_confirmation(self) -> None:
+        from usbide.screens import ConfirmScreen
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "main.py"
+            path.write_text("a = 1\n", encoding="utf-8")
+            with patch.dict(os.environ, {"USBIDE_WATCHER": "poll", "USBIDE_WATCH_INTERVAL": "0.05"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await self._ouvrir(app, pilot, path)
+                    editor = app.query_one("#editor")
+                    editor.insert("# local\n", (0, 0))
+                    await pilot.pause()
+
+                    path.write_text("a = 3\n", encoding="utf-8")
+
+                    self.assertTrue(await self._attendre(pilot, lambda: isinstance(app.screen, ConfirmScreen)))
+                    # Le texte local n'est pas touche tant que l'utilisateur n'a pas repondu.
+                    self.assertEqual(editor.text, "# local\na = 1\n")
+                    await pilot.press("n")
+                    await pilot.pause()
+                    self.assertEqual(editor.text, "# local\na = 1\n")
+                    self.assertTrue(app.current.dirty)
+                    # Refus: la sauvegarde suivante ecrit bien la version de l'editeur.
+                    self.assertIsNone(app.current.saved_hash)
+
+    async def test_propre_sauvegarde_ignoree(self) -> None:
+        # Notre propre ecriture ne doit ni recharger ni ouvrir de conflit.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "main.py"
+            path.write_text("a = 1\n", encoding="utf-8")
+            with patch.dict(os.environ, {"USBIDE_WATCHER": "poll", "USBIDE_WATCH_INTERVAL": "0.05"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await self._ouvrir(app, pilot, path)
+                    editor = app.query_one("#editor")
+                    editor.insert("# local\n", (0, 0))
+                    await pilot.pause()
+                    with patch.object(app, "_reload_buffer") as reload_buffer:
+                        self.assertTrue(await app.action_save())
+                        await pilot.pause(0.3)
+                    reload_buffer.assert_not_called()
+                    self.assertIs(app.screen, app.screen_stack[0])
+
+
+class TestUSBIDEAppWatchedTree(unittest.IsolatedAsyncioTestCase):
+    async def _attendre(self, pilot, condition, timeout: float = 5.0) -> bool:
+        for _ in range(int(timeout / 0.05)):
+            if condition():
+                return True
+            await pilot.pause(0.05)
+        return condition()
+
+    def _libelles(self, app: USBIDEApp) -> list[str]:
+        from usbide.tree import WorkspaceTree
+
+        return [str(child.label) for child in app.query_one(WorkspaceTree).root.children]
+
+    async def test_fichier_externe_ajoute_a_l_arbre_et_a_l_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "main.py").write_text("", encoding="utf-8")
+            with patch.dict(os.environ, {"USBIDE_WATCHER": "poll", "USBIDE_WATCH_INTERVAL": "0.05"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    self.assertTrue(await self._attendre(pilot, lambda: root_dir in app._watched_dirs))
+                    self.assertTrue(await self._attendre(pilot, lambda: app._fuzzy is not None))
+
+                    # Ecriture hors IDE (Codex, shell): ni Ctrl+R ni rechargement complet.
+                    (root_dir / "genere.py").write_text("", encoding="utf-8")
+
+                    self.assertTrue(await self._attendre(pilot, lambda: "genere.py" in self._libelles(app)))
+                    self.assertTrue(
+                        await self._attendre(
+                            pilot, lambda: [m.path for m in app._fuzzy.search("genere")] == ["genere.py"]
+                        )
+                    )
+
+    async def test_ctrl_r_verifie_sans_recharger(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "main.py").write_text("", encoding="utf-8")
+            with patch.dict(os.environ, {"USBIDE_WATCHER": "off"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    self.assertTrue(await self._attendre(pilot, lambda: "main.py" in self._libelles(app)))
+                    (root_dir / "neuf.py").write_text("", encoding="utf-8")
+                    os.utime(root_dir, ns=(1, 1))
+
+                    from usbide.tree import WorkspaceTree
+
+                    with patch.object(WorkspaceTree, "reload") as reload, patch.object(app, "_log_ui") as log_ui:
+                        await pilot.press("ctrl+r")
+                        messages = lambda: [c.args[0] for c in log_ui.call_args_list if "arborescence" in c.args[0]]
+                        self.assertTrue(await self._attendre(pilot, messages))
+                    reload.assert_not_called()
+                    self.assertIn("1 dossier(s) mis a jour", messages()[0])
+                    self.assertIn("neuf.py", self._libelles(app))
+
+
+class TestUSBIDEAppFuzzyFinder(unittest.IsolatedAsyncioTestCase):
+    async def test_ctrl_p_ouvre_le_fichier_choisi(self) -> None:
+        from usbide.screens import FuzzyFinderScreen
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "workspace" / "client_A").mkdir(parents=True)
+            cible = root_dir / "workspace" / "client_A" / "main.py"
+            cible.write_text("print('ok')\n", encoding="utf-8")
+            (root_dir / "workspace" / "notes.txt").write_text("", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                for _ in range(100):
+                    if app._fuzzy is not None:
+                        break
+                    await pilot.pause(0.05)
+
+                await pilot.press("ctrl+p")
+                await pilot.pause()
+                self.assertIsInstance(app.screen, FuzzyFinderScreen)
+                await pilot.press(*"mainpy")
+                await pilot.press("enter")
+                # Le chargement peut deja etre termine: on scrute le buffer courant.
+                for _ in range(100):
+                    if app.current is not None:
+                        break
+                    await pilot.pause(0.05)
+
+                self.assertEqual(app.current.path, cible)
+                self.assertEqual(app.query_one("#editor").text, "print('ok')\n")
+
+    async def test_index_pas_pret(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = USBIDEApp(root_dir=Path(tmp_dir))
+            with patch.object(app, "_log_ui") as log_ui:
+                app.action_find_file()
+            self.assertIn("Index", log_ui.call_args.args[0])
+
+
+class TestUSBIDEAppSearch(unittest.IsolatedAsyncioTestCase):
+    async def test_ctrl_f_ouvre_a_la_ligne(self) -> None:
+        from usbide.screens import SearchScreen
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "src").mkdir()
+            cible = root_dir / "src" / "main.py"
+            cible.write_text("import os\n\nvaleur = chercher_ici()\n", encoding="utf-8")
+            (root_dir / "autre.txt").write_text("rien\n", encoding="utf-8")
+            # PATH sans rg: moteur integre (pool de threads).
+            with patch.dict(os.environ, {"PATH": str(root_dir / "vide")}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await pilot.press("ctrl+f")
+                    await pilot.pause()
+                    self.assertIsInstance(app.screen, SearchScreen)
+                    app.screen.query_one("#search_input").value = "chercher"
+                    for _ in range(100):
+                        if app.screen._hits:
+                            break
+                        await pilot.pause(0.05)
+                    await pilot.press("enter")
+                    for _ in range(100):
+                        if app.current is not None:
+                            break
+                        await pilot.pause(0.05)
+                    await pilot.pause()
+
+                    self.assertEqual(app.current.path, cible)
+                    self.assertEqual(app.query_one("#editor").cursor_location, (2, 9))
+
+
+class TestUSBIDEAppSymbols(unittest.IsolatedAsyncioTestCase):
+    async def test_f12_va_a_la_definition(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "pkg").mkdir()
+            appelant = root_dir / "pkg" / "main.py"
+            appelant.write_text("from pkg.outils import calculer\n\ncalculer()\n", encoding="utf-8")
+            cible = root_dir / "pkg" / "outils.py"
+            cible.write_text("import os\n\n\ndef calculer():\n    pass\n", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                for _ in range(100):
+                    if app._symbol_palette is not None:
+                        break
+                    await pilot.pause(0.05)
+                self.assertTrue(app._symbols.definitions("calculer"))
+                app._open_path(appelant)
+                await pilot.pause()
+                app.query_one("#editor").move_cursor((2, 3))
+
+                await pilot.press("f12")
+                for _ in range(100):
+                    if app.current is not None and app.current.path == cible:
+                        break
+                    await pilot.pause(0.05)
+                await pilot.pause()
+
+                self.assertEqual(app.current.path, cible)
+                self.assertEqual(app.query_one("#editor").cursor_location, (3, 0))
+
+    async def test_palette_des_symboles(self) -> None:
+        from usbide.screens import FuzzyFinderScreen
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            cible = root_dir / "modele.py"
+            cible.write_text("class Commande:\n    def valider(self):\n        pass\n", encoding="utf-8")
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                for _ in range(100):
+                    if app._symbol_palette is not None:
+                        break
+                    await pilot.pause(0.05)
+                await pilot.press("ctrl+o")
+                await pilot.pause()
+                self.assertIsInstance(app.screen, FuzzyFinderScreen)
+                app.screen.query_one("#finder_input").value = "Commande.valider"
+                await pilot.pause()
+                await pilot.press("enter")
+                for _ in range(100):
+                    if app.current is not None:
+                        break
+                    await pilot.pause(0.05)
+                await pilot.pause()
+
+                self.assertEqual(app.current.path, cible)
+                self.assertEqual(app.query_one("#editor").cursor_location, (1, 4))
+
+
+class TestUSBIDEAppBoundedLogs(unittest.IsolatedAsyncioTestCase):
+    async def test_journal_borne_persiste_sur_disque(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            with patch.dict(os.environ, {"USBIDE_LOG_MAX_LINES": "100"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await pilot.pause()
+                    for i in range(300):
+                        app._log_output(f"sortie {i}")
+                    app._codex_log_ui("[green]reponse codex[/green]")
+                    await pilot.pause()
+                    log = app.query_one("#log")
+
+                    self.assertLessEqual(len(log.lines), 100)
+                    self.assertEqual(log.history.lines()[-1], "sortie 299")
+                    self.assertIn("archivee", log.border_subtitle)
+                    self.assertTrue(app._session_log.flush())
+                    text = app._session_log.path.read_text(encoding="utf-8")
+                    self.assertIn("[journal] sortie 0\n", text)
+                    self.assertIn("[codex] reponse codex\n", text)
+
+
+class TestUSBIDEAppLogFilter(unittest.IsolatedAsyncioTestCase):
+    async def test_filtre_historique_et_lignes_archivees(self) -> None:
+        from usbide.screens import LogFilterScreen
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            with patch.dict(os.environ, {"USBIDE_LOG_MAX_LINES": "100"}):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await pilot.pause()
+                    for i in range(300):
+                        app._log_output(f"ERREUR {i}" if i % 50 == 0 else f"sortie {i}")
+                    await pilot.pause()
+
+                    await pilot.press("ctrl+g")
+                    await pilot.pause()
+                    screen = app.screen
+                    self.assertIsInstance(screen, LogFilterScreen)
+                    for _ in range(100):
+                        if screen._corpus is not None:
+                            break
+                        await pilot.pause(0.05)
+                    screen.query_one("#log_filter_input").value = "erreur"
+                    for _ in range(100):
+                        if screen._matches:
+                            break
+                        await pilot.pause(0.05)
+
+                    texts = [match.text for match in screen._matches]
+                    # ERREUR 0..200 sont archivees, ERREUR 250 est encore dans le panneau.
+                    self.assertEqual(texts, [f"ERREUR {i}" for i in range(0, 300, 50)])
+                    self.assertGreaterEqual(screen._corpus.archived, 200)
+                    results = screen.query_one("#log_filter_results")
+                    self.assertEqual(results.highlighted, 5)
+                    await pilot.press("f3")
+                    self.assertEqual(results.highlighted, 0)
+                    await pilot.press("shift+f3")
+                    self.assertEqual(results.highlighted, 5)
+
+                    await pilot.press("enter")
+                    await pilot.pause()
+                    self.assertNotIsInstance(app.screen, LogFilterScreen)
 
 
 class TestUSBIDEAppPortableEnv(unittest.TestCase):
@@ -564,6 +1045,8 @@ class TestUSBIDEAppBugLog(unittest.TestCase):
             app = USBIDEApp(root_dir=root_dir)
 
             app._record_issue("erreur", "Erreur test", contexte="test_unitaire")
+            # Ecriture en fond: on attend qu'elle soit faite.
+            self.assertTrue(app._incidents.flush())
 
             contenu = (root_dir / "bug.md").read_text(encoding="utf-8")
             self.assertIn("niveau: erreur", contenu)
@@ -605,6 +1088,7 @@ class TestUSBIDEAppStreamLog(unittest.IsolatedAsyncioTestCase):
                     contexte="test subprocess",
                 )
 
+            self.assertTrue(app._incidents.flush())
             contenu = (root_dir / "bug.md").read_text(encoding="utf-8")
             self.assertIn("rc=2", contenu)
 
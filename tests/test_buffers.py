@@ -0,0 +1,60 @@
+import os
+import unittest
+from dataclasses import dataclass
+from pathlib import Path
+from unittest import mock
+
+from usbide.buffers import DEFAULT_BUFFER_BUDGET_MB, BufferCache, buffer_budget, buffer_cost
+
+
+@dataclass
+class _Buffer:
+    path: Path
+    text: str
+    dirty: bool = False
+
+
+class TestBufferCache(unittest.TestCase):
+    def test_eviction_lru_des_buffers_propres(self) -> None:
+        # Le moins recemment utilise part en premier, le plus recent reste.
+        a, b, c = (_Buffer(Path(nom), "x" * 1000) for nom in "abc")
+        cache: BufferCache[_Buffer] = BufferCache(budget=buffer_cost(a) * 2)
+        self.assertEqual(cache.put(a), [])
+        self.assertEqual(cache.put(b), [])
+        cache.get(Path("a"))
+
+        evinces = cache.put(c)
+
+        self.assertEqual(evinces, [b])
+        self.assertEqual([buf.path.name for buf in cache], ["a", "c"])
+
+    def test_buffer_modifie_jamais_evince(self) -> None:
+        a = _Buffer(Path("a"), "x" * 1000, dirty=True)
+        b = _Buffer(Path("b"), "y" * 1000)
+        cache: BufferCache[_Buffer] = BufferCache(budget=0)
+        cache.put(a)
+
+        evinces = cache.put(b)
+
+        self.assertEqual(evinces, [])
+        self.assertIn(Path("a"), cache)
+        self.assertIn(Path("b"), cache)
+
+    def test_remove(self) -> None:
+        cache: BufferCache[_Buffer] = BufferCache(budget=10**6)
+        cache.put(_Buffer(Path("a"), ""))
+        self.assertIsNotNone(cache.remove(Path("a")))
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(Path("a")))
+
+
+class TestBufferBudget(unittest.TestCase):
+    def test_budget_variable_environnement(self) -> None:
+        with mock.patch.dict(os.environ, {"USBIDE_BUFFER_BUDGET_MB": "2"}):
+            self.assertEqual(buffer_budget(), 2 * 1024 * 1024)
+        with mock.patch.dict(os.environ, {"USBIDE_BUFFER_BUDGET_MB": "n/a"}):
+            self.assertEqual(buffer_budget(), DEFAULT_BUFFER_BUDGET_MB * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,61 @@
+import random
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from usbide.encoding import detect_text_encoding, is_probably_binary
+from usbide.encoding import (
+    EncodingSniffer,
+    _looks_binary,
+    classify_files,
+    detect_text_encoding,
+    is_probably_binary,
+    load_text,
+)
+from usbide.filecache import Classification, ClassificationCache
+
+
+def _detection_historique(path: Path) -> str:
+    """Reference: decodage complet pour chaque candidat (implementation d'origine)."""
+    for enc in ("utf-8", "utf-8-sig", "cp1252", "latin-1"):
+        try:
+            path.read_text(encoding=enc)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return "utf-8"
+
+
+def _binaire_historique(data: bytes) -> bool:
+    """Reference: boucle octet par octet d'origine."""
+    if b"\x00" in data:
+        return True
+    if not data:
+        return False
+    ctrl = 0
+    for b in data:
+        if b in (9, 10, 13):
+            continue
+        if b < 32 or b == 127:
+            ctrl += 1
+    return (ctrl / len(data)) > 0.10
+
+
+def _octets_aleatoires(rng: random.Random) -> bytes:
+    """Melange de texte UTF-8, d'octets cp1252/latin-1 et de sequences tronquees."""
+    morceaux = [
+        b"ligne ascii\n",
+        "\u00e9\u00e8\u20ac\u4e2d".encode("utf-8"),
+        "\u00e9\u20ac".encode("utf-8")[:-1],
+        b"\xef\xbb\xbf",
+        b"\x80\x9f\xe9",
+        b"\x81",
+        b"\x9d",
+        b"\xf0\x9f\x98\x80",
+        b"\r\n",
+    ]
+    poids = [30, 20, 1, 2, 3, 1, 1, 5, 5]
+    return b"".join(rng.choices(morceaux, weights=poids, k=rng.randint(0, 40)))
 
 
 class TestIsProbablyBinary(unittest.TestCase):
@@ -47,3 +100,176 @@ class TestDetectTextEncoding(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmp_dir:
             path = Path(tmp_dir) / "absent.txt"
             self.assertEqual(detect_text_encoding(path), "utf-8")
+
+
+class TestLoadText(unittest.TestCase):
+    def test_utf8_normalise_les_fins_de_ligne(self) -> None:
+        # Meme texte que read_text() (mode universel), en une seule lecture.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "texte.txt"
+            path.write_bytes("é1\r\nligne 2\rfin".encode("utf-8"))
+            loaded = load_text(path)
+            self.assertEqual(loaded.encoding, "utf-8")
+            self.assertEqual(loaded.text, path.read_text(encoding="utf-8"))
+            self.assertEqual(loaded.lines, 3)
+            self.assertEqual(loaded.size, path.stat().st_size)
+            self.assertFalse(loaded.binary)
+
+    def test_fallback_cp1252(self) -> None:
+        # Un octet invalide en UTF-8 doit basculer sur cp1252 comme detect_text_encoding.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "ansi.txt"
+            path.write_bytes("caf\u00e9 \u20ac\n".encode("cp1252"))
+            loaded = load_text(path)
+            self.assertEqual(loaded.encoding, detect_text_encoding(path))
+            self.assertEqual(loaded.text, "caf\u00e9 \u20ac\n")
+
+    def test_cookie_pep263(self) -> None:
+        # Les sources Python respectent le cookie d'encodage.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "mod.py"
+            path.write_bytes("# -*- coding: latin-1 -*-\nX = '\u00e9'\n".encode("latin-1"))
+            loaded = load_text(path)
+            self.assertEqual(loaded.encoding, "iso-8859-1")
+            self.assertIn("\u00e9", loaded.text)
+
+    def test_binaire_detecte(self) -> None:
+        # Un binaire ne doit pas etre decode.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "data.bin"
+            path.write_bytes(b"\x00\x01\x02texte")
+            loaded = load_text(path)
+            self.assertTrue(loaded.binary)
+            self.assertEqual(loaded.text, "")
+
+    def test_binaire_lu_sur_l_echantillon_seul(self) -> None:
+        # Un gros binaire est rejete sans lire au-dela de l'echantillon.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "archive.zip"
+            path.write_bytes(b"PK\x03\x04\x00\x00" + b"\x00" * 100_000)
+            lus: list[int] = []
+            ouvrir = Path.open
+
+            class Espion:
+                def __init__(self, handle) -> None:
+                    self._handle = handle
+
+                def __enter__(self):
+                    return self
+
+                def __exit__(self, *exc) -> None:
+                    self._handle.close()
+
+                def fileno(self) -> int:
+                    return self._handle.fileno()
+
+                def read(self, n: int = -1) -> bytes:
+                    data = self._handle.read(n)
+                    lus.append(len(data))
+                    return data
+
+            with patch.object(Path, "open", lambda self, *a, **k: Espion(ouvrir(self, *a, **k))):
+                loaded = load_text(path, sniff_bytes=2048)
+
+            self.assertTrue(loaded.binary)
+            self.assertEqual(loaded.size, 100_006)
+            self.assertEqual(lus, [2048])
+
+    def test_acces_impossible_declenche_erreur(self) -> None:
+        # Les erreurs d'acces remontent pour un message precis dans l'UI.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(OSError):
+                load_text(Path(tmp_dir) / "absent.txt")
+
+
+class TestDetectTextEncodingIncrementale(unittest.TestCase):
+    def test_memes_reponses_que_le_decodage_complet(self) -> None:
+        # Propriete: pour des contenus aleatoires et des blocs minuscules (coupures
+        # au milieu des sequences UTF-8), la reponse reste celle d'origine.
+        rng = random.Random(1234)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "alea.txt"
+            for taille_bloc in (1, 2, 3, 7, 64):
+                with patch("usbide.encoding._SAMPLE_BYTES", taille_bloc), patch(
+                    "usbide.encoding._CHUNK_BYTES", taille_bloc * 3
+                ):
+                    for _ in range(150):
+                        data = _octets_aleatoires(rng)
+                        path.write_bytes(data)
+                        with self.subTest(bloc=taille_bloc, data=data):
+                            self.assertEqual(detect_text_encoding(path), _detection_historique(path))
+
+    def test_load_text_coherent_avec_la_detection(self) -> None:
+        # Propriete: load_text choisit le meme encodage que detect_text_encoding.
+        rng = random.Random(99)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "alea.txt"
+            for _ in range(200):
+                data = _octets_aleatoires(rng)
+                path.write_bytes(data)
+                loaded = load_text(path, sniff_bytes=0)
+                with self.subTest(data=data):
+                    self.assertEqual(loaded.encoding, detect_text_encoding(path))
+
+    def test_bom_utf8(self) -> None:
+        # Un BOM suivi d'UTF-8 valide reste "utf-8" (comme read_text historique).
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "bom.txt"
+            path.write_bytes(b"\xef\xbb\xbf" + "caf\u00e9".encode("utf-8"))
+            self.assertEqual(detect_text_encoding(path), "utf-8")
+            path.write_bytes(b"\xef\xbb\xbfcaf\xe9")
+            self.assertEqual(detect_text_encoding(path), "cp1252")
+
+    def test_sortie_anticipee_quand_seul_latin1_reste(self) -> None:
+        # Des que utf-8 et cp1252 ont echoue, la reponse ne peut plus changer.
+        sniffer = EncodingSniffer()
+        sniffer.feed(b"\x81\xe9")
+        self.assertTrue(sniffer.done)
+        self.assertEqual(sniffer.result(), "latin-1")
+
+
+class TestClassifyFiles(unittest.TestCase):
+    def test_comptage_vectorise_identique_a_la_boucle(self) -> None:
+        # Propriete: translate/len donne le meme verdict que la boucle historique.
+        rng = random.Random(36)
+        for _ in range(500):
+            data = bytes(rng.choices(range(256), k=rng.randint(0, 64)))
+            data += bytes(rng.choices(b"abc \t\n\r\x01\x1b\x7f", k=rng.randint(0, 64)))
+            with self.subTest(data=data):
+                self.assertEqual(_looks_binary(data), _binaire_historique(data))
+
+    def test_lot_avec_cache_et_fichier_absent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            texte = root_dir / "a.txt"
+            texte.write_bytes("caf\u00e9".encode("cp1252"))
+            binaire = root_dir / "b.bin"
+            binaire.write_bytes(b"\x00\x01")
+            source = root_dir / "c.py"
+            source.write_bytes(b"# -*- coding: latin-1 -*-\nx = 1\n")
+            absent = root_dir / "absent.txt"
+            cache = ClassificationCache(root_dir)
+
+            resultats = classify_files([texte, binaire, source, absent], workers=4, cache=cache)
+
+            self.assertEqual(resultats[texte], Classification(binary=False, encoding="cp1252"))
+            self.assertTrue(resultats[binaire].binary)
+            self.assertEqual(resultats[source].encoding, "iso-8859-1")
+            self.assertIsNone(resultats[absent])
+            # Deuxieme passe: tout vient du cache persistant, aucun fichier relu.
+            with patch("usbide.encoding.classify_file", side_effect=AssertionError("relu")):
+                again = classify_files([texte, binaire], cache=ClassificationCache(root_dir))
+            self.assertEqual(again[texte].encoding, "cp1252")
+
+    def test_coherent_avec_la_detection(self) -> None:
+        rng = random.Random(360)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = []
+            for i in range(60):
+                path = Path(tmp_dir) / f"f{i}.txt"
+                path.write_bytes(_octets_aleatoires(rng))
+                paths.append(path)
+            for path, result in classify_files(paths, workers=8).items():
+                with self.subTest(path=path.name):
+                    if not result.binary:
+                        self.assertEqual(result.encoding, detect_text_encoding(path))
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from usbide.encoding import load_text
+from usbide.filecache import Classification, ClassificationCache, classification_cache_path
+
+
+class TestClassificationCache(unittest.TestCase):
+    def test_persistance_et_invalidation_par_mtime(self) -> None:
+        # Une entree survit a un redemarrage et tombe si le fichier change.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "note.txt"
+            path.write_text("abc\n", encoding="cp1252")
+            cache = ClassificationCache(root_dir)
+            cache.store(path, path.stat(), Classification(binary=False, encoding="cp1252", lines=1))
+            self.assertFalse(classification_cache_path(root_dir).exists())
+            cache.flush()
+
+            relu = ClassificationCache(root_dir)
+            self.assertEqual(relu.lookup(path), Classification(binary=False, encoding="cp1252", lines=1))
+
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            self.assertIsNone(relu.lookup(path))
+
+    def test_ecriture_par_lots(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            cache = ClassificationCache(root_dir, flush_every=2)
+            for nom in ("a", "b"):
+                path = root_dir / nom
+                path.write_bytes(b"x")
+                cache.store(path, path.stat(), Classification(binary=False, encoding="utf-8"))
+
+            self.assertTrue(classification_cache_path(root_dir).exists())
+
+    def test_cache_corrompu_ignore(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            cache_path = classification_cache_path(root_dir)
+            cache_path.parent.mkdir(parents=True)
+            cache_path.write_text("{pas du json", encoding="utf-8")
+            path = root_dir / "a.txt"
+            path.write_bytes(b"x")
+
+            self.assertIsNone(ClassificationCache(root_dir).lookup(path))
+
+
+class TestLoadTextEncodageConnu(unittest.TestCase):
+    def test_encodage_fourni_saute_la_detection(self) -> None:
+        # Encodage issu du cache: decodage direct, sans echantillon ni detection.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "note.txt"
+            path.write_bytes("café\r\n".encode("cp1252"))
+            loaded = load_text(path, encoding="cp1252")
+            self.assertEqual((loaded.text, loaded.encoding, loaded.lines), ("café\n", "cp1252", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
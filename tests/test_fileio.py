@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from usbide.fileio import atomic_write_bytes, content_hash, save_text
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def test_remplace_et_nettoie(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.txt"
+            path.write_bytes(b"ancien")
+            atomic_write_bytes(path, b"nouveau")
+            self.assertEqual(path.read_bytes(), b"nouveau")
+            self.assertEqual(os.listdir(tmp_dir), ["a.txt"])
+
+    def test_echec_garde_l_ancienne_version(self) -> None:
+        # os.replace en echec: la cible reste intacte et le temporaire disparait.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.txt"
+            path.write_bytes(b"ancien")
+            with mock.patch("usbide.fileio.os.replace", side_effect=OSError("boom")):
+                with self.assertRaises(OSError):
+                    atomic_write_bytes(path, b"nouveau")
+            self.assertEqual(path.read_bytes(), b"ancien")
+            self.assertEqual(os.listdir(tmp_dir), ["a.txt"])
+
+
+class TestSaveText(unittest.TestCase):
+    def test_saute_si_empreinte_identique(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.txt"
+            result = save_text(path, "texte", "utf-8", previous_hash=content_hash("texte"))
+            self.assertFalse(result.written)
+            self.assertFalse(path.exists())
+
+    def test_repli_utf8(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.txt"
+            result = save_text(path, "€", "latin-1")
+            self.assertTrue(result.fallback)
+            self.assertEqual(result.encoding, "utf-8")
+            self.assertEqual(path.read_text(encoding="utf-8"), "€")
+            self.assertEqual(result.digest, content_hash("€"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from usbide.fuzzy import FuzzyMatcher
+
+
+class TestFuzzyMatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.matcher = FuzzyMatcher(
+            [
+                "workspace/client_A/main.py",
+                "workspace/client_A/README.md",
+                "usbide/app.py",
+                "usbide/screens.py",
+                "tests/test_app.py",
+                "docs/mapping/apply.txt",
+                "Fichier Accentue/Ecole.txt",
+            ]
+        )
+
+    def test_sous_sequence_obligatoire(self) -> None:
+        paths = [m.path for m in self.matcher.search("scrn")]
+        self.assertEqual(paths, ["usbide/screens.py"])
+        self.assertEqual(self.matcher.search("xyz"), [])
+
+    def test_nom_de_fichier_et_segments_prioritaires(self) -> None:
+        # Debut de nom de fichier (le plus court d'abord), puis debut de segment interne ("test_app").
+        paths = [m.path for m in self.matcher.search("app")]
+        self.assertEqual(paths[:3], ["usbide/app.py", "docs/mapping/apply.txt", "tests/test_app.py"])
+
+    def test_initiales_de_segments(self) -> None:
+        paths = [m.path for m in self.matcher.search("wcm")]
+        self.assertEqual(paths[0], "workspace/client_A/main.py")
+
+    def test_casse_et_espaces_ignores(self) -> None:
+        self.assertEqual(self.matcher.search("ECOLE")[0].path, "Fichier Accentue/Ecole.txt")
+        self.assertEqual(self.matcher.search("main py")[0].path, "workspace/client_A/main.py")
+
+    def test_positions_pour_surlignage(self) -> None:
+        match = self.matcher.search("app")[0]
+        self.assertEqual(match.positions, (7, 8, 9))
+        self.assertEqual("".join(match.path[p] for p in match.positions).lower(), "app")
+
+    def test_requete_vide_et_limite(self) -> None:
+        tout = self.matcher.search("")
+        self.assertEqual(len(tout), 7)
+        # Les chemins courts d'abord.
+        self.assertEqual(tout[0].path, "usbide/app.py")
+        self.assertEqual(len(self.matcher.search("", limit=2)), 2)
+        self.assertEqual(len(self.matcher.search("a", limit=3)), 3)
+
+    def test_caracteres_hors_alphabet(self) -> None:
+        matcher = FuzzyMatcher(["notes/été.md", "notes/ete.md"])
+        self.assertEqual([m.path for m in matcher.search("été")], ["notes/été.md"])
+
+    def test_liste_vide(self) -> None:
+        self.assertEqual(FuzzyMatcher([]).search("a"), [])
+
+    def test_grand_workspace(self) -> None:
+        # Beaucoup de candidats: seuls les premiers (chemins courts) sont notes, le bon sort en tete.
+        paths = [f"src/module_{i:05d}/helpers.py" for i in range(20_000)] + ["pkg/main.py"]
+        matcher = FuzzyMatcher(paths)
+        self.assertEqual(matcher.search("main")[0].path, "pkg/main.py")
+        self.assertEqual(len(matcher.search("helpers", limit=10)), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
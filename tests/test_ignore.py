@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from usbide.ignore import IgnoreRules, parse_rules, user_ignore_path
+
+
+class TestParseRules(unittest.TestCase):
+    def test_commentaires_et_lignes_vides(self) -> None:
+        self.assertEqual(parse_rules("# commentaire\n\n   \n"), [])
+
+    def test_options_de_regle(self) -> None:
+        regle = parse_rules("!/build/\n")[0]
+        self.assertTrue(regle.negated)
+        self.assertTrue(regle.dir_only)
+        self.assertTrue(regle.anchored)
+        self.assertTrue(regle.regex.fullmatch("build"))
+
+
+class TestIgnoreRules(unittest.TestCase):
+    def _regles(self, root: Path, gitignore: str, extra: str = "") -> IgnoreRules:
+        (root / ".gitignore").write_text(gitignore, encoding="utf-8")
+        if extra:
+            user_ignore_path(root).parent.mkdir(parents=True, exist_ok=True)
+            user_ignore_path(root).write_text(extra, encoding="utf-8")
+        return IgnoreRules(root)
+
+    def test_motifs_gitignore(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            regles = self._regles(root, "*.log\n/secret.txt\nlogs/\ndocs/**/*.tmp\n!garde.log\n")
+            cas = [
+                ("a.log", False, True),
+                ("src/b.log", False, True),
+                ("garde.log", False, False),
+                ("secret.txt", False, True),
+                # Ancre: seul le fichier a la racine est exclu.
+                ("src/secret.txt", False, False),
+                ("logs", True, True),
+                # "logs/" ne vise que des dossiers.
+                ("logs", False, False),
+                ("docs/a/b/c.tmp", False, True),
+                ("docs/c.tmp", False, True),
+                ("src/main.py", False, False),
+            ]
+            for rel, is_dir, attendu in cas:
+                with self.subTest(rel=rel, is_dir=is_dir):
+                    self.assertEqual(regles.is_ignored(root / rel, is_dir), attendu)
+
+    def test_gitignore_de_sous_dossier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "pkg").mkdir()
+            (root / "pkg" / ".gitignore").write_text("/genere.py\n", encoding="utf-8")
+            regles = self._regles(root, "")
+            self.assertTrue(regles.is_ignored(root / "pkg" / "genere.py", False))
+            self.assertFalse(regles.is_ignored(root / "genere.py", False))
+
+    def test_usbide_ignore_prioritaire(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            regles = self._regles(root, "*.csv\n", extra="!data.csv\nbrouillons/\n")
+            self.assertFalse(regles.is_ignored(root / "data.csv", False))
+            self.assertTrue(regles.is_ignored(root / "autre.csv", False))
+            self.assertTrue(regles.is_ignored(root / "brouillons", True))
+
+    def test_empreinte_et_invalidation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            regles = self._regles(root, "*.log\n")
+            avant = regles.fingerprint()
+            self.assertTrue(regles.is_ignored(root / "a.log", False))
+
+            (root / ".gitignore").write_text("*.tmp\n", encoding="utf-8")
+            self.assertNotEqual(regles.fingerprint(), avant)
+            # Cache: l'ancienne regle reste active jusqu'a l'invalidation.
+            self.assertTrue(regles.is_ignored(root / "a.log", False))
+            regles.invalidate()
+            self.assertFalse(regles.is_ignored(root / "a.log", False))
+
+    def test_hors_workspace_et_racine(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            regles = self._regles(root, "*\n")
+            self.assertFalse(regles.is_ignored(root, True))
+            self.assertFalse(regles.is_ignored(root.parent / "ailleurs.txt", False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide.incidents import IncidentWriter, bug_max_bytes, fingerprint
+
+
+def _erreur(message: str) -> FileNotFoundError:
+    try:
+        raise FileNotFoundError(message)
+    except FileNotFoundError as exc:
+        return exc
+
+
+class TestIncidentWriter(unittest.TestCase):
+    def test_premiere_occurrence_complete(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "bug.md"
+            writer = IncidentWriter(path)
+
+            key = writer.record("erreur", "Codex introuvable", contexte="codex_exec", exc=_erreur("codex missing"))
+            writer.record("avertissement", "rc=2", contexte="shell", details="cmd")
+            self.assertTrue(writer.flush())
+            writer.close()
+
+            contenu = path.read_text(encoding="utf-8")
+            self.assertIn("- contexte: codex_exec", contenu)
+            self.assertIn(f"- empreinte: {key}", contenu)
+            self.assertIn("- exception: FileNotFoundError: codex missing", contenu)
+            self.assertIn("Traceback (most recent call last):", contenu)
+            self.assertIn("- details: cmd", contenu)
+
+    def test_repetitions_regroupees(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "bug.md"
+            writer = IncidentWriter(path)
+
+            with patch("usbide.incidents.traceback.format_exception", return_value=["trace\n"]) as formatted:
+                for _ in range(5):
+                    writer.record("erreur", "Codex introuvable", contexte="codex_exec", exc=_erreur("x"))
+                self.assertTrue(writer.flush())
+                for _ in range(3):
+                    writer.record("erreur", "Codex introuvable", contexte="codex_exec", exc=_erreur("x"))
+                self.assertTrue(writer.flush())
+            writer.close()
+
+            # Trace formatee une seule fois; les repetitions sont resumees par ecriture.
+            self.assertEqual(formatted.call_count, 1)
+            contenu = path.read_text(encoding="utf-8")
+            self.assertEqual(contenu.count("- message: Codex introuvable"), 3)
+            self.assertIn("- repetitions: 4 (total 5,", contenu)
+            self.assertIn("- repetitions: 3 (total 8,", contenu)
+
+    def test_empreinte(self) -> None:
+        base = fingerprint("codex_exec", "Codex introuvable", "FileNotFoundError")
+        self.assertEqual(base, fingerprint("codex_exec", "Codex introuvable", "FileNotFoundError"))
+        self.assertNotEqual(base, fingerprint("codex_exec", "Codex introuvable", "PermissionError"))
+        self.assertNotEqual(base, fingerprint("shell", "Codex introuvable", "FileNotFoundError"))
+
+    def test_rotation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "bug.md"
+            writer = IncidentWriter(path, max_bytes=2048)
+
+            for i in range(60):
+                writer.record("erreur", f"incident {i} " + "x" * 100, contexte="test")
+                writer.flush()
+            writer.close()
+
+            self.assertLessEqual(path.stat().st_size, 2048)
+            self.assertIn("incident 59", path.read_text(encoding="utf-8"))
+            self.assertTrue((Path(tmp_dir) / "bug.1.md").is_file())
+            # Au plus trois fichiers tournes.
+            self.assertTrue((Path(tmp_dir) / "bug.3.md").is_file())
+            self.assertFalse((Path(tmp_dir) / "bug.4.md").exists())
+
+    def test_fichier_indisponible(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Dossier parent absent: l'incident est perdu sans lever d'erreur.
+            writer = IncidentWriter(Path(tmp_dir) / "absent" / "bug.md")
+            writer.record("erreur", "perdu", contexte="test")
+            self.assertTrue(writer.flush())
+            writer.close()
+
+    def test_reglage_de_taille(self) -> None:
+        with patch.dict(os.environ, {"USBIDE_BUG_MAX_KB": "64"}):
+            self.assertEqual(bug_max_bytes(), 64 * 1024)
+        with patch.dict(os.environ, {"USBIDE_BUG_MAX_KB": "abc"}):
+            self.assertEqual(bug_max_bytes(), 512 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
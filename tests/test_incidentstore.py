@@ -0,0 +1,93 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from usbide.incidents import IncidentWriter
+from usbide.incidentstore import IncidentRow, IncidentStore, incidents_db_path, report
+
+
+def _row(ts: float, contexte: str, message: str = "echec", niveau: str = "erreur") -> IncidentRow:
+    return IncidentRow(ts, niveau, contexte, message, "", None, f"{contexte}-{message}", None)
+
+
+class TestIncidentStore(unittest.TestCase):
+    def test_agregats_par_contexte_sur_la_periode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = IncidentStore(incidents_db_path(Path(tmp_dir)))
+            now = time.time()
+            store.add(
+                [_row(now - 10 * 86400, "shell")] * 5
+                + [_row(now - 60, "codex_exec", "ancien"), _row(now - 30, "codex_exec", "recent")]
+                + [_row(now - 120, "shell"), _row(now - 90, "build_exe", niveau="avertissement")]
+            )
+
+            groups = store.summary("contexte", since=now - 7 * 86400)
+            self.assertEqual([(g.key, g.count) for g in groups], [("codex_exec", 2), ("build_exe", 1), ("shell", 1)])
+            # Message de l'occurrence la plus recente du groupe.
+            self.assertEqual(groups[0].message, "recent")
+            self.assertEqual([g.key for g in store.summary("niveau", niveau="avertissement")], ["avertissement"])
+            self.assertEqual(store.summary("contexte", contexte="shell")[0].count, 6)
+            self.assertEqual(store.recent(limit=1)[0].message, "recent")
+            store.close()
+
+    def test_base_absente_non_creee(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = incidents_db_path(Path(tmp_dir))
+            store = IncidentStore(path)
+
+            self.assertEqual(store.summary(), [])
+            self.assertIn("Aucun incident", report(store))
+            self.assertFalse(path.exists())
+
+    def test_rapport(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = IncidentStore(incidents_db_path(Path(tmp_dir)))
+            now = time.time()
+            store.add([_row(now - 5, "codex_exec", "Codex introuvable")] * 3 + [_row(now - 5, "shell")])
+
+            texte = report(store, days=7, now=now)
+            self.assertIn("Incidents des 7 derniers jours par contexte", texte)
+            lignes = texte.splitlines()
+            self.assertIn("codex_exec", lignes[2])
+            self.assertIn("Codex introuvable", lignes[2])
+            self.assertTrue(lignes[2].split()[0] == "3")
+            self.assertIn("Derniers incidents", report(store, recent=True, contexte="shell", now=now))
+            store.close()
+
+
+class TestIncidentWriterStore(unittest.TestCase):
+    def test_chaque_occurrence_enregistree(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            writer = IncidentWriter(root / "bug.md", store=IncidentStore(incidents_db_path(root)))
+            for _ in range(3):
+                writer.record("erreur", "Codex introuvable", contexte="codex_exec", exc=FileNotFoundError("codex"))
+            writer.record("avertissement", "rc=2", contexte="shell", details="cmd")
+            self.assertTrue(writer.flush())
+            writer.close()
+
+            store = IncidentStore(incidents_db_path(root))
+            groups = store.summary()
+            self.assertEqual([(g.key, g.count) for g in groups], [("codex_exec", 3), ("shell", 1)])
+            dernier = store.recent(contexte="codex_exec", limit=1)[0]
+            self.assertEqual(dernier.exc_type, "FileNotFoundError")
+            self.assertEqual(dernier.exception, "FileNotFoundError: codex")
+            self.assertEqual(store.recent(contexte="shell")[0].details, "cmd")
+            store.close()
+
+    def test_base_indisponible_sans_effet_sur_bug_md(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            # Un fichier a la place du dossier .usbide: la base ne peut pas etre creee.
+            (root / ".usbide").write_text("", encoding="utf-8")
+            writer = IncidentWriter(root / "bug.md", store=IncidentStore(incidents_db_path(root)))
+            writer.record("erreur", "boom", contexte="shell")
+            self.assertTrue(writer.flush())
+            writer.close()
+
+            self.assertIn("- message: boom", (root / "bug.md").read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
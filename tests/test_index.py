@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide.index import WorkspaceIndex, index_path
+
+
+def _vieillir(root: Path) -> None:
+    # Des mtimes anciens evitent la relecture forcee des dossiers "trop recents".
+    ancien = 1_600_000_000 * 10**9
+    for dossier, _sous, _fichiers in os.walk(root):
+        os.utime(dossier, ns=(ancien, ancien))
+
+
+class TestWorkspaceIndex(unittest.TestCase):
+    def _workspace(self, root: Path) -> None:
+        (root / "workspace" / "pkg").mkdir(parents=True)
+        (root / "workspace" / "main.py").write_text("print('ok')\n", encoding="utf-8")
+        (root / "workspace" / "pkg" / "mod.py").write_text("x = 1\n", encoding="utf-8")
+        (root / "README.md").write_text("doc", encoding="utf-8")
+        # Dossiers lourds ou generes: jamais indexes.
+        (root / ".git").mkdir()
+        (root / ".git" / "HEAD").write_text("ref", encoding="utf-8")
+        (root / "node_modules" / "lib").mkdir(parents=True)
+        (root / "node_modules" / "lib" / "index.js").write_text("", encoding="utf-8")
+
+    def test_parcours_initial(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            self._workspace(root)
+            index = WorkspaceIndex(root)
+
+            stats = index.refresh()
+
+            self.assertEqual(
+                sorted(index.paths()),
+                ["README.md", "workspace/main.py", "workspace/pkg/mod.py"],
+            )
+            self.assertEqual(stats.files, 3)
+            self.assertEqual(len(index), 3)
+            entree = next(f for f in index.files() if f.path == "README.md")
+            self.assertEqual((entree.size, entree.kind), (3, "f"))
+
+    def test_persistance_et_relecture_incrementale(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            self._workspace(root)
+            _vieillir(root)
+            premier = WorkspaceIndex(root)
+            premier.refresh()
+            premier.save()
+            self.assertTrue(index_path(root).is_file())
+            # La creation de .usbide/ a touche la racine au premier enregistrement.
+            _vieillir(root)
+
+            second = WorkspaceIndex(root)
+            self.assertTrue(second.load())
+            with patch("usbide.index.os.scandir", side_effect=AssertionError("relecture")):
+                stats = second.refresh()
+            self.assertEqual(stats.scanned_dirs, 0)
+            self.assertEqual(sorted(second.paths()), sorted(premier.paths()))
+
+    def test_seul_le_dossier_modifie_est_relu(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            self._workspace(root)
+            _vieillir(root)
+            index = WorkspaceIndex(root)
+            index.refresh()
+
+            (root / "workspace" / "pkg" / "nouveau.py").write_text("", encoding="utf-8")
+            (root / "workspace" / "main.py").unlink()
+            stats = index.refresh()
+
+            self.assertEqual(stats.scanned_dirs, 2)
+            self.assertIn("workspace/pkg/nouveau.py", index.paths())
+            self.assertNotIn("workspace/main.py", index.paths())
+
+    def test_dossier_supprime_retire(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            self._workspace(root)
+            index = WorkspaceIndex(root)
+            index.refresh()
+
+            (root / "workspace" / "pkg" / "mod.py").unlink()
+            (root / "workspace" / "pkg").rmdir()
+            index.refresh()
+
+            self.assertEqual(sorted(index.paths()), ["README.md", "workspace/main.py"])
+
+    def test_mise_a_jour_ciblee(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            self._workspace(root)
+            index = WorkspaceIndex(root)
+            index.refresh()
+
+            (root / "workspace" / "neuf" / "sous").mkdir(parents=True)
+            (root / "workspace" / "neuf" / "sous" / "x.py").write_text("", encoding="utf-8")
+            (root / "workspace" / "pkg" / "mod.py").unlink()
+            (root / "workspace" / "pkg").rmdir()
+            (root / "autre.txt").write_text("", encoding="utf-8")
+
+            # Seul "workspace" est signale: la racine n'est pas relue.
+            self.assertTrue(index.update_dirs(["workspace"]))
+            self.assertEqual(
+                sorted(index.paths()),
+                ["README.md", "workspace/main.py", "workspace/neuf/sous/x.py"],
+            )
+            # Aucun fichier ajoute ou retire: rien a reconstruire.
+            self.assertFalse(index.update_dirs(["workspace"]))
+            # Dossier hors index (lourd): ignore.
+            self.assertFalse(index.update_dirs(["node_modules"]))
+
+    def test_index_corrompu_ignore(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            index_path(root).parent.mkdir(parents=True)
+            index_path(root).write_text("{pas du json", encoding="utf-8")
+
+            index = WorkspaceIndex(root)
+
+            self.assertFalse(index.load())
+            self.assertEqual(index.paths(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
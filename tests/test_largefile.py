@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from textual.widgets import TextArea
+
+from usbide.app import USBIDEApp
+from usbide.largefile import DEFAULT_LARGE_FILE_MB, LargeFileView, LineIndex, large_file_threshold
+
+
+class TestLineIndex(unittest.TestCase):
+    def _index(self, data: bytes, **build_kwargs) -> LineIndex:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = Path(tmp_dir.name) / "gros.log"
+        path.write_bytes(data)
+        index = LineIndex(path)
+        self.addCleanup(index.close)
+        index.build(**build_kwargs)
+        return index
+
+    def test_lignes_avec_saut_final(self) -> None:
+        index = self._index(b"alpha\nbeta\r\ngamma\n", chunk_bytes=4)
+        self.assertTrue(index.complete)
+        self.assertEqual(index.line_count, 3)
+        self.assertEqual([index.line(i) for i in range(3)], ["alpha", "beta", "gamma"])
+
+    def test_derniere_ligne_sans_saut(self) -> None:
+        index = self._index(b"un\ndeux")
+        self.assertEqual(index.line_count, 2)
+        self.assertEqual(index.line(1), "deux")
+        self.assertEqual(index.line(5), "")
+
+    def test_fichier_vide(self) -> None:
+        index = self._index(b"")
+        self.assertEqual(index.line_count, 1)
+        self.assertEqual(index.line(0), "")
+
+    def test_encodage_affine_pendant_l_indexation(self) -> None:
+        index = self._index("café\n".encode("cp1252"))
+        self.assertEqual(index.encoding, "cp1252")
+        self.assertEqual(index.line(0), "café")
+
+    def test_recherche_avant_et_arriere(self) -> None:
+        index = self._index(b"".join(b"ligne %d\n" % i for i in range(100)) + b"cible\n", chunk_bytes=64)
+        self.assertEqual(index.search("ligne 42", 0), 42)
+        self.assertEqual(index.search("cible", 0), 100)
+        self.assertEqual(index.search("ligne 7", 50, backward=True), 7)
+        self.assertIsNone(index.search("absent", 0))
+
+    def test_recherche_par_blocs_chevauchants(self) -> None:
+        # Un motif a cheval sur deux blocs doit etre trouve dans les deux sens.
+        index = self._index(b"aaaa\nbbbbbbb\nxxcible\nzz\n")
+        self.assertEqual(index.search("cible", 0, chunk_bytes=8), 2)
+        self.assertEqual(index.search("cible", 3, backward=True, chunk_bytes=8), 2)
+        self.assertIsNone(index.search("cible", 3, chunk_bytes=8))
+
+    def test_recherche_annulee(self) -> None:
+        index = self._index(b"a\nb\ncible\n")
+        cancel = mock.Mock()
+        cancel.is_set.return_value = True
+        self.assertIsNone(index.search("cible", 0, cancel=cancel))
+
+    def test_ligne_geante_decodee_partiellement(self) -> None:
+        # Seules les colonnes demandees sont decodees.
+        index = self._index("é".encode("utf-8") * 100_000 + b"\nfin\n")
+        self.assertEqual(index.line(0, max_chars=10), "é" * 10)
+        self.assertEqual(index.line(1, max_chars=10), "fin")
+
+    def test_annulation(self) -> None:
+        cancel = mock.Mock()
+        cancel.is_set.return_value = True
+        index = self._index(b"a\nb\n", cancel=cancel)
+        self.assertFalse(index.complete)
+
+
+class TestLargeFileThreshold(unittest.TestCase):
+    def test_seuil_par_defaut_et_variable(self) -> None:
+        with mock.patch.dict(os.environ, {"USBIDE_LARGE_FILE_MB": ""}):
+            self.assertEqual(large_file_threshold(), DEFAULT_LARGE_FILE_MB * 1024 * 1024)
+        with mock.patch.dict(os.environ, {"USBIDE_LARGE_FILE_MB": "0.5"}):
+            self.assertEqual(large_file_threshold(), 512 * 1024)
+        with mock.patch.dict(os.environ, {"USBIDE_LARGE_FILE_MB": "abc"}):
+            self.assertEqual(large_file_threshold(), DEFAULT_LARGE_FILE_MB * 1024 * 1024)
+
+
+class TestLargeFileApp(unittest.IsolatedAsyncioTestCase):
+    async def test_gros_fichier_ouvert_en_lecture_seule(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.dict(os.environ, {"USBIDE_LARGE_FILE_MB": "0.001"}):
+            root_dir = Path(tmp_dir)
+            gros = root_dir / "gros.txt"
+            gros.write_text("".join(f"ligne {i}\n" for i in range(500)), encoding="utf-8")
+            petit = root_dir / "petit.py"
+            petit.write_text("print('ok')\n", encoding="utf-8")
+
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                app.on_directory_tree_file_selected(SimpleNamespace(path=gros))
+                await app.workers.wait_for_complete([w for w in app.workers if w.group == "open_file"])
+                # Le chargeur de DirectoryTree ne se termine jamais: on n'attend que l'index.
+                await app.workers.wait_for_complete([w for w in app.workers if w.group == "large_index"])
+                await pilot.pause()
+
+                view = app.query_one("#large_view", LargeFileView)
+                self.assertTrue(view.display)
+                self.assertFalse(app.query_one(TextArea).display)
+                self.assertTrue(app.current.read_only)
+                self.assertEqual(view.index.line_count, 500)
+
+                view.find("ligne 420")
+                await app.workers.wait_for_complete([w for w in app.workers if w.group == "large_search"])
+                await pilot.pause()
+                self.assertEqual(view._match_line, 420)
+                self.assertFalse(await app.action_save())
+
+                app.on_directory_tree_file_selected(SimpleNamespace(path=petit))
+                await app.workers.wait_for_complete([w for w in app.workers if w.group == "open_file"])
+                await pilot.pause()
+                self.assertFalse(view.display)
+                self.assertIsNone(view.index)
+                self.assertFalse(app.current.read_only)
+                self.assertEqual(app.query_one(TextArea).text, "print('ok')\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
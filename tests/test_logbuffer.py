@@ -0,0 +1,80 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from textual.app import App, ComposeResult
+
+from usbide.logbuffer import LogHistory, LogPane, log_max_lines, plain_lines
+
+
+class TestLogHistory(unittest.TestCase):
+    def test_tampon_circulaire(self) -> None:
+        history = LogHistory(100)
+
+        history.append([f"ligne {i}" for i in range(100)])
+        self.assertEqual(history.dropped, 0)
+
+        history.append(["ligne 100", "ligne 101"])
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history.lines()[0], "ligne 2")
+        self.assertEqual(history.dropped, 2)
+
+        history.clear()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.dropped, 102)
+
+    def test_texte_brut(self) -> None:
+        self.assertEqual(plain_lines("[b]$[/b] pip\n[red]erreur[/red]"), ["$ pip", "erreur"])
+        # Balisage invalide: texte garde tel quel.
+        self.assertEqual(plain_lines("[/fin]"), ["[/fin]"])
+        self.assertEqual(plain_lines("[b]brut[/b]", markup=False), ["[b]brut[/b]"])
+
+    def test_budget_configurable(self) -> None:
+        with patch.dict(os.environ, {"USBIDE_LOG_MAX_LINES": "20000"}):
+            self.assertEqual(log_max_lines(), 20000)
+        with patch.dict(os.environ, {"USBIDE_LOG_MAX_LINES": "3"}):
+            self.assertEqual(log_max_lines(), 100)
+        with patch.dict(os.environ, {"USBIDE_LOG_MAX_LINES": "abc"}):
+            self.assertEqual(log_max_lines(), 5000)
+
+
+class _LogApp(App[None]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.received: list[str] = []
+
+    def compose(self) -> ComposeResult:
+        yield LogPane(id="log", markup=True, max_lines=100, sink=self.received.extend)
+
+    def on_mount(self) -> None:
+        # Ecrit avant que la taille soit connue: rejoue plus tard par RichLog.
+        self.query_one(LogPane).write("[b]demarrage[/b]")
+
+
+class TestLogPane(unittest.IsolatedAsyncioTestCase):
+    async def test_journal_borne(self) -> None:
+        app = _LogApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            pane = app.query_one(LogPane)
+            self.assertEqual(pane.history.lines(), ["demarrage"])
+
+            for i in range(250):
+                pane.write(f"[dim]ligne {i}[/dim]")
+            await pilot.pause()
+
+            self.assertLessEqual(len(pane.lines), 100)
+            self.assertEqual(len(pane.history), 100)
+            self.assertEqual(pane.history.lines()[-1], "ligne 249")
+            # Toutes les lignes partent vers le journal de session, une seule fois.
+            self.assertEqual(app.received[:2], ["demarrage", "ligne 0"])
+            self.assertEqual(len(app.received), 251)
+            self.assertEqual(pane.border_subtitle, "151 ligne(s) archivee(s)")
+
+            pane.clear()
+            self.assertEqual(len(pane.history), 0)
+            self.assertEqual(pane.border_subtitle, "251 ligne(s) archivee(s)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import re
+import unittest
+
+from usbide.logsearch import LogCorpus
+
+
+class TestLogCorpus(unittest.TestCase):
+    def _corpus(self) -> LogCorpus:
+        lines = ["$ pip install x", "Collecting x", "ERROR: no matching distribution", "error again error", "fin"]
+        return LogCorpus(lines, archived=2)
+
+    def test_une_entree_par_ligne_et_casse_intelligente(self) -> None:
+        corpus = self._corpus()
+        matches, truncated = corpus.find("error")
+        self.assertFalse(truncated)
+        self.assertEqual([(m.line, m.column, m.length) for m in matches], [(2, 0, 5), (3, 0, 5)])
+        self.assertEqual([m.line for m in corpus.find("ERROR")[0]], [2])
+
+    def test_regex_par_ligne(self) -> None:
+        corpus = self._corpus()
+        self.assertEqual([m.line for m in corpus.find("^E.*distribution$", regex=True)[0]], [2])
+        self.assertEqual([m.line for m in corpus.find("in(stall|g)", regex=True)[0]], [0, 1, 2])
+        # Le fragment obligatoire ne suffit pas: la regex est verifiee sur la ligne.
+        self.assertEqual(corpus.find("again$", regex=True)[0], [])
+        with self.assertRaises(re.error):
+            corpus.find("(", regex=True)
+
+    def test_limite_et_position_dans_le_panneau(self) -> None:
+        corpus = LogCorpus([f"ligne {i}" for i in range(100)], archived=90)
+        matches, truncated = corpus.find("ligne", limit=10)
+        self.assertEqual(len(matches), 10)
+        self.assertTrue(truncated)
+        self.assertIsNone(corpus.from_end(89))
+        self.assertEqual(corpus.from_end(99), 0)
+        self.assertEqual(corpus.line(42), "ligne 42")
+
+    def test_cas_limites(self) -> None:
+        self.assertEqual(LogCorpus([]).find("x"), ([], False))
+        # Minuscule de longueur differente: repli sur la regex, positions exactes.
+        corpus = LogCorpus(["İstanbul x", "istanbul"])
+        self.assertEqual([(m.line, m.column) for m in corpus.find("x")[0]], [(0, 9)])
+        self.assertEqual([m.line for m in corpus.find("stanbul")[0]], [0, 1])
+
+    def test_apercu_des_lignes_longues(self) -> None:
+        corpus = LogCorpus(["x" * 5000 + "cible" + "y" * 5000])
+        match = corpus.find("cible")[0][0]
+        self.assertLessEqual(len(match.text), 300)
+        self.assertEqual(match.text[match.column : match.column + match.length], "cible")
+
+
+if __name__ == "__main__":
+    unittest.main()
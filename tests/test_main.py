@@ -1,9 +1,12 @@
 import sys
 import tempfile
+import time
 import unittest
 from pathlib import Path
 
-from usbide.__main__ import ensure_vendor_path
+from usbide.__main__ import ensure_vendor_path, incidents_report, parse_args
+from usbide.incidentstore import IncidentRow, IncidentStore, incidents_db_path
+from usbide.vendor_bundle import build_vendor_bundle, bundle_path
 
 
 class TestEnsureVendorPath(unittest.TestCase):
@@ -32,3 +35,43 @@ class TestEnsureVendorPath(unittest.TestCase):
                 self.assertEqual(sys.path.count(resolved), 1)
             finally:
                 sys.path = original
+
+    def test_bundle_frais_passe_devant_le_vendor(self) -> None:
+        # Un bundle a jour doit etre prioritaire, le vendor reste disponible derriere.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            vendor = root_dir / ".usbide" / "vendor"
+            (vendor / "pkg").mkdir(parents=True, exist_ok=True)
+            (vendor / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+            build_vendor_bundle(root_dir)
+            original = list(sys.path)
+            try:
+                ensure_vendor_path(root_dir)
+                self.assertEqual(sys.path[0], str(bundle_path(root_dir).resolve()))
+                self.assertEqual(sys.path[1], str(vendor.resolve()))
+            finally:
+                sys.path = original
+
+
+class TestIncidentsCommand(unittest.TestCase):
+    def test_sous_commande_incidents(self) -> None:
+        # `python -m usbide incidents` lit la base sans lancer l'IDE.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            store = IncidentStore(incidents_db_path(root_dir))
+            now = time.time()
+            store.add([IncidentRow(now, "erreur", "codex_exec", "Codex introuvable", "", None, "abc", None)] * 2)
+            store.close()
+
+            args = parse_args(["incidents", "--root", str(root_dir), "--by", "niveau", "--days", "1"])
+            self.assertEqual(args.command, "incidents")
+            texte = incidents_report(args)
+
+            self.assertIn("par niveau", texte)
+            self.assertIn("erreur", texte)
+
+    def test_sans_sous_commande(self) -> None:
+        args = parse_args(["--root", "x"])
+        self.assertIsNone(args.command)
+        self.assertEqual(args.root, Path("x"))
+
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from usbide.precompile import collect_sources, precompile, pycache_prefix
+
+
+class TestCollectSources(unittest.TestCase):
+    def test_collecte_vendor_et_workspace_sans_dossiers_lourds(self) -> None:
+        # Les sources vendor/workspace sont retenues, les dossiers generes ignores.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / ".usbide" / "vendor" / "pkg").mkdir(parents=True)
+            (root_dir / ".usbide" / "vendor" / "pkg" / "__init__.py").write_text("X = 1\n", encoding="utf-8")
+            (root_dir / "src").mkdir()
+            (root_dir / "src" / "main.py").write_text("print('ok')\n", encoding="utf-8")
+            (root_dir / "dist").mkdir()
+            (root_dir / "dist" / "gen.py").write_text("", encoding="utf-8")
+
+            sources = collect_sources(root_dir, include_package=False)
+
+            noms = {path.name for path in sources}
+            self.assertEqual(noms, {"__init__.py", "main.py"})
+
+    def test_ignore_le_python_portable(self) -> None:
+        # tools/python-x64 (stdlib + site-packages) ne fait pas partie du workspace.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            stdlib = root_dir / "tools" / "python-x64" / "Lib"
+            stdlib.mkdir(parents=True)
+            (stdlib / "x.py").write_text("X = 1\n", encoding="utf-8")
+            (root_dir / "main.py").write_text("print('ok')\n", encoding="utf-8")
+
+            sources = collect_sources(root_dir, include_package=False)
+
+            self.assertEqual([path.name for path in sources], ["main.py"])
+
+
+class TestPrecompile(unittest.TestCase):
+    def test_compile_puis_saute_les_fichiers_a_jour(self) -> None:
+        # Une deuxieme passe ne doit rien recompiler.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "ok.py").write_text("VALEUR = 42\n", encoding="utf-8")
+            (root_dir / "ko.py").write_text("def (:\n", encoding="utf-8")
+            sources = collect_sources(root_dir, include_package=False)
+
+            premier = precompile(root_dir, sources=sources, workers=1)
+            second = precompile(root_dir, sources=sources, workers=1)
+
+            self.assertEqual((premier.compiled, premier.failed), (1, 1))
+            self.assertEqual(second.fresh, 1)
+            self.assertEqual(second.compiled, 0)
+            self.assertTrue(any(pycache_prefix(root_dir).rglob("ok.*.pyc")))
+            self.assertIn("compile", premier.summary())
+
+    def test_aucune_source(self) -> None:
+        # Sans source, le rapport reste vide.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = precompile(Path(tmp_dir), sources=[])
+            self.assertEqual(report.compiled + report.fresh + report.failed, 0)
@@ -0,0 +1,79 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from usbide.app import USBIDEApp
+from usbide.profiling import StartupProfiler, profiles_dir
+
+
+class TestStartupProfiler(unittest.TestCase):
+    def test_finish_ecrit_profil_et_trace(self) -> None:
+        # Les phases mesurees doivent apparaitre dans la trace Chrome.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiler = StartupProfiler(profiles_dir(Path(tmp_dir)))
+            profiler.start()
+            with profiler.span("imports"):
+                sum(range(1000))
+            profiler.mark("premiere_frame_interactive")
+
+            prof_path, trace_path = profiler.finish()
+
+            self.assertTrue(prof_path.exists())
+            trace = json.loads(trace_path.read_text(encoding="utf-8"))
+            noms = [event["name"] for event in trace["traceEvents"]]
+            self.assertEqual(noms, ["imports", "premiere_frame_interactive"])
+            self.assertTrue(profiler.finished)
+
+
+class TestStartupProfilerApp(unittest.IsolatedAsyncioTestCase):
+    async def test_app_ecrit_le_profil_au_premier_rendu(self) -> None:
+        # Le profil doit couvrir compose/on_mount et le peuplement de l'arbre.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "main.py").write_text("print('ok')\n", encoding="utf-8")
+            profiler = StartupProfiler(profiles_dir(root_dir))
+            app = USBIDEApp(root_dir=root_dir, profiler=profiler)
+            async with app.run_test() as pilot:
+                for _ in range(20):
+                    await pilot.pause(0.05)
+                    if profiler.finished:
+                        break
+
+            self.assertTrue(profiler.finished)
+            traces = list(profiles_dir(root_dir).glob("*.trace.json"))
+            self.assertEqual(len(traces), 1)
+            noms = {event["name"] for event in json.loads(traces[0].read_text(encoding="utf-8"))["traceEvents"]}
+            for attendu in ("compose", "on_mount", "_ensure_portable_dirs", "DirectoryTree (peuplement initial)"):
+                with self.subTest(phase=attendu):
+                    self.assertIn(attendu, noms)
+
+
+    async def test_workspace_vide_termine_a_la_premiere_frame(self) -> None:
+        # Racine vide: aucun peuplement, le profil est ecrit des la premiere frame.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            profiler = StartupProfiler(profiles_dir(root_dir))
+            app = USBIDEApp(root_dir=root_dir, profiler=profiler)
+            # Les dossiers portables crees au montage ne comptent pas: on vide la racine avant.
+            app._ensure_portable_dirs = lambda: None  # type: ignore[method-assign]
+            async with app.run_test() as pilot:
+                for _ in range(10):
+                    await pilot.pause(0.05)
+                    if profiler.finished:
+                        break
+                self.assertTrue(profiler.finished)
+
+    async def test_sortie_anticipee_ecrit_le_profil(self) -> None:
+        # Quitter avant la fin du demarrage ne doit pas perdre le profil.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "main.py").write_text("print('ok')\n", encoding="utf-8")
+            profiler = StartupProfiler(profiles_dir(root_dir))
+            app = USBIDEApp(root_dir=root_dir, profiler=profiler)
+            app._profile_on_first_frame = lambda: None  # type: ignore[method-assign]
+            async with app.run_test():
+                pass
+
+            self.assertTrue(profiler.finished)
+            self.assertEqual(len(list(profiles_dir(root_dir).glob("*.prof"))), 1)
@@ -0,0 +1,145 @@
+import os
+import re
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from usbide.search import WorkspaceSearch, compile_query, parse_rg_line, rg_argv, rg_executable, search_file
+
+
+def _workspace(root: Path) -> list[str]:
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text("import os\n\ndef main():\n    return TODO_valeur\n", encoding="utf-8")
+    (root / "src" / "notes.txt").write_text("rien\n todo en minuscules\n", encoding="utf-8")
+    (root / "latin.txt").write_bytes("caf\xe9 TODO\n".encode("cp1252"))
+    (root / "image.bin").write_bytes(b"\x00\x01TODO\x00")
+    return ["src/app.py", "src/notes.txt", "latin.txt", "image.bin"]
+
+
+class TestCompileQuery(unittest.TestCase):
+    def test_casse_intelligente(self) -> None:
+        self.assertTrue(compile_query("todo").search("TODO"))
+        self.assertFalse(compile_query("Todo").search("TODO"))
+
+    def test_texte_litteral_ou_regex(self) -> None:
+        self.assertTrue(compile_query("a.b").search("a.b"))
+        self.assertFalse(compile_query("a.b").search("axb"))
+        self.assertTrue(compile_query("a.b", regex=True).search("axb"))
+        with self.assertRaises(re.error):
+            compile_query("(", regex=True)
+
+
+class TestSearchFile(unittest.TestCase):
+    def test_lignes_colonnes_et_binaires(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            _workspace(root)
+            pattern = compile_query("todo")
+
+            hits = search_file(root, "src/app.py", pattern)
+            self.assertEqual([(h.line, h.column, h.length) for h in hits], [(4, 11, 4)])
+            self.assertEqual(hits[0].text, "    return TODO_valeur")
+            # Encodage detecte comme a l'ouverture dans l'editeur.
+            self.assertEqual(search_file(root, "latin.txt", pattern)[0].text, "café TODO")
+            self.assertEqual(search_file(root, "image.bin", pattern), [])
+            self.assertEqual(search_file(root, "absent.txt", pattern), [])
+
+    def test_apercu_des_lignes_longues(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "min.js").write_text("x" * 5000 + "cible" + "y" * 5000, encoding="utf-8")
+            hit = search_file(root, "min.js", compile_query("cible"))[0]
+            self.assertLessEqual(len(hit.text), 300)
+            self.assertEqual(hit.text[hit.column : hit.column + hit.length], "cible")
+
+
+class TestWorkspaceSearchThreads(unittest.TestCase):
+    def test_resultats_transmis_au_fil_de_l_eau(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = _workspace(root)
+            engine = WorkspaceSearch(root, lambda: paths, workers=2)
+            recus: list[list] = []
+
+            total = engine.run("todo", recus.append, threading.Event())
+
+            hits = sorted((h.path, h.line) for lot in recus for h in lot)
+            self.assertEqual(hits, [("latin.txt", 1), ("src/app.py", 4), ("src/notes.txt", 2)])
+            self.assertEqual(total, 3)
+            self.assertEqual(engine.backend, "threads")
+
+    def test_limite_et_annulation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = []
+            for i in range(40):
+                (root / f"f{i}.txt").write_text("match\n" * 10, encoding="utf-8")
+                paths.append(f"f{i}.txt")
+            engine = WorkspaceSearch(root, lambda: paths, workers=2, max_hits=25)
+            recus: list = []
+            self.assertEqual(engine.run("match", recus.extend, threading.Event()), 25)
+            self.assertEqual(len(recus), 25)
+
+            annule = threading.Event()
+            annule.set()
+            self.assertEqual(engine.run("match", recus.extend, annule), 0)
+
+
+class TestRipgrep(unittest.TestCase):
+    def test_argv(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ignore = Path(tmp_dir) / "ignore"
+            ignore.write_text("*.log\n", encoding="utf-8")
+            argv = rg_argv("rg", "-x", ignore_file=ignore)
+            self.assertIn("--fixed-strings", argv)
+            self.assertIn("--smart-case", argv)
+            self.assertIn("!node_modules", argv)
+            self.assertEqual(argv[argv.index("--ignore-file") + 1], str(ignore))
+            # Requete commencant par "-": passee via -e, jamais prise pour une option.
+            self.assertEqual(argv[-4:], ["-e", "-x", "--", "."])
+            self.assertNotIn("--fixed-strings", rg_argv("rg", "a.b", regex=True))
+
+    def test_parse_ligne(self) -> None:
+        hit = parse_rg_line("./src/app.py\x004:12:    return TODO_valeur", compile_query("todo"))
+        self.assertEqual((hit.path, hit.line, hit.column, hit.length), ("src/app.py", 4, 11, 4))
+        # Colonne en octets chez rg: recalculee en caracteres.
+        hit = parse_rg_line("a.txt\x001:7:café TODO", compile_query("todo"))
+        self.assertEqual(hit.column, 5)
+        self.assertIsNone(parse_rg_line("ligne sans separateur"))
+
+    def test_detection_sur_le_path(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(rg_executable({"PATH": tmp_dir}))
+
+    @unittest.skipIf(sys.platform == "win32", "script shell")
+    def test_delegation_a_rg(self) -> None:
+        # Faux rg (script Python) sur le PATH: verifie l'appel et l'analyse du flux.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            bin_dir = root / "bin"
+            bin_dir.mkdir()
+            fake = bin_dir / "rg"
+            fake.write_text(
+                f"#!{sys.executable}\n"
+                "import sys\n"
+                "assert sys.argv[-3] == 'todo', sys.argv\n"
+                "sys.stdout.write('./a.py\\x002:1:TODO ici\\n./b.py\\x001:3:un todo\\n')\n",
+                encoding="utf-8",
+            )
+            fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+            env = {**os.environ, "PATH": str(bin_dir)}
+            rg = rg_executable(env)
+            self.assertEqual(rg, str(fake))
+            engine = WorkspaceSearch(root, lambda: [], rg=rg, env=env)
+            recus: list = []
+
+            self.assertEqual(engine.run("todo", recus.extend, threading.Event()), 2)
+            self.assertEqual([(h.path, h.line, h.column) for h in recus], [("a.py", 2, 0), ("b.py", 1, 3)])
+            self.assertEqual(engine.backend, "rg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import gzip
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide.sessionlog import SessionLog, session_log_settings, session_segments
+
+
+class TestSessionLog(unittest.TestCase):
+    def test_ecriture_en_fond(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = SessionLog(Path(tmp_dir), stamp="20260101-120000")
+            log.write("journal", ["$ pip install x", "ok"])
+            log.write("codex", ["reponse"])
+
+            self.assertTrue(log.flush())
+            lines = log.path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(log.path, Path(tmp_dir) / ".usbide" / "logs" / "session-20260101-120000.log")
+            self.assertEqual([line.split(" ", 1)[1] for line in lines], [
+                "[journal] $ pip install x",
+                "[journal] ok",
+                "[codex] reponse",
+            ])
+            log.close()
+            # Apres fermeture, plus rien n'est accepte.
+            log.write("journal", ["ignoree"])
+            self.assertEqual(len(log.path.read_text(encoding="utf-8").splitlines()), 3)
+
+    def test_write_ne_bloque_pas_sur_un_disque_lent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = SessionLog(Path(tmp_dir), stamp="lent")
+            release = threading.Event()
+            original = log._append
+
+            def slow_append(batch: list[str]) -> None:
+                release.wait(5)
+                original(batch)
+
+            with patch.object(log, "_append", side_effect=slow_append):
+                start = time.perf_counter()
+                for i in range(1000):
+                    log.write("journal", [f"ligne {i}"])
+                self.assertLess(time.perf_counter() - start, 1.0)
+                release.set()
+                self.assertTrue(log.flush())
+            self.assertEqual(len(log.path.read_text(encoding="utf-8").splitlines()), 1000)
+            log.close()
+
+    def test_rotation_compression_et_retention(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            logs = root / ".usbide" / "logs"
+            logs.mkdir(parents=True)
+            # Session precedente laissee en clair (arret brutal).
+            (logs / "session-20250101-000000.log").write_text("ancienne session\n" * 50, encoding="utf-8")
+
+            log = SessionLog(root, stamp="20260101-000000", segment_bytes=2000, retention_bytes=1000)
+            for batch in range(20):
+                log.write("journal", [f"lot {batch} ligne {i} " + "x" * 40 for i in range(20)])
+                self.assertTrue(log.flush())
+            log.write("journal", ["fin"])
+            log.flush()
+            log.close()
+
+            segments = session_segments(logs)
+            names = [path.name for path in segments]
+            self.assertEqual(names[-1], "session-20260101-000000.log")
+            self.assertTrue(all(name.endswith(".log.gz") for name in names[:-1]))
+            # Retention: le total reste sous le plafond, les plus anciens sont partis.
+            self.assertLessEqual(sum(path.stat().st_size for path in segments), 1000)
+            self.assertFalse(any(name.startswith("session-20250101") for name in names))
+            self.assertNotIn("session-20260101-000000.1.log.gz", names)
+            self.assertEqual(names[-2], "session-20260101-000000.10.log.gz")
+            with gzip.open(segments[-2], "rt", encoding="utf-8") as handle:
+                self.assertIn("[journal] lot 19 ligne", handle.read())
+
+    def test_relecture_d_un_panneau(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log = SessionLog(Path(tmp_dir), stamp="relue", segment_bytes=600, retention_bytes=10_000)
+            for i in range(40):
+                log.write("journal", [f"sortie {i}"])
+                log.write("codex", [f"reponse {i}"])
+                log.flush()
+
+            first, lines = log.read_lines("journal")
+            self.assertEqual(first, 0)
+            self.assertEqual(lines, [f"sortie {i}" for i in range(40)])
+            # Segments compresses relus dans l'ordre.
+            self.assertGreater(len(session_segments(log.dir, "relue")), 1)
+
+            # Retention: le rang de la premiere ligne restante tient compte des segments supprimes.
+            log.retention_bytes = 1
+            log._enforce_retention()
+            first, lines = log.read_lines("journal")
+            self.assertGreater(first, 0)
+            self.assertEqual(lines[0], f"sortie {first}")
+            log.close()
+
+    def test_session_precedente_compressee(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            logs = root / ".usbide" / "logs"
+            logs.mkdir(parents=True)
+            (logs / "session-20250101-000000.log").write_text("hier\n", encoding="utf-8")
+
+            log = SessionLog(root, stamp="20260101-000000")
+            log.write("journal", ["aujourd'hui"])
+            log.flush()
+            log.close()
+
+            with gzip.open(logs / "session-20250101-000000.log.gz", "rt", encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "hier\n")
+            self.assertFalse((logs / "session-20250101-000000.log").exists())
+
+    def test_erreur_disque_signalee(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            # ".usbide" est un fichier: le dossier des journaux ne peut pas etre cree.
+            (root / ".usbide").write_text("", encoding="utf-8")
+            errors: list[OSError] = []
+            log = SessionLog(root, on_error=errors.append)
+            log.write("journal", ["perdue"])
+            log.flush()
+            log.close()
+            self.assertEqual(len(errors), 1)
+
+    def test_reglages(self) -> None:
+        with patch.dict(os.environ, {"USBIDE_LOG_SEGMENT_MB": "0.5", "USBIDE_LOG_RETENTION_MB": "x"}):
+            self.assertEqual(session_log_settings(), (512 * 1024, 64 * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide.app import USBIDEApp
+from usbide.screens import ConfirmScreen
+from usbide.swap import SwapJournal, swap_dir
+
+
+class TestSwapJournal(unittest.TestCase):
+    def test_ecriture_coalescee_et_restauration(self) -> None:
+        # Un instantane identique n'est pas reecrit; il survit a un redemarrage.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            journal = SwapJournal(root_dir)
+            path = root_dir / "src" / "main.py"
+
+            self.assertTrue(journal.write(path, "x = 1\n", "utf-8"))
+            self.assertFalse(journal.write(path, "x = 1\n", "utf-8"))
+            self.assertTrue(journal.write(path, "x = 2\n", "utf-8"))
+
+            entries = SwapJournal(root_dir).pending()
+            self.assertEqual(len(entries), 1)
+            self.assertEqual((entries[0].path, entries[0].text), (path, "x = 2\n"))
+
+            journal.discard(path)
+            self.assertEqual(SwapJournal(root_dir).pending(), [])
+
+    def test_instantane_tronque_ignore(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            swap_dir(root_dir).mkdir(parents=True)
+            (swap_dir(root_dir) / "abc.json").write_text('{"path": "a', encoding="utf-8")
+            self.assertEqual(SwapJournal(root_dir).pending(), [])
+
+
+class TestSwapApp(unittest.IsolatedAsyncioTestCase):
+    async def _ouvrir(self, app: USBIDEApp, pilot, path: Path) -> None:
+        app._open_path(path)
+        await app.workers.wait_for_complete([w for w in app.workers if w.group == "open_file"])
+        await pilot.pause()
+
+    async def test_buffer_modifie_journalise_puis_restaure(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            path = root_dir / "main.py"
+            path.write_text("x = 1\n", encoding="utf-8")
+
+            with patch("usbide.app._SWAP_DELAY", 0.05):
+                app = USBIDEApp(root_dir=root_dir)
+                async with app.run_test() as pilot:
+                    await self._ouvrir(app, pilot, path)
+                    app.query_one("#editor").insert("# brouillon\n", (0, 0))
+                    for _ in range(40):
+                        await pilot.pause(0.05)
+                        if SwapJournal(root_dir).pending():
+                            break
+
+                    self.assertEqual([e.text for e in SwapJournal(root_dir).pending()], ["# brouillon\nx = 1\n"])
+
+            # Session suivante: la restauration est proposee puis acceptee.
+            app = USBIDEApp(root_dir=root_dir)
+            async with app.run_test() as pilot:
+                for _ in range(20):
+                    await pilot.pause(0.05)
+                    if isinstance(app.screen, ConfirmScreen):
+                        break
+                self.assertIsInstance(app.screen, ConfirmScreen)
+                await pilot.press("o")
+                await pilot.pause()
+
+                self.assertEqual(app.query_one("#editor").text, "# brouillon\nx = 1\n")
+                self.assertTrue(app.current.dirty)
+                self.assertTrue(await app.action_save())
+
+            self.assertEqual(path.read_text(encoding="utf-8"), "# brouillon\nx = 1\n")
+            self.assertEqual(SwapJournal(root_dir).pending(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
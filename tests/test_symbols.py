@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide import symbols
+from usbide.symbols import SymbolIndex, parse_symbols, symbols_path
+
+_SOURCE = '''\
+import os.path
+from typing import Optional as Opt
+
+LIMITE: int = 10
+
+try:
+    import json
+except ImportError:
+    json = None
+
+
+class Outer:
+    class Inner:
+        def methode(self):
+            pass
+
+    async def run(self):
+        pass
+
+
+def main():
+    locale = 1
+    return locale
+'''
+
+
+class TestParseSymbols(unittest.TestCase):
+    def test_symboles_de_niveau_module_et_de_classe(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "mod.py"
+            path.write_text(_SOURCE, encoding="utf-8")
+
+            found = {(name, kind, line, container) for name, kind, line, _, container in parse_symbols(str(path))}
+
+            self.assertIn(("os", "import", 1, ""), found)
+            self.assertIn(("Opt", "import", 2, ""), found)
+            self.assertIn(("LIMITE", "variable", 4, ""), found)
+            self.assertIn(("json", "variable", 9, ""), found)
+            self.assertIn(("Outer", "class", 12, ""), found)
+            self.assertIn(("Inner", "class", 13, "Outer"), found)
+            self.assertIn(("methode", "method", 14, "Outer.Inner"), found)
+            self.assertIn(("run", "method", 17, "Outer"), found)
+            self.assertIn(("main", "function", 21, ""), found)
+            # Variables locales non indexees.
+            self.assertNotIn("locale", {entry[0] for entry in found})
+
+    def test_fichier_invalide(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "casse.py"
+            path.write_text("def (:\n", encoding="utf-8")
+            self.assertIsNone(parse_symbols(str(path)))
+            self.assertIsNone(parse_symbols(str(Path(tmp_dir) / "absent.py")))
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def _workspace(self, root: Path) -> list[str]:
+        (root / "pkg").mkdir()
+        (root / "pkg" / "a.py").write_text("from pkg.b import helper\n\ndef main():\n    helper()\n", encoding="utf-8")
+        (root / "pkg" / "b.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+        (root / "notes.txt").write_text("def pas_python():\n", encoding="utf-8")
+        return ["pkg/a.py", "pkg/b.py", "notes.txt"]
+
+    def test_definitions_et_priorite(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            index = SymbolIndex(root)
+
+            self.assertEqual(index.update(paths), 2)
+
+            found = index.definitions("helper", prefer="pkg/a.py")
+            # La definition passe avant l'import, meme dans le fichier prefere.
+            self.assertEqual(
+                [(s.path, s.kind, s.line) for s in found], [("pkg/b.py", "function", 1), ("pkg/a.py", "import", 1)]
+            )
+            self.assertEqual(index.definitions("pas_python"), [])
+            self.assertEqual(index.definitions("inconnu"), [])
+
+    def test_persistance_et_mise_a_jour_incrementale(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            premier = SymbolIndex(root)
+            premier.update(paths)
+            premier.save()
+            self.assertTrue(symbols_path(root).is_file())
+
+            second = SymbolIndex(root)
+            self.assertTrue(second.load())
+            # Rien n'a change: aucun fichier reanalyse.
+            with patch("usbide.symbols.parse_symbols", side_effect=AssertionError("analyse")):
+                self.assertEqual(second.update(paths), 0)
+            self.assertEqual(second.definitions("main")[0].path, "pkg/a.py")
+
+            b = root / "pkg" / "b.py"
+            b.write_text("def renomme():\n    pass\n", encoding="utf-8")
+            os.utime(b, ns=(1, 1))
+            (root / "pkg" / "a.py").unlink()
+            paths.remove("pkg/a.py")
+
+            self.assertEqual(second.update(paths), 1)
+            self.assertEqual(second.definitions("helper"), [])
+            self.assertEqual(second.definitions("main"), [])
+            self.assertEqual(second.definitions("renomme")[0].path, "pkg/b.py")
+
+    def test_erreur_de_syntaxe_garde_les_anciens_symboles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            index = SymbolIndex(root)
+            index.update(paths)
+
+            b = root / "pkg" / "b.py"
+            b.write_text("def helper(:\n", encoding="utf-8")
+            os.utime(b, ns=(1, 1))
+
+            self.assertEqual(index.update_paths(["pkg/b.py"]), 1)
+            self.assertEqual(index.definitions("helper")[0].path, "pkg/b.py")
+
+    def test_pool_de_process_pour_les_gros_lots(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = []
+            for i in range(symbols._POOL_MIN_FILES + 4):
+                (root / f"m{i}.py").write_text(f"def fonction_{i}():\n    pass\n", encoding="utf-8")
+                paths.append(f"m{i}.py")
+            index = SymbolIndex(root, workers=2)
+
+            self.assertEqual(index.update(paths), len(paths))
+
+            self.assertEqual(len(index), len(paths))
+            self.assertEqual(index.definitions("fonction_7")[0].path, "m7.py")
+
+    def test_index_corrompu_ignore(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            symbols_path(root).parent.mkdir(parents=True)
+            symbols_path(root).write_text("{pas du json", encoding="utf-8")
+            self.assertFalse(SymbolIndex(root).load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,7 +12,12 @@ class TestThemeFrancais(unittest.TestCase):
             "Sauvegarder",
             "Executer",
             "Effacer les journaux",
+            "Filtrer le journal",
             "Recharger l'arborescence",
+            "Ouvrir un fichier",
+            "Rechercher",
+            "Symboles",
+            "Aller a la definition",
             "Connexion Codex",
             "Verifier Codex",
             "Installer Codex",
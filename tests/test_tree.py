@@ -0,0 +1,139 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from textual.app import App, ComposeResult
+
+from usbide.tree import WorkspaceTree
+
+
+class _TreeApp(App):
+    def __init__(self, root_dir: Path, **tree_options) -> None:
+        super().__init__()
+        self.root_dir = root_dir
+        self.tree_options = tree_options
+        self.populated: list[tuple[bool, int]] = []
+
+    def compose(self) -> ComposeResult:
+        yield WorkspaceTree(str(self.root_dir), id="tree", **self.tree_options)
+
+    def on_workspace_tree_populated(self, event: WorkspaceTree.Populated) -> None:
+        self.populated.append((event.node.is_root, event.count))
+
+
+class TestWorkspaceTreePopulated(unittest.IsolatedAsyncioTestCase):
+    async def test_peuplement_racine_notifie(self) -> None:
+        # Garde-fou: la surcharge de DirectoryTree._populate_node doit toujours etre appelee.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "a.py").write_text("", encoding="utf-8")
+            (root_dir / "src").mkdir()
+            app = _TreeApp(root_dir)
+            async with app.run_test() as pilot:
+                for _ in range(40):
+                    await pilot.pause(0.05)
+                    if app.populated:
+                        break
+
+            self.assertEqual(app.populated[:1], [(True, 2)])
+
+
+class TestWorkspaceTreeFiltre(unittest.IsolatedAsyncioTestCase):
+    async def _peupler(self, app: _TreeApp, pilot, count: int = 1) -> None:
+        for _ in range(60):
+            if len(app.populated) >= count:
+                return
+            await pilot.pause(0.05)
+
+    def _libelles(self, node) -> list[str]:
+        return [str(child.label) for child in node.children]
+
+    async def test_regles_et_dossiers_lourds(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / ".gitignore").write_text("*.log\nsecret/\n", encoding="utf-8")
+            (root_dir / ".usbide").mkdir()
+            (root_dir / ".usbide" / "ignore").write_text("brouillon.txt\n", encoding="utf-8")
+            (root_dir / "main.py").write_text("", encoding="utf-8")
+            (root_dir / "trace.log").write_text("", encoding="utf-8")
+            (root_dir / "brouillon.txt").write_text("", encoding="utf-8")
+            (root_dir / "secret").mkdir()
+            (root_dir / "node_modules").mkdir()
+            app = _TreeApp(root_dir)
+            async with app.run_test() as pilot:
+                await self._peupler(app, pilot)
+                tree = app.query_one(WorkspaceTree)
+                libelles = self._libelles(tree.root)
+
+            # Dossiers d'abord; les exclusions .gitignore/.usbide/ignore sont masquees.
+            self.assertEqual(libelles, [".usbide (lourd)", "node_modules (lourd)", ".gitignore", "main.py"])
+
+    async def test_pagination_des_gros_dossiers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            for i in range(7):
+                (root_dir / f"f{i}.txt").write_text("", encoding="utf-8")
+            app = _TreeApp(root_dir, page_size=3)
+            async with app.run_test() as pilot:
+                await self._peupler(app, pilot)
+                tree = app.query_one(WorkspaceTree)
+                self.assertEqual(
+                    self._libelles(tree.root),
+                    ["f0.txt", "f1.txt", "f2.txt", "... 4 autres (Entree pour afficher)"],
+                )
+
+                suite = tree.root.children[-1]
+                tree.select_node(suite)
+                await pilot.pause()
+                self.assertEqual(
+                    self._libelles(tree.root)[3:],
+                    ["f3.txt", "f4.txt", "f5.txt", "... 1 autres (Entree pour afficher)"],
+                )
+                # Les fichiers restent des entrees normales (ouverture via FileSelected).
+                self.assertEqual(tree.root.children[3].data.path, root_dir / "f3.txt")
+
+
+class TestWorkspaceTreeIncremental(unittest.IsolatedAsyncioTestCase):
+    async def _attendre(self, pilot, condition) -> None:
+        for _ in range(60):
+            if condition():
+                return
+            await pilot.pause(0.05)
+
+    async def test_mise_a_jour_sans_rechargement(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            (root_dir / "src").mkdir()
+            (root_dir / "src" / "mod.py").write_text("", encoding="utf-8")
+            (root_dir / "b.py").write_text("", encoding="utf-8")
+            (root_dir / "d.py").write_text("", encoding="utf-8")
+            app = _TreeApp(root_dir)
+            async with app.run_test() as pilot:
+                await self._attendre(pilot, lambda: len(app.populated) >= 1)
+                tree = app.query_one(WorkspaceTree)
+                src = tree.root.children[0]
+                src.expand()
+                await self._attendre(pilot, lambda: len(app.populated) >= 2)
+                self.assertEqual(await asyncio.to_thread(tree.changed_directories), [])
+
+                (root_dir / "c.py").write_text("", encoding="utf-8")
+                (root_dir / "d.py").unlink()
+                (root_dir / "a").mkdir()
+                # Mtime force: la resolution du systeme de fichiers peut masquer le changement.
+                os.utime(root_dir, ns=(1, 1))
+                self.assertEqual(await asyncio.to_thread(tree.changed_directories), [root_dir])
+                await tree.refresh_directories([root_dir])
+
+                self.assertEqual([str(c.label) for c in tree.root.children], ["a", "src", "b.py", "c.py"])
+                # Le sous-arbre deplie est conserve tel quel (pas de relecture).
+                self.assertIs(tree.root.children[1], src)
+                self.assertTrue(src.is_expanded)
+                self.assertEqual([str(c.label) for c in src.children], ["mod.py"])
+                self.assertTrue(tree.root.children[0].allow_expand)
+                self.assertEqual(await asyncio.to_thread(tree.changed_directories), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
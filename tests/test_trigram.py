@@ -0,0 +1,153 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide.encoding import load_text
+from usbide.search import WorkspaceSearch
+from usbide.trigram import TrigramIndex, query_trigrams, required_literals, trigram_path, trigrams
+
+
+class TestRequetes(unittest.TestCase):
+    def test_trigrammes_en_minuscules(self) -> None:
+        self.assertEqual(trigrams("ABcd"), {"abc", "bcd"})
+        self.assertEqual(trigrams("ab"), set())
+
+    def test_fragments_obligatoires_d_une_regex(self) -> None:
+        cas = [
+            ("def main", False, ["def main"]),
+            ("def\\s+main", True, ["def", "main"]),
+            ("colou?r", True, ["colo", "r"]),
+            ("a.b*cde", True, ["a", "cde"]),
+            ("[abc]xyz{2}", True, ["xy"]),
+            ("\\.venv", True, [".venv"]),
+            ("foo|bar", True, []),
+            ("(abc)?def", True, []),
+        ]
+        for query, regex, attendu in cas:
+            with self.subTest(query=query):
+                self.assertEqual(required_literals(query, regex=regex), attendu)
+
+    def test_requete_trop_courte(self) -> None:
+        self.assertIsNone(query_trigrams("ab"))
+        self.assertIsNone(query_trigrams("a.b", regex=True))
+        self.assertEqual(query_trigrams("Main"), {"mai", "ain"})
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def _workspace(self, root: Path) -> list[str]:
+        (root / "src").mkdir()
+        (root / "src" / "app.py").write_text("def main():\n    return compute_total()\n", encoding="utf-8")
+        (root / "src" / "util.py").write_text("def helper():\n    pass\n", encoding="utf-8")
+        (root / "notes.txt").write_bytes("caf\xe9 cr\xe8me\n".encode("cp1252"))
+        (root / "logo.png").write_bytes(b"\x89PNG\x00\x00compute_total")
+        return ["src/app.py", "src/util.py", "notes.txt", "logo.png"]
+
+    def test_restreint_les_candidats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            index = TrigramIndex(root)
+
+            self.assertEqual(index.update(paths), 4)
+
+            self.assertEqual(index.narrow(paths, "compute_total"), ["src/app.py"])
+            self.assertEqual(index.narrow(paths, "COMPUTE"), ["src/app.py"])
+            self.assertEqual(index.narrow(paths, "def"), ["src/app.py", "src/util.py"])
+            # Encodage detecte comme a l'ouverture (cp1252).
+            self.assertEqual(index.narrow(paths, "crème"), ["notes.txt"])
+            self.assertEqual(index.narrow(paths, "introuvable"), [])
+            # Requete sans trigramme: aucun filtrage; fichier inconnu: toujours candidat.
+            self.assertEqual(index.narrow(paths, "de"), paths)
+            self.assertEqual(index.narrow(["nouveau.py"], "compute"), ["nouveau.py"])
+
+    def test_persistance_et_mise_a_jour_incrementale(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            premier = TrigramIndex(root)
+            premier.update(paths)
+            premier.save()
+            self.assertTrue(trigram_path(root).is_file())
+
+            second = TrigramIndex(root)
+            self.assertTrue(second.load())
+            self.assertEqual(len(second), 4)
+            # Rien n'a change: aucun fichier relu.
+            with patch("usbide.trigram.load_text", side_effect=AssertionError("relecture")):
+                self.assertEqual(second.update(paths), 0)
+
+            app = root / "src" / "app.py"
+            app.write_text("def main():\n    return autre_chose()\n", encoding="utf-8")
+            os.utime(app, ns=(1, 1))
+            (root / "src" / "util.py").unlink()
+            paths.remove("src/util.py")
+
+            self.assertEqual(second.update(paths), 1)
+            self.assertEqual(second.narrow(paths, "compute_total"), [])
+            self.assertEqual(second.narrow(paths, "autre_chose"), ["src/app.py"])
+            self.assertEqual(len(second), 3)
+
+    def test_sauvegarde_d_un_fichier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            index = TrigramIndex(root)
+            index.update(paths)
+
+            (root / "src" / "util.py").write_text("NOUVEAU_SYMBOLE = 1\n", encoding="utf-8")
+            self.assertEqual(index.update_paths(["src/util.py"]), 1)
+
+            self.assertEqual(index.narrow(paths, "nouveau_symbole"), ["src/util.py"])
+
+    def test_compactage(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = [f"f{i}.txt" for i in range(300)]
+            for rel in paths:
+                (root / rel).write_text(f"contenu {rel}\n", encoding="utf-8")
+            index = TrigramIndex(root)
+            index.update(paths)
+
+            index.update(paths[:10])
+
+            # Identifiants renumerotes: les listes ne pointent plus vers les fichiers retires.
+            self.assertEqual(len(index._files), 10)
+            self.assertEqual(index.narrow(paths[:10], "contenu f5"), ["f5.txt"])
+
+    def test_gros_fichier_toujours_candidat(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "gros.log").write_text("x" * (1024 * 1024 + 1), encoding="utf-8")
+            index = TrigramIndex(root)
+            index.update(["gros.log"])
+            self.assertEqual(index.narrow(["gros.log"], "introuvable"), ["gros.log"])
+
+    def test_index_corrompu_ignore(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            trigram_path(root).parent.mkdir(parents=True)
+            trigram_path(root).write_bytes(b"USBTRI1\npas du zlib")
+            self.assertFalse(TrigramIndex(root).load())
+
+    def test_recherche_ne_relit_que_les_candidats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            paths = self._workspace(root)
+            index = TrigramIndex(root)
+            index.update(paths)
+            engine = WorkspaceSearch(root, lambda: paths, workers=1, trigrams=index)
+            recus: list = []
+
+            with patch("usbide.search.load_text", wraps=load_text) as lu:
+                engine.run("compute_total", recus.extend, threading.Event())
+
+            self.assertEqual([h.path for h in recus], ["src/app.py"])
+            self.assertEqual(lu.call_count, 1)
+            self.assertEqual(engine.backend, "threads+trigrammes")
+
+
+if __name__ == "__main__":
+    unittest.main()
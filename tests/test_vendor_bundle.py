@@ -0,0 +1,75 @@
+import importlib
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from usbide.vendor_bundle import build_vendor_bundle, bundle_path, fresh_vendor_bundle, vendor_dir
+
+
+def _creer_vendor(root_dir: Path) -> Path:
+    vendor = vendor_dir(root_dir)
+    (vendor / "usbide_pur").mkdir(parents=True)
+    (vendor / "usbide_pur" / "__init__.py").write_text("VALEUR = 'zip'\n", encoding="utf-8")
+    (vendor / "usbide_natif").mkdir()
+    (vendor / "usbide_natif" / "__init__.py").write_text("", encoding="utf-8")
+    (vendor / "usbide_natif" / "_ext.so").write_bytes(b"\x7fELF")
+    (vendor / "usbide_pur-1.0.dist-info").mkdir()
+    (vendor / "usbide_module.py").write_text("X = 1\n", encoding="utf-8")
+    return vendor
+
+
+class TestBuildVendorBundle(unittest.TestCase):
+    def test_paquets_natifs_restent_hors_archive(self) -> None:
+        # Les extensions natives ne peuvent pas etre chargees depuis un zip.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            _creer_vendor(root_dir)
+
+            report = build_vendor_bundle(root_dir)
+
+            self.assertEqual(report.bundled, ["usbide_module.py", "usbide_pur"])
+            self.assertEqual(report.unpacked, ["usbide_natif"])
+            with zipfile.ZipFile(bundle_path(root_dir)) as archive:
+                noms = set(archive.namelist())
+            self.assertIn("usbide_pur/__init__.py", noms)
+            self.assertIn("usbide_pur/__init__.pyc", noms)
+            self.assertNotIn("usbide_natif/_ext.so", noms)
+
+    def test_import_depuis_le_bundle(self) -> None:
+        # Le bytecode du bundle doit etre importable via zipimport.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            _creer_vendor(root_dir)
+            build_vendor_bundle(root_dir)
+            original = list(sys.path)
+            try:
+                sys.path.insert(0, str(bundle_path(root_dir)))
+                module = importlib.import_module("usbide_pur")
+                self.assertEqual(module.VALEUR, "zip")
+                self.assertIn("vendor.zip", module.__file__)
+            finally:
+                sys.path = original
+                sys.modules.pop("usbide_pur", None)
+
+    def test_vendor_absent(self) -> None:
+        # Sans vendor, la construction doit echouer explicitement.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(FileNotFoundError):
+                build_vendor_bundle(Path(tmp_dir))
+
+
+class TestFreshVendorBundle(unittest.TestCase):
+    def test_bundle_perime_apres_modification_du_vendor(self) -> None:
+        # Un nouveau paquet dans vendor invalide le bundle.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root_dir = Path(tmp_dir)
+            vendor = _creer_vendor(root_dir)
+            self.assertIsNone(fresh_vendor_bundle(root_dir))
+
+            build_vendor_bundle(root_dir)
+            self.assertEqual(fresh_vendor_bundle(root_dir), bundle_path(root_dir))
+
+            (vendor / "nouveau").mkdir()
+            self.assertIsNone(fresh_vendor_bundle(root_dir))
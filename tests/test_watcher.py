@@ -0,0 +1,146 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from usbide.watcher import PathWatcher, file_signature, watcher_settings
+
+
+class _Collecteur:
+    def __init__(self) -> None:
+        self.paths: list[Path] = []
+        self.event = threading.Event()
+
+    def __call__(self, path: Path) -> None:
+        self.paths.append(path)
+        self.event.set()
+
+    def attendre(self, path: Path, timeout: float = 5.0) -> bool:
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            if path in self.paths:
+                return True
+            self.event.wait(0.05)
+            self.event.clear()
+        return False
+
+
+def _reecrire(path: Path, contenu: str) -> None:
+    # Ecriture atomique comme un editeur externe: nouvel inode + os.replace.
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(contenu, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _inotify_disponible() -> bool:
+    watcher = PathWatcher(lambda _path: None)
+    watcher.stop()
+    return watcher.backend == "inotify"
+
+
+class TestPathWatcherPolling(unittest.TestCase):
+    def test_detecte_modification_fichier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.py"
+            path.write_text("a = 1\n", encoding="utf-8")
+            collecteur = _Collecteur()
+            watcher = PathWatcher(collecteur, mode="poll", poll_interval=0.05)
+            try:
+                watcher.watch(path)
+                self.assertEqual(watcher.backend, "poll")
+                _reecrire(path, "a = 22\n")
+                self.assertTrue(collecteur.attendre(path))
+            finally:
+                watcher.stop()
+
+    def test_detecte_ajout_dans_dossier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            collecteur = _Collecteur()
+            watcher = PathWatcher(collecteur, mode="poll", poll_interval=0.05)
+            try:
+                watcher.watch(root)
+                # Le mtime du dossier doit avancer de facon visible.
+                time.sleep(0.02)
+                (root / "nouveau.txt").write_text("x", encoding="utf-8")
+                self.assertTrue(collecteur.attendre(root))
+            finally:
+                watcher.stop()
+
+    def test_unwatch_arrete_la_surveillance(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.py"
+            path.write_text("a = 1\n", encoding="utf-8")
+            collecteur = _Collecteur()
+            watcher = PathWatcher(collecteur, mode="poll", poll_interval=0.05)
+            try:
+                watcher.watch(path)
+                watcher.unwatch(path)
+                _reecrire(path, "a = 22\n")
+                time.sleep(0.3)
+                self.assertEqual(collecteur.paths, [])
+                self.assertEqual(watcher.watched(), set())
+            finally:
+                watcher.stop()
+
+    def test_mode_off(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            watcher = PathWatcher(lambda _path: None, mode="off")
+            watcher.watch(Path(tmp_dir))
+            self.assertEqual(watcher.watched(), set())
+            watcher.stop()
+
+
+@unittest.skipUnless(_inotify_disponible(), "inotify indisponible")
+class TestPathWatcherInotify(unittest.TestCase):
+    def test_detecte_remplacement_atomique(self) -> None:
+        # os.replace change l'inode: le dossier parent est surveille, pas le fichier.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "a.py"
+            voisin = Path(tmp_dir) / "b.py"
+            path.write_text("a = 1\n", encoding="utf-8")
+            collecteur = _Collecteur()
+            watcher = PathWatcher(collecteur)
+            try:
+                watcher.watch(path)
+                _reecrire(path, "a = 2\n")
+                self.assertTrue(collecteur.attendre(path))
+                # Un fichier voisin non surveille n'est pas signale.
+                voisin.write_text("b", encoding="utf-8")
+                time.sleep(0.2)
+                self.assertNotIn(voisin, collecteur.paths)
+            finally:
+                watcher.stop()
+
+    def test_detecte_suppression_dans_dossier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            cible = root / "x.txt"
+            cible.write_text("x", encoding="utf-8")
+            collecteur = _Collecteur()
+            watcher = PathWatcher(collecteur)
+            try:
+                watcher.watch(root)
+                cible.unlink()
+                self.assertTrue(collecteur.attendre(root))
+            finally:
+                watcher.stop()
+
+
+class TestWatcherHelpers(unittest.TestCase):
+    def test_signature_fichier_absent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertIsNone(file_signature(Path(tmp_dir) / "absent"))
+
+    def test_reglages_env(self) -> None:
+        with patch.dict(os.environ, {"USBIDE_WATCHER": "Poll", "USBIDE_WATCH_INTERVAL": "0.5"}):
+            self.assertEqual(watcher_settings(), ("poll", 0.5))
+        with patch.dict(os.environ, {"USBIDE_WATCHER": "", "USBIDE_WATCH_INTERVAL": "abc"}):
+            self.assertEqual(watcher_settings(), ("auto", 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import argparse
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
+from usbide.vendor_bundle import build_vendor_bundle, fresh_vendor_bundle
 
-def parse_args() -> argparse.Namespace:
+# Origine de la chronologie --profile-startup (au plus tot dans le process).
+_START_NS = time.perf_counter_ns()
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(prog="usbide", description="Mini IDE terminal portable (Textual).")
     p.add_argument(
         "--root",
@@ -13,25 +20,114 @@ def parse_args() -> argparse.Namespace:
         default=Path.cwd(),
         help="Dossier racine du workspace (par défaut: répertoire courant).",
     )
-    return p.parse_args()
+    p.add_argument(
+        "--precompile",
+        action="store_true",
+        help="Précompile vendor, usbide et workspace dans le pycache portable puis quitte.",
+    )
+    p.add_argument(
+        "--build-vendor-bundle",
+        action="store_true",
+        help="Empaquette le vendor pur Python dans .usbide/vendor.zip (zipimport) puis quitte.",
+    )
+    p.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Profile le démarrage (cProfile + trace Chrome dans .usbide/profiles/).",
+    )
+    commands = p.add_subparsers(dest="command")
+    incidents = commands.add_parser(
+        "incidents",
+        help="Statistiques des incidents consignés (.usbide/incidents.sqlite3).",
+        description="Agrégats des incidents consignés dans bug.md, lus depuis .usbide/incidents.sqlite3.",
+    )
+    # --root accepté aussi après la sous-commande.
+    incidents.add_argument("--root", type=Path, default=argparse.SUPPRESS, help="Dossier racine du workspace.")
+    incidents.add_argument(
+        "--days", type=float, default=7, help="Période en jours (0: tout l'historique, 7 par défaut)."
+    )
+    incidents.add_argument(
+        "--by",
+        choices=("contexte", "niveau", "jour", "empreinte"),
+        default="contexte",
+        help="Regroupement (contexte, c.-à-d. l'action, par défaut).",
+    )
+    incidents.add_argument("--niveau", help="Ne garder qu'un niveau (ex: erreur).")
+    incidents.add_argument("--contexte", help="Ne garder qu'un contexte (action).")
+    incidents.add_argument("--top", type=int, default=10, help="Nombre de lignes affichées (10 par défaut).")
+    incidents.add_argument(
+        "--recent", action="store_true", help="Liste les dernières occurrences au lieu des agrégats."
+    )
+    return p.parse_args(argv)
+
+
+def incidents_report(args: argparse.Namespace) -> str:
+    """Rapport de `python -m usbide incidents` (sans charger l'IDE)."""
+    from usbide.incidentstore import IncidentStore, incidents_db_path, report
+
+    store = IncidentStore(incidents_db_path(args.root.resolve()))
+    try:
+        return report(
+            store,
+            by=args.by,
+            days=args.days,
+            niveau=args.niveau,
+            contexte=args.contexte,
+            limit=max(1, args.top),
+            recent=args.recent,
+        )
+    finally:
+        store.close()
 
 
 def ensure_vendor_path(root_dir: Path) -> None:
-    """Ajoute le répertoire vendor à sys.path si présent (portable)."""
+    """Ajoute le répertoire vendor à sys.path si présent (portable).
+
+    Si un bundle zipimport à jour existe, il passe devant le vendor: les paquets
+    purs Python sont lus depuis une seule archive, le reste depuis le vendor.
+    """
     vendor_path = root_dir / ".usbide" / "vendor"
     if not vendor_path.exists():
         # Rien à faire si le vendor n'existe pas.
         return
-    resolved = str(vendor_path.resolve())
-    if resolved not in sys.path:
-        # On injecte en tête pour privilégier les dépendances portables.
-        sys.path.insert(0, resolved)
+    entries = [str(vendor_path.resolve())]
+    bundle = fresh_vendor_bundle(root_dir)
+    if bundle is not None:
+        entries.insert(0, str(bundle.resolve()))
+    for entry in reversed(entries):
+        if entry not in sys.path:
+            # On injecte en tête pour privilégier les dépendances portables.
+            sys.path.insert(0, entry)
 
 
 def main() -> None:
     args = parse_args()
+    if args.command == "incidents":
+        print(incidents_report(args))
+        return
+    if args.build_vendor_bundle:
+        # Construit avant l'injection dans sys.path pour lire le vendor a plat.
+        print(build_vendor_bundle(args.root.resolve()).summary())
+        return
     # Supporte un environnement portable où les dépendances sont "vendored".
     ensure_vendor_path(args.root)
+    if args.precompile:
+        from usbide.precompile import precompile
+
+        # Pré-chauffe le bytecode pour épargner la compilation aux prochains lancements.
+        print(precompile(args.root.resolve()).summary())
+        return
+    if args.profile_startup:
+        from usbide.profiling import StartupProfiler, profiles_dir
+
+        profiler = StartupProfiler(profiles_dir(args.root.resolve()), origin_ns=_START_NS)
+        profiler.start()
+        with profiler.span("imports"):
+            from usbide.app import USBIDEApp
+        with profiler.span("USBIDEApp.__init__"):
+            app = USBIDEApp(root_dir=args.root, profiler=profiler)
+        app.run()
+        return
     from usbide.app import USBIDEApp
 
     app = USBIDEApp(root_dir=args.root)
@@ -1,23 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 import shutil
 import textwrap
-import traceback
+import threading
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Callable, Optional, Sequence
+from typing import Callable, ContextManager, Optional, Sequence
 
 from rich.markup import escape as rich_escape
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical
-from textual.widgets import DirectoryTree, Footer, Header, Input, RichLog, TextArea
-
-from usbide.encoding import detect_text_encoding, is_probably_binary
+from textual.timer import Timer
+from textual.css.query import NoMatches
+from textual.message import Message
+from textual.widgets import DirectoryTree, Footer, Header, Input, RichLog, Tab, Tabs, TextArea
+from textual.widgets.text_area import EditHistory
+
+from usbide.buffers import BufferCache
+from usbide.encoding import LoadedText, is_probably_binary, load_text
+from usbide.filecache import Classification, ClassificationCache
+from usbide.fileio import content_hash, save_text
+from usbide.fuzzy import FuzzyMatcher
+from usbide.ignore import IgnoreRules
+from usbide.incidents import IncidentWriter
+from usbide.incidentstore import IncidentStore, incidents_db_path
+from usbide.index import WorkspaceIndex
+from usbide.largefile import LargeFileView, LineIndex, large_file_threshold
+from usbide.logbuffer import LogPane
+from usbide.logsearch import LogCorpus
+from usbide.profiling import StartupProfiler
 from usbide.runner import (
     codex_bin_dir,
     codex_cli_available,
@@ -41,6 +61,23 @@ from usbide.runner import (
     tools_install_prefix,
     windows_cmd_argv,
 )
+from usbide.screens import ConfirmScreen, FuzzyFinderScreen, LogFilterScreen, SearchScreen
+from usbide.search import SearchHit, WorkspaceSearch, rg_executable
+from usbide.sessionlog import SessionLog
+from usbide.symbols import Symbol, SymbolIndex
+from usbide.swap import SwapEntry, SwapJournal
+from usbide.tree import WorkspaceTree
+from usbide.trigram import TrigramIndex, trigram_enabled
+from usbide.watcher import PathWatcher, Signature, file_signature, watcher_settings
+
+# Pre-chauffe du bytecode: attente d'inactivite (s) et nombre de process.
+_IDLE_PRECOMPILE_DELAY = 5.0
+_IDLE_PRECOMPILE_WORKERS = 2
+# Journal de secours: instantane apres une pause de frappe, au plus tard apres _SWAP_MAX_DELAY.
+_SWAP_DELAY = 2.0
+_SWAP_MAX_DELAY = 15.0
+# Regroupement des evenements de dossiers (s) avant de mettre l'arbre a jour.
+_TREE_DEBOUNCE = 0.2
 
 
 @dataclass
@@ -48,10 +85,30 @@ class OpenFile:
     path: Path
     encoding: str
     dirty: bool = False
+    # Gros fichiers: visionneuse paginee en lecture seule.
+    read_only: bool = False
+    # Etat de l'editeur conserve quand le buffer passe en arriere-plan.
+    text: str = ""
+    cursor: tuple[int, int] = (0, 0)
+    history: Optional[EditHistory] = None
+    # Empreinte de la derniere version lue ou ecrite (sauvegarde inutile evitee).
+    saved_hash: Optional[str] = None
+    # (taille, mtime_ns) du fichier a la derniere lecture/ecriture: detecte les ecritures externes.
+    disk_sig: Optional[Signature] = None
+
+
+class ExternalChange(Message):
+    """Un fichier ouvert a peut-etre change sur le disque (poste par le thread du watcher)."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
 
 
 class USBIDEApp(App):
     CSS_PATH = "usbide.tcss"
+    # Ctrl+P ouvre la recherche de fichiers; la palette de commandes Textual passe sur F1.
+    COMMAND_PALETTE_BINDING = "f1"
 
     # Ordre volontaire pour regrouper les actions d'execution avant les outils dev.
     # Priorite sur les raccourcis Codex pour eviter la capture par les widgets d'entree.
@@ -59,7 +116,12 @@ class USBIDEApp(App):
         Binding("ctrl+s", "save", "Sauvegarder"),
         Binding("f5", "run", "Executer"),
         Binding("ctrl+l", "clear_log", "Effacer les journaux"),
+        Binding("ctrl+g", "filter_log", "Filtrer le journal", priority=True),
         Binding("ctrl+r", "reload_tree", "Recharger l'arborescence"),
+        Binding("ctrl+p", "find_file", "Ouvrir un fichier", priority=True),
+        Binding("ctrl+f", "search", "Rechercher", priority=True),
+        Binding("ctrl+o", "symbols", "Symboles", priority=True),
+        Binding("f12", "goto_definition", "Aller a la definition"),
         Binding("ctrl+k", "codex_login", "Connexion Codex", priority=True),
         Binding("ctrl+t", "codex_check", "Verifier Codex", priority=True),
         Binding("ctrl+i", "codex_install", "Installer Codex", priority=True),
@@ -69,11 +131,23 @@ class USBIDEApp(App):
         Binding("ctrl+q", "quit", "Quitter"),
     ]
 
-    def __init__(self, root_dir: Path) -> None:
+    def __init__(self, root_dir: Path, *, profiler: Optional[StartupProfiler] = None) -> None:
         super().__init__()
         self.root_dir = root_dir.resolve()
         self.current: Optional[OpenFile] = None
-        self._loading_editor: bool = False
+        # Changements emis par les chargements programmes de l'editeur (a ignorer).
+        self._pending_editor_loads: int = 0
+        # Buffers recents (LRU, budget USBIDE_BUFFER_BUDGET_MB) et onglets associes.
+        self._buffers: BufferCache[OpenFile] = BufferCache()
+        self._buffer_tabs: dict[Path, str] = {}
+        self._buffer_tab_counter: int = 0
+        self._save_lock = asyncio.Lock()
+        # Classification (binaire/encodage) deja calculee, persistee dans .usbide/.
+        self._classification = ClassificationCache(self.root_dir)
+        # Journal de secours des buffers modifies (.usbide/swap).
+        self._swap = SwapJournal(self.root_dir)
+        self._swap_timer: Optional[Timer] = None
+        self._swap_first_change: float = 0.0
         self._codex_install_attempted: bool = False
         self._pyinstaller_install_attempted: bool = False
         # Mode compact par defaut pour rendre la sortie Codex lisible.
@@ -82,6 +156,50 @@ class USBIDEApp(App):
         self._last_codex_message: Optional[str] = None
         # Journal des erreurs/problemes a la racine du workspace.
         self._bug_log_path: Path = self.root_dir / "bug.md"
+        # Ecriture en fond, repetitions regroupees, rotation (USBIDE_BUG_MAX_KB); base SQLite pour les agregats.
+        self._incidents = IncidentWriter(
+            self._bug_log_path, store=IncidentStore(incidents_db_path(self.root_dir))
+        )
+        # Profilage optionnel du demarrage (--profile-startup).
+        self._profiler = profiler
+        self._profile_tree_start: Optional[int] = None
+        self._profile_first_frame: bool = False
+        self._profile_tree_ready: bool = False
+        # Derniere frappe dans l'editeur (monotonic), pour les taches d'inactivite.
+        self._last_edit_at: float = 0.0
+        # Annulation de l'indexation du gros fichier affiche.
+        self._large_cancel: Optional[threading.Event] = None
+        # Jeton du dernier fichier demande: les chargements plus anciens sont ignores.
+        self._open_generation: int = 0
+        # Position (ligne, colonne) a atteindre une fois le fichier demande affiche.
+        self._open_location: Optional[tuple[Path, tuple[int, int]]] = None
+        # Index persistant des fichiers du workspace (.usbide/index), rafraichi en fond.
+        # Regles d'exclusion (.gitignore, .usbide/ignore) partagees par l'arbre et l'index.
+        self._ignore = IgnoreRules(self.root_dir)
+        self._index = WorkspaceIndex(self.root_dir, rules=self._ignore)
+        # Recherche floue (Ctrl+P), construite en fond a partir de l'index.
+        self._fuzzy: Optional[FuzzyMatcher] = None
+        # Trigrammes du contenu (Ctrl+F), mis a jour en fond; USBIDE_TRIGRAM=0 le desactive.
+        self._trigrams: Optional[TrigramIndex] = TrigramIndex(self.root_dir) if trigram_enabled() else None
+        self._trigrams_loaded = False
+        # Symboles Python (Ctrl+O, F12) et palette construite a partir d'eux.
+        self._symbols = SymbolIndex(self.root_dir)
+        self._symbols_loaded = False
+        self._symbol_palette: Optional[tuple[FuzzyMatcher, dict[str, Symbol]]] = None
+        # Arret des mises a jour d'index de contenu a la fermeture.
+        self._content_cancel = threading.Event()
+        # Surveillance des fichiers ouverts (cree au montage) et conflits en attente de reponse.
+        self._watcher: Optional[PathWatcher] = None
+        self._conflicts: set[Path] = set()
+        # Dossiers listes dans l'arbre et surveilles; changements en attente du regroupement.
+        self._watched_dirs: set[Path] = set()
+        self._tree_pending: set[Path] = set()
+        self._tree_timer: Optional[Timer] = None
+        # Empreinte des regles racine a la derniere construction de l'arbre.
+        self._rules_fingerprint: Optional[str] = None
+        # Journal de session (.usbide/logs): toutes les lignes des deux panneaux, bornes
+        # en memoire (USBIDE_LOG_MAX_LINES), ecrites en fond avec rotation et gzip.
+        self._session_log = SessionLog(self.root_dir, on_error=self._session_log_failed)
 
     def get_css_variables(self) -> dict[str, str]:
         """Definit la palette moderne du theme Textual."""
@@ -110,41 +228,55 @@ class USBIDEApp(App):
         return variables
 
     def compose(self) -> ComposeResult:
-        yield Header()
-        with Horizontal(id="main"):
-            tree = DirectoryTree(str(self.root_dir), id="tree")
-            tree.border_title = "Fichiers"
-            yield tree
-
-            with Vertical(id="right"):
-                editor = self._make_editor()
-                editor.border_title = "Editeur"
-                yield editor
-
-                # Double journal: shell (gauche) / Codex (droite).
-                with Horizontal(id="bottom"):
-                    with Vertical(id="shell"):
-                        cmd = Input(placeholder="> commande shell (Entree)", id="cmd")
-                        cmd.border_title = "Commande"
-                        yield cmd
-
-                        log = RichLog(id="log", markup=True)
-                        log.border_title = "Journal"
-                        yield log
-
-                    with Vertical(id="codex"):
-                        codex_cmd = Input(
-                            placeholder="> Codex (Entree) : lance `codex exec --json <prompt>`",
-                            id="codex_cmd",
-                        )
-                        codex_cmd.border_title = "Codex"
-                        yield codex_cmd
-
-                        codex_log = RichLog(id="codex_log", markup=True)
-                        codex_log.border_title = "Sortie Codex"
-                        yield codex_log
-
-        yield Footer()
+        with self._profile_span("compose"):
+            yield Header()
+            with Horizontal(id="main"):
+                tree = WorkspaceTree(str(self.root_dir), rules=self._ignore, id="tree")
+                tree.border_title = "Fichiers"
+                yield tree
+
+                with Vertical(id="right"):
+                    buffers = Tabs(id="buffers")
+                    buffers.display = False
+                    yield buffers
+
+                    editor = self._make_editor()
+                    editor.border_title = "Editeur"
+                    yield editor
+
+                    large_view = LargeFileView(id="large_view")
+                    large_view.border_title = "Lecture seule"
+                    large_view.display = False
+                    yield large_view
+
+                    # Double journal: shell (gauche) / Codex (droite).
+                    with Horizontal(id="bottom"):
+                        with Vertical(id="shell"):
+                            cmd = Input(placeholder="> commande shell (Entree)", id="cmd")
+                            cmd.border_title = "Commande"
+                            yield cmd
+
+                            log = LogPane(id="log", markup=True, sink=partial(self._session_log.write, "journal"))
+                            log.border_title = "Journal"
+                            yield log
+
+                        with Vertical(id="codex"):
+                            codex_cmd = Input(
+                                placeholder="> Codex (Entree) : lance `codex exec --json <prompt>`",
+                                id="codex_cmd",
+                            )
+                            codex_cmd.border_title = "Codex"
+                            yield codex_cmd
+
+                            codex_log = LogPane(
+                                id="codex_log", markup=True, sink=partial(self._session_log.write, "codex")
+                            )
+                            codex_log.border_title = "Sortie Codex"
+                            yield codex_log
+
+            yield Footer()
+        # Le peuplement initial de l'arbre demarre au montage du widget.
+        self._profile_tree_start = time.perf_counter_ns()
 
     def _make_editor(self) -> TextArea:
         if hasattr(TextArea, "code_editor"):
@@ -152,14 +284,98 @@ class USBIDEApp(App):
         return TextArea("", id="editor")
 
     def on_mount(self) -> None:
-        self._ensure_portable_dirs()
-        self._log_ui(
-            f"[b]ValDev Pro v1[/b]\nRoot: {self.root_dir}\n"
-            "Shell: champ 'Commande' - Codex: champ 'Codex' - Ctrl+K login - Ctrl+I install\n"
-        )
-        self._update_codex_title()
-        self._refresh_title()
-        self._apply_intro_animation()
+        with self._profile_span("on_mount"):
+            with self._profile_span("_ensure_portable_dirs"):
+                self._ensure_portable_dirs()
+            self._log_ui(
+                f"[b]ValDev Pro v1[/b]\nRoot: {self.root_dir}\n"
+                "Shell: champ 'Commande' - Codex: champ 'Codex' - Ctrl+K login - Ctrl+I install\n"
+            )
+            self._update_codex_title()
+            self._refresh_title()
+            with self._profile_span("_apply_intro_animation"):
+                self._apply_intro_animation()
+            if self._truthy(os.environ.get("USBIDE_PRECOMPILE_IDLE")):
+                # Pre-chauffe differee pour ne pas concurrencer le demarrage.
+                self.set_timer(_IDLE_PRECOMPILE_DELAY, self._start_idle_precompile)
+            mode, interval = watcher_settings()
+            self._watcher = PathWatcher(
+                lambda path: self.post_message(ExternalChange(path)), mode=mode, poll_interval=interval
+            )
+            # Buffers non sauvegardes d'une session precedente (lecture hors boucle UI).
+            self.run_worker(self._check_swap, thread=True, group="swap_restore", exit_on_error=False)
+            self.run_worker(self._refresh_index, thread=True, group="index", exclusive=True, exit_on_error=False)
+        if self._profiler is not None:
+            # La premiere frame interactive suit le prochain rafraichissement.
+            self.call_after_refresh(self._profile_on_first_frame)
+
+    # ---------- profilage demarrage ----------
+    def _profile_span(self, name: str) -> ContextManager[None]:
+        """Mesure une phase si le profilage du demarrage est actif."""
+        if self._profiler is None or self._profiler.finished:
+            return nullcontext()
+        return self._profiler.span(name)
+
+    def _profile_on_first_frame(self) -> None:
+        if self._profiler is None:
+            return
+        self._profiler.mark("premiere_frame_interactive")
+        self._profile_first_frame = True
+        if self._profile_tree_ready or not self._root_has_entries():
+            # Un dossier racine vide ne declenche aucun peuplement.
+            self._profile_finish()
+        else:
+            # Borne courte: cProfile ne doit pas capturer l'usage interactif.
+            self.set_timer(2.0, self._profile_finish)
+
+    def _root_has_entries(self) -> bool:
+        try:
+            with os.scandir(self.root_dir) as it:
+                return any(True for _ in it)
+        except OSError:
+            return False
+
+    def on_workspace_tree_populated(self, event: WorkspaceTree.Populated) -> None:
+        if self._profiler is None or self._profile_tree_ready or not event.node.is_root:
+            return
+        self._profile_tree_ready = True
+        if self._profile_tree_start is not None:
+            self._profiler.add_span(
+                "DirectoryTree (peuplement initial)",
+                self._profile_tree_start,
+                time.perf_counter_ns(),
+            )
+        if self._profile_first_frame:
+            self._profile_finish()
+
+    def on_unmount(self) -> None:
+        # Sortie avant la fin du demarrage: le profil partiel est tout de meme ecrit.
+        self._profile_finish(log=False)
+        self._classification.flush()
+        if self._watcher is not None:
+            self._watcher.stop()
+        self._content_cancel.set()
+        self._session_log.close()
+        self._incidents.close()
+
+    def _profile_finish(self, *, log: bool = True) -> None:
+        """Ecrit le profil de demarrage (une seule fois)."""
+        if self._profiler is None or self._profiler.finished:
+            return
+        try:
+            prof_path, trace_path = self._profiler.finish()
+        except OSError as exc:
+            if not log:
+                return
+            self._log_issue(
+                f"[red]Profil de demarrage non ecrit:[/red] {exc}",
+                niveau="erreur",
+                contexte="profil_demarrage",
+                exc=exc,
+            )
+            return
+        if log:
+            self._log_ui(f"[dim]Profil demarrage: {prof_path} / {trace_path}[/dim]")
 
     def _apply_intro_animation(self) -> None:
         """Anime l'apparition des panneaux pour un rendu plus moderne."""
@@ -243,31 +459,12 @@ class USBIDEApp(App):
         details: Optional[str] = None,
         exc: Optional[BaseException] = None,
     ) -> None:
-        """Enregistre un incident dans bug.md (mode append)."""
-        # Le format Markdown facilite la lecture des rapports sur la cle USB.
-        horodatage = datetime.now().isoformat(timespec="seconds")
-        lignes = [
-            f"## {horodatage}",
-            f"- niveau: {niveau}",
-            f"- contexte: {contexte}",
-            f"- message: {message}",
-        ]
-        if details:
-            lignes.append(f"- details: {details}")
-        if exc is not None:
-            lignes.append(f"- exception: {type(exc).__name__}: {exc}")
-            trace = "".join(traceback.format_exception(exc)).rstrip()
-            if trace:
-                lignes.append("```")
-                lignes.extend(trace.splitlines())
-                lignes.append("```")
-        lignes.append("")
-        try:
-            with self._bug_log_path.open("a", encoding="utf-8") as handle:
-                handle.write("\n".join(lignes))
-        except OSError:
-            # Ne pas bloquer l'UI si le fichier bug.md est indisponible.
-            return
+        """Enregistre un incident dans bug.md (thread de fond, sans bloquer l'UI)."""
+        self._incidents.record(niveau, message, contexte=contexte, details=details, exc=exc)
+
+    def _session_log_failed(self, exc: OSError) -> None:
+        # Thread d'ecriture: pas d'acces a l'UI, seulement bug.md.
+        self._record_issue("avertissement", "journal de session desactive", contexte="session_log", exc=exc)
 
     def _log_issue(
         self,
@@ -320,6 +517,8 @@ class USBIDEApp(App):
                 exc=exc,
                 codex=codex,
             )
+        # La commande a pu creer ou supprimer des fichiers hors des dossiers surveilles.
+        self._sync_workspace()
 
     # ---------- env portable ----------
     def _ensure_portable_dirs(self) -> None:
@@ -382,6 +581,92 @@ class USBIDEApp(App):
         env = self._portable_env(env)
         return tools_env(self.root_dir, env)
 
+    def _start_idle_precompile(self) -> None:
+        """Lance la precompilation du bytecode dans un thread de fond."""
+        idle_for = time.monotonic() - self._last_edit_at
+        if idle_for < _IDLE_PRECOMPILE_DELAY:
+            # Saisie en cours: on attend une vraie pause avant de lancer le pool.
+            self.set_timer(_IDLE_PRECOMPILE_DELAY - idle_for, self._start_idle_precompile)
+            return
+        self.run_worker(
+            self._idle_precompile,
+            thread=True,
+            group="precompile",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _idle_precompile(self) -> None:
+        """Precompile vendor/usbide/workspace puis journalise le gain."""
+        # Import local: compileall/multiprocessing ne pesent pas sur chaque demarrage.
+        from usbide.precompile import precompile
+
+        try:
+            # Peu de process: la passe tourne pendant que l'utilisateur edite.
+            report = precompile(self.root_dir, workers=_IDLE_PRECOMPILE_WORKERS)
+        except Exception as exc:
+            # Un echec de pre-chauffe ne doit jamais gener l'edition.
+            self.call_from_thread(
+                self._log_issue,
+                f"[yellow]Precompilation impossible:[/yellow] {exc}",
+                niveau="avertissement",
+                contexte="precompilation",
+                exc=exc,
+            )
+            return
+        self.call_from_thread(self._log_ui, f"[dim]Precompilation: {report.summary()}[/dim]")
+
+    def _refresh_index(self) -> None:
+        """Charge l'index persistant puis ne relit que les dossiers modifies."""
+        self._rules_fingerprint = self._ignore.fingerprint()
+        self._index.load()
+        stats = self._index.refresh()
+        self._index.save()
+        self._rebuild_fuzzy()
+        self.call_from_thread(
+            self._log_ui,
+            f"[dim]Index: {stats.files} fichiers ({stats.elapsed_ms:.0f} ms, "
+            f"{stats.scanned_dirs} dossiers relus, {stats.reused_dirs} inchanges)[/dim]",
+        )
+        self._update_content_indexes()
+
+    def _schedule_content_indexes(self) -> None:
+        self.run_worker(
+            self._update_content_indexes, thread=True, group="content_indexes", exclusive=True, exit_on_error=False
+        )
+
+    def _update_content_indexes(self) -> None:
+        """Relit les fichiers nouveaux ou modifies (taille/mtime): trigrammes puis symboles (thread)."""
+        paths = self._index.paths()
+        if self._trigrams is not None:
+            if not self._trigrams_loaded:
+                self._trigrams.load()
+                self._trigrams_loaded = True
+            if self._trigrams.update(paths, self._content_cancel):
+                self._trigrams.save()
+        first = not self._symbols_loaded
+        if first:
+            self._symbols.load()
+            self._symbols_loaded = True
+        if self._symbols.update(paths, self._content_cancel) or first:
+            self._symbols.save()
+            self._rebuild_symbol_palette()
+
+    def _rebuild_symbol_palette(self) -> None:
+        """Palette des definitions (imports exclus), libelles uniques "nom  chemin:ligne" (thread)."""
+        labels = {
+            f"{symbol.qualname}  {symbol.path}:{symbol.line}": symbol
+            for symbol in self._symbols.symbols()
+            if symbol.kind != "import"
+        }
+        palette = (FuzzyMatcher(list(labels)), labels)
+        self.call_from_thread(setattr, self, "_symbol_palette", palette)
+
+    def _rebuild_fuzzy(self) -> None:
+        """Reconstruit la recherche floue depuis l'index (thread)."""
+        matcher = FuzzyMatcher(self._index.paths())
+        self.call_from_thread(setattr, self, "_fuzzy", matcher)
+
     def _wheelhouse_path(self) -> Optional[Path]:
         wheelhouse = self.root_dir / "tools" / "wheels"
         return wheelhouse if wheelhouse.is_dir() else None
@@ -394,61 +679,538 @@ class USBIDEApp(App):
             return
         dirty = " *" if self.current.dirty else ""
         self.title = f"ValDev Pro v1{dirty}"
-        self.sub_title = f"{self.current.path}  ({self.current.encoding})"
+        lecture = "  [lecture seule]" if self.current.read_only else ""
+        self.sub_title = f"{self.current.path}  ({self.current.encoding}){lecture}"
+        tab_id = self._buffer_tabs.get(self.current.path)
+        if tab_id is not None:
+            try:
+                self.query_one(f"#{tab_id}", Tab).label = self._buffer_label(self.current)
+            except NoMatches:
+                # Onglet pas encore monte: il recevra son libelle a la creation.
+                pass
 
     # ---------- tree ----------
     def on_directory_tree_file_selected(self, event: DirectoryTree.FileSelected) -> None:
-        path: Path = event.path
-        if path.is_dir():
+        self._open_path(event.path)
+
+    def _open_path(self, path: Path, *, location: Optional[tuple[int, int]] = None) -> None:
+        """Charge un fichier hors de la boucle UI; seule la derniere selection est appliquee."""
+        self._open_generation += 1
+        self._open_location = (path, location) if location is not None else None
+        if self.current is not None and self.current.path == path:
+            self.query_one(TextArea).loading = False
+            if location is not None and not self.current.read_only:
+                self._open_location = None
+                self.query_one(TextArea).move_cursor(location, center=True)
+            return
+        cached = self._buffers.get(path)
+        if cached is not None:
+            # Buffer en cache: ni relecture disque ni redecodage.
+            self.query_one(TextArea).loading = False
+            self._stash_current()
+            self._show_buffer(cached)
             return
+        self.query_one(TextArea).loading = True
+        # exclusive: un chargement encore en cours pour un autre fichier est annule.
+        self.run_worker(
+            partial(self._load_file, path, self._open_generation),
+            thread=True,
+            group="open_file",
+            exclusive=True,
+            exit_on_error=False,
+        )
 
+    def _load_file(self, path: Path, generation: int) -> None:
+        """Lecture disque dans un thread: stat, echantillon binaire, encodage, decodage."""
         try:
-            if is_probably_binary(path):
-                self._log_issue(
-                    f"[yellow]Binaire/non texte ignore:[/yellow] {path}",
-                    niveau="avertissement",
-                    contexte="ouverture_fichier",
-                )
+            if path.is_dir():
+                self.call_from_thread(self._open_finished, generation)
+                return
+            # stat pris avant la lecture: une ecriture concurrente invalide l'entree du cache.
+            st = path.stat()
+            size = st.st_size
+            known = self._classification.lookup(path, st)
+            if known is not None and known.binary:
+                loaded = LoadedText(text="", encoding="", size=size, lines=0, binary=True)
+                self.call_from_thread(self._apply_loaded, generation, path, loaded)
                 return
+            if size >= large_file_threshold():
+                if known is None and is_probably_binary(path):
+                    self._classification.store(path, st, Classification(binary=True, encoding=""))
+                    loaded = LoadedText(text="", encoding="", size=size, lines=0, binary=True)
+                    self.call_from_thread(self._apply_loaded, generation, path, loaded)
+                    return
+                # Gros fichier: mmap ouvert ici, l'index est construit ensuite en fond.
+                self.call_from_thread(self._apply_large_file, generation, path, LineIndex(path))
+                return
+            # Lecture unique: echantillon binaire + encodage + decodage (sautes si deja classe).
+            loaded = load_text(path, encoding=known.encoding if known is not None else None)
         except OSError as exc:
-            self._log_issue(
-                f"[red]Acces fichier impossible:[/red] {path} ({exc})",
-                niveau="erreur",
-                contexte="ouverture_fichier",
-                exc=exc,
+            self.call_from_thread(self._open_failed, generation, path, exc)
+            return
+        if known is None:
+            self._classification.store(
+                path, st, Classification(binary=loaded.binary, encoding=loaded.encoding, lines=loaded.lines)
             )
+        self.call_from_thread(
+            self._apply_loaded, generation, path, loaded, content_hash(loaded.text), (size, st.st_mtime_ns)
+        )
+
+    def _open_finished(self, generation: int) -> bool:
+        """Retire l'indicateur de chargement; False si le resultat est perime."""
+        if generation != self._open_generation:
+            return False
+        self.query_one(TextArea).loading = False
+        return True
+
+    def _open_failed(self, generation: int, path: Path, exc: OSError) -> None:
+        if not self._open_finished(generation):
             return
+        self._log_issue(
+            f"[red]Acces fichier impossible:[/red] {path} ({exc})",
+            niveau="erreur",
+            contexte="ouverture_fichier",
+            exc=exc,
+        )
 
-        encoding = detect_text_encoding(path)
-        try:
-            text = path.read_text(encoding=encoding)
-        except UnicodeDecodeError:
-            text = path.read_text(encoding=encoding, errors="replace")
-        except OSError as exc:
+    def _apply_loaded(
+        self,
+        generation: int,
+        path: Path,
+        loaded: LoadedText,
+        digest: Optional[str] = None,
+        disk_sig: Optional[Signature] = None,
+    ) -> None:
+        if not self._open_finished(generation):
+            return
+        if loaded.binary:
             self._log_issue(
-                f"[red]Erreur ouverture:[/red] {path} ({exc})",
-                niveau="erreur",
+                f"[yellow]Binaire/non texte ignore:[/yellow] {path}",
+                niveau="avertissement",
                 contexte="ouverture_fichier",
-                exc=exc,
             )
             return
 
+        self._stash_current()
+        self._show_buffer(
+            OpenFile(path=path, encoding=loaded.encoding, text=loaded.text, saved_hash=digest, disk_sig=disk_sig)
+        )
+
+    # ---------- buffers ----------
+    def _stash_current(self) -> None:
+        """Range l'etat de l'editeur (texte, curseur, annulation) dans le buffer courant."""
+        if self.current is None or self.current.read_only:
+            return
         editor = self.query_one(TextArea)
-        self._loading_editor = True
-        editor.text = text
-        self._loading_editor = False
+        self.current.text = editor.text
+        self.current.cursor = editor.cursor_location
+        self.current.history = editor.history
+        self._put_buffer(self.current)
+
+    def _show_buffer(self, buffer: OpenFile) -> None:
+        """Affiche un buffer dans l'editeur et le marque comme le plus recent."""
+        self._show_large_view(False)
+        editor = self.query_one(TextArea)
+        # load_text vide l'historique en place: l'ancien reste au buffer range.
+        previous = editor.history
+        editor.history = EditHistory(
+            max_checkpoints=previous.max_checkpoints,
+            checkpoint_timer=previous.checkpoint_timer,
+            checkpoint_max_characters=previous.checkpoint_max_characters,
+        )
+        self._pending_editor_loads += 1
+        editor.text = buffer.text
+        if buffer.history is not None:
+            editor.history = buffer.history
+        editor.move_cursor(buffer.cursor)
+        if self._open_location is not None and self._open_location[0] == buffer.path:
+            editor.move_cursor(self._open_location[1], center=True)
+            self._open_location = None
+
+        self.current = buffer
+        self._put_buffer(buffer)
+        self._refresh_title()
+        self.call_next(self._show_buffer_tab, buffer)
+
+    def _put_buffer(self, buffer: OpenFile) -> None:
+        """Range un buffer dans le cache LRU et surveille son fichier."""
+        self._drop_evicted(self._buffers.put(buffer))
+        if self._watcher is not None:
+            self._watcher.watch(buffer.path)
+
+    def _buffer_label(self, buffer: OpenFile) -> str:
+        return f"{buffer.path.name}{' *' if buffer.dirty else ''}"
+
+    async def _show_buffer_tab(self, buffer: OpenFile) -> None:
+        tabs = self.query_one("#buffers", Tabs)
+        tab_id = self._buffer_tabs.get(buffer.path)
+        if tab_id is None:
+            if buffer.path not in self._buffers:
+                return
+            self._buffer_tab_counter += 1
+            tab_id = f"buffer-{self._buffer_tab_counter}"
+            self._buffer_tabs[buffer.path] = tab_id
+            tabs.display = True
+            await tabs.add_tab(Tab(self._buffer_label(buffer), id=tab_id))
+        if buffer is self.current:
+            tabs.active = tab_id
+
+    def _drop_evicted(self, evicted: Sequence[OpenFile]) -> None:
+        """Retire les onglets des buffers propres evinces par le budget memoire."""
+        if not evicted:
+            return
+        tabs = self.query_one("#buffers", Tabs)
+        for buffer in evicted:
+            if self._watcher is not None:
+                self._watcher.unwatch(buffer.path)
+            tab_id = self._buffer_tabs.pop(buffer.path, None)
+            if tab_id is not None:
+                tabs.remove_tab(tab_id)
+        self._log_ui(f"[dim]Buffers liberes (budget memoire): {', '.join(b.path.name for b in evicted)}[/dim]")
+
+    def on_tabs_tab_activated(self, event: Tabs.TabActivated) -> None:
+        if event.tabs.id != "buffers" or event.tab is None:
+            return
+        for path, tab_id in self._buffer_tabs.items():
+            if tab_id == event.tab.id:
+                if self.current is None or self.current.path != path:
+                    self._open_path(path)
+                return
+
+    def _show_large_view(self, visible: bool) -> None:
+        """Bascule entre l'editeur et la visionneuse de gros fichiers."""
+        large_view = self.query_one("#large_view", LargeFileView)
+        if not visible:
+            if self._large_cancel is not None:
+                self._large_cancel.set()
+                self._large_cancel = None
+            large_view.close_index()
+        large_view.display = visible
+        self.query_one(TextArea).display = not visible
+
+    def _apply_large_file(self, generation: int, path: Path, index: LineIndex) -> None:
+        """Affiche un gros fichier en lecture seule (mmap + index de lignes en fond)."""
+        if not self._open_finished(generation):
+            index.close()
+            return
 
-        self.current = OpenFile(path=path, encoding=encoding, dirty=False)
+        self._stash_current()
+        self.query_one("#buffers", Tabs).active = ""
+        # Ferme l'eventuel gros fichier precedent (et annule son indexation).
+        self._show_large_view(False)
+        self._show_large_view(True)
+        large_view = self.query_one("#large_view", LargeFileView)
+        large_view.open(index)
+        large_view.focus()
+        self._large_cancel = threading.Event()
+        self.run_worker(
+            partial(self._index_large_file, large_view, index, self._large_cancel),
+            thread=True,
+            group="large_index",
+            exit_on_error=False,
+        )
+        self.current = OpenFile(path=path, encoding=index.encoding, read_only=True)
         self._refresh_title()
+        self._log_ui(f"[dim]Gros fichier ({index.size // (1024 * 1024)} Mo): lecture seule paginee[/dim]")
 
-    def on_text_area_changed(self, event: TextArea.Changed) -> None:
-        if self._loading_editor or not self.current:
+    def _index_large_file(self, large_view: LargeFileView, index: LineIndex, cancel: threading.Event) -> None:
+        """Construit l'index des lignes dans un thread de fond (aucune requete DOM ici)."""
+        index.build(cancel=cancel, progress=lambda _pos: self.call_from_thread(large_view.refresh_lines))
+        if index.complete:
+            self.call_from_thread(self._large_index_done, index)
+
+    def _large_index_done(self, index: LineIndex) -> None:
+        large_view = self.query_one("#large_view", LargeFileView)
+        if large_view.index is not index:
             return
+        large_view.refresh_lines()
+        if self.current is not None and self.current.path == index.path:
+            self.current.encoding = index.encoding
+            self._refresh_title()
+        self._log_ui(f"[dim]Index termine: {index.line_count} lignes[/dim]")
+
+    def on_text_area_changed(self, event: TextArea.Changed) -> None:
         ta = getattr(event, "text_area", None) or getattr(event, "control", None)
         if getattr(ta, "id", None) != "editor":
             return
+        if self._pending_editor_loads:
+            # TextArea.load_text emet Changed de facon asynchrone: ce n'est pas une edition.
+            self._pending_editor_loads -= 1
+            return
+        if not self.current or self.current.read_only:
+            return
+        self._last_edit_at = time.monotonic()
         self.current.dirty = True
         self._refresh_title()
+        self._schedule_swap()
+
+    # ---------- journal de secours ----------
+    def _schedule_swap(self) -> None:
+        """Regroupe les frappes: un seul instantane par pause (usure de la flash)."""
+        now = time.monotonic()
+        if self._swap_timer is None:
+            self._swap_first_change = now
+            self._swap_timer = self.set_timer(_SWAP_DELAY, self._flush_swap)
+        elif now - self._swap_first_change < _SWAP_MAX_DELAY:
+            self._swap_timer.reset()
+
+    def _swap_snapshots(self) -> list[tuple[Path, str, str]]:
+        """(chemin, texte, encodage) des buffers modifies, lus sur le thread UI."""
+        snapshots = []
+        for buffer in self._buffers:
+            if not buffer.dirty or buffer.read_only:
+                continue
+            if buffer is self.current:
+                try:
+                    buffer.text = self.query_one(TextArea).text
+                except NoMatches:
+                    # Demontage en cours: le dernier instantane range fait foi.
+                    pass
+            snapshots.append((buffer.path, buffer.text, buffer.encoding))
+        return snapshots
+
+    def _flush_swap(self) -> None:
+        self._swap_timer = None
+        snapshots = self._swap_snapshots()
+        if snapshots:
+            self.run_worker(partial(self._write_swap, snapshots), thread=True, group="swap", exit_on_error=False)
+
+    def _write_swap(self, snapshots: list[tuple[Path, str, str]], *, log: bool = True) -> None:
+        for path, text, encoding in snapshots:
+            try:
+                self._swap.write(path, text, encoding)
+            except OSError as exc:
+                if log:
+                    self.call_from_thread(
+                        self._log_issue,
+                        f"[yellow]Journal de secours non ecrit:[/yellow] {path} ({exc})",
+                        niveau="avertissement",
+                        contexte="journal_secours",
+                        exc=exc,
+                    )
+                return
+
+    async def action_quit(self) -> None:
+        # Sortie sans sauvegarder: les modifications restent proposees au prochain lancement.
+        self._write_swap(self._swap_snapshots(), log=False)
+        await super().action_quit()
+
+    def _check_swap(self) -> None:
+        entries = self._swap.pending()
+        if entries:
+            self.call_from_thread(self._offer_swap_restore, entries)
+
+    def _offer_swap_restore(self, entries: list[SwapEntry]) -> None:
+        names = ", ".join(entry.path.name for entry in entries[:5]) + (" ..." if len(entries) > 5 else "")
+        question = f"{len(entries)} buffer(s) non sauvegarde(s) a la derniere session: {names}\nRestaurer ?"
+
+        def done(restore: Optional[bool]) -> None:
+            if restore:
+                self._restore_swap(entries)
+            else:
+                self.run_worker(partial(self._swap.clear, entries), thread=True, group="swap", exit_on_error=False)
+
+        self.push_screen(ConfirmScreen(question), done)
+
+    def _restore_swap(self, entries: list[SwapEntry]) -> None:
+        """Rouvre les instantanes comme buffers modifies (a sauvegarder explicitement)."""
+        self._stash_current()
+        restored = [
+            OpenFile(path=entry.path, encoding=entry.encoding, dirty=True, text=entry.text) for entry in entries
+        ]
+        current_path = self.current.path if self.current is not None else None
+        shown = next((buffer for buffer in restored if buffer.path == current_path), restored[-1])
+        for buffer in restored:
+            if buffer is not shown:
+                self._put_buffer(buffer)
+                self.call_next(self._show_buffer_tab, buffer)
+        self._show_buffer(shown)
+        self._log_ui(f"[green]Restaure(s) depuis le journal:[/green] {len(restored)} buffer(s)")
+
+    # ---------- modifications externes ----------
+    def on_workspace_tree_directory_listed(self, event: WorkspaceTree.DirectoryListed) -> None:
+        if self._watcher is None or event.path in self._watched_dirs:
+            return
+        self._watched_dirs.add(event.path)
+        self._watcher.watch(event.path)
+
+    def on_external_change(self, event: ExternalChange) -> None:
+        if event.path in self._watched_dirs:
+            self._queue_tree_change(event.path)
+            return
+        buffer = self._buffers.peek(event.path)
+        if buffer is None or buffer.read_only:
+            return
+        # Relecture hors boucle UI; une rafale d'evenements sur le meme fichier n'en garde qu'une.
+        self.run_worker(
+            partial(self._check_external, buffer.path, buffer.disk_sig),
+            thread=True,
+            group=f"external:{buffer.path}",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _queue_tree_change(self, path: Path) -> None:
+        # Une rafale (git checkout, pip install...) ne declenche qu'une mise a jour.
+        self._tree_pending.add(path)
+        if self._tree_timer is None:
+            self._tree_timer = self.set_timer(_TREE_DEBOUNCE, self._flush_tree_changes)
+
+    def _flush_tree_changes(self) -> None:
+        self._tree_timer = None
+        paths, self._tree_pending = sorted(self._tree_pending), set()
+        if paths:
+            self.run_worker(self._apply_tree_changes(paths), group="tree_changes", exit_on_error=False)
+
+    async def _apply_tree_changes(self, paths: list[Path]) -> None:
+        """Met a jour les noeuds et les entrees d'index des seuls dossiers modifies."""
+        gone = [path for path, exists in zip(paths, await asyncio.to_thread(self._dirs_exist, paths)) if not exists]
+        for path in gone:
+            self._watched_dirs.discard(path)
+            if self._watcher is not None:
+                self._watcher.unwatch(path)
+        rels = [rel for rel in map(self._ignore.relative, paths) if rel is not None]
+        for rel in rels:
+            # Un .gitignore a pu etre ajoute, remplace ou supprime dans ce dossier.
+            self._ignore.invalidate(rel)
+        await self.query_one(WorkspaceTree).refresh_directories([path for path in paths if path not in gone])
+        await asyncio.to_thread(self._update_index, rels)
+
+    @staticmethod
+    def _dirs_exist(paths: list[Path]) -> list[bool]:
+        return [path.is_dir() for path in paths]
+
+    def _update_index(self, rels: list[str]) -> None:
+        if self._index.update_dirs(rels):
+            self._index.save()
+            self._rebuild_fuzzy()
+            self.call_from_thread(self._schedule_content_indexes)
+
+    def _sync_workspace(self, *, announce: bool = False) -> None:
+        """Verification de coherence en fond (fin de commande, Ctrl+R)."""
+        self.run_worker(
+            self._check_workspace(announce), group="workspace_sync", exclusive=True, exit_on_error=False
+        )
+
+    async def _check_workspace(self, announce: bool) -> None:
+        # Un stat par dossier liste ou indexe: seuls les dossiers modifies sont relus.
+        tree = self.query_one(WorkspaceTree)
+        fingerprint = await asyncio.to_thread(self._ignore.fingerprint)
+        if self._rules_fingerprint is not None and fingerprint != self._rules_fingerprint:
+            # Regles racine modifiees: la visibilite de tout l'arbre peut changer.
+            self._rules_fingerprint = fingerprint
+            self._ignore.invalidate()
+            await tree.reload()
+            changed_count = -1
+        else:
+            changed = await asyncio.to_thread(tree.changed_directories)
+            await tree.refresh_directories(changed)
+            changed_count = len(changed)
+        stats = await asyncio.to_thread(self._index.refresh)
+        if stats.scanned_dirs:
+            await asyncio.to_thread(self._index.save)
+            await asyncio.to_thread(self._rebuild_fuzzy)
+        # Ecritures en place (mtime du dossier inchange): seules les signatures des fichiers les revelent.
+        self._schedule_content_indexes()
+        if not announce:
+            return
+        if changed_count < 0:
+            self._log_ui("[dim]arborescence rechargee (regles d'exclusion modifiees)[/dim]")
+        else:
+            self._log_ui(
+                f"[dim]arborescence verifiee: {changed_count} dossier(s) mis a jour, "
+                f"index {stats.scanned_dirs} dossier(s) relu(s)[/dim]"
+            )
+
+    def _check_external(self, path: Path, known: Optional[Signature]) -> None:
+        """Compare le disque au buffer; relit le fichier (chargeur en une passe) s'il a change."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self.call_from_thread(self._external_removed, path)
+            return
+        except OSError:
+            return
+        sig = (st.st_size, st.st_mtime_ns)
+        if sig == known:
+            return
+        try:
+            # Detection complete: l'outil externe a pu changer l'encodage.
+            loaded = load_text(path)
+        except OSError:
+            return
+        self.call_from_thread(self._apply_external, path, loaded, content_hash(loaded.text), sig)
+
+    def _external_removed(self, path: Path) -> None:
+        buffer = self._buffers.peek(path)
+        if buffer is None or buffer.disk_sig is None:
+            return
+        buffer.disk_sig = None
+        buffer.saved_hash = None
+        self._log_issue(
+            f"[yellow]Fichier supprime hors de l'editeur:[/yellow] {path} (Ctrl+S pour le recreer)",
+            niveau="avertissement",
+            contexte="modification_externe",
+        )
+
+    def _apply_external(self, path: Path, loaded: LoadedText, digest: str, sig: Signature) -> None:
+        buffer = self._buffers.peek(path)
+        if buffer is None or buffer.read_only:
+            return
+        buffer.disk_sig = sig
+        if digest == buffer.saved_hash:
+            # Notre propre sauvegarde (ou un simple touch): rien a recharger.
+            return
+        if loaded.binary:
+            self._log_issue(
+                f"[yellow]Fichier devenu binaire hors de l'editeur:[/yellow] {path}",
+                niveau="avertissement",
+                contexte="modification_externe",
+            )
+            return
+        if not buffer.dirty:
+            self._reload_buffer(buffer, loaded, digest)
+            self._log_ui(f"[dim]Recharge (modifie hors de l'editeur):[/dim] {path}")
+            return
+        if path in self._conflicts:
+            return
+        self._conflicts.add(path)
+        question = (
+            f"{path.name} a ete modifie hors de l'editeur.\n"
+            "Recharger depuis le disque (vos modifications seront perdues) ?"
+        )
+
+        def done(reload: Optional[bool]) -> None:
+            self._conflicts.discard(path)
+            if self._buffers.peek(path) is not buffer:
+                return
+            if reload:
+                self._reload_buffer(buffer, loaded, digest)
+                self._log_ui(f"[dim]Recharge depuis le disque:[/dim] {path}")
+            else:
+                # La prochaine sauvegarde doit ecrire, meme si le texte egale l'ancienne version.
+                buffer.saved_hash = None
+                self._log_issue(
+                    f"[yellow]Conflit: version de l'editeur conservee[/yellow] {path} (Ctrl+S ecrasera le disque)",
+                    niveau="avertissement",
+                    contexte="modification_externe",
+                )
+
+        self.push_screen(ConfirmScreen(question), done)
+
+    def _reload_buffer(self, buffer: OpenFile, loaded: LoadedText, digest: str) -> None:
+        """Remplace le contenu d'un buffer par la version disque (curseur conserve)."""
+        buffer.text = loaded.text
+        buffer.encoding = loaded.encoding
+        buffer.saved_hash = digest
+        buffer.history = None
+        buffer.dirty = False
+        if buffer is self.current:
+            buffer.cursor = self.query_one(TextArea).cursor_location
+            self._show_buffer(buffer)
+        else:
+            buffer.cursor = (0, 0)
+        self._refresh_title()
 
     # ---------- inputs ----------
     async def on_input_submitted(self, event: Input.Submitted) -> None:
@@ -993,6 +1755,8 @@ class USBIDEApp(App):
                 exc=exc,
                 codex=True,
             )
+        # Codex modifie le workspace: arbre et index sont reverifies.
+        self._sync_workspace()
 
     # ---------- actions ----------
     def action_clear_log(self) -> None:
@@ -1002,6 +1766,34 @@ class USBIDEApp(App):
         self._last_codex_message = None
         self._log_ui("[dim]journaux effaces[/dim]")
 
+    def action_filter_log(self) -> None:
+        """Filtre le journal actif (Codex si le focus y est, sinon le journal shell)."""
+        codex = self.focused is not None and self.focused.id in {"codex_cmd", "codex_log"}
+        pane = self.query_one("#codex_log" if codex else "#log", LogPane)
+        # Instantane pris ici (thread UI): les ecritures suivantes ne decalent pas le corpus.
+        history = pane.history.lines()
+        dropped = pane.history.dropped
+        load = partial(self._log_corpus, "codex" if codex else "journal", history, dropped)
+        self.push_screen(
+            LogFilterScreen(load, title="sortie Codex" if codex else "journal"),
+            partial(self._reveal_log_line, pane),
+        )
+
+    def _log_corpus(self, source: str, history: list[str], dropped: int) -> LogCorpus:
+        """Lignes archivees (journal de session) puis historique en memoire d'un panneau (thread)."""
+        archived: list[str] = []
+        if dropped:
+            self._session_log.flush()
+            first, lines = self._session_log.read_lines(source)
+            # Seules les lignes sorties de l'historique au moment de l'instantane.
+            archived = lines[: max(0, dropped - first)]
+        return LogCorpus(archived + history, archived=len(archived))
+
+    def _reveal_log_line(self, pane: LogPane, from_end: Optional[int]) -> None:
+        if from_end is None:
+            return
+        pane.scroll_to(y=max(0, len(pane.lines) - 1 - from_end - 2), animate=False)
+
     def action_toggle_codex_view(self) -> None:
         """Bascule entre vue compacte et vue brute."""
         self._codex_compact_view = not self._codex_compact_view
@@ -1010,11 +1802,105 @@ class USBIDEApp(App):
         self._update_codex_title()
         self._codex_log_ui(f"[dim]Mode Codex: {self._codex_mode_label()}[/dim]")
 
+    def action_find_file(self) -> None:
+        if self._fuzzy is None:
+            self._log_ui("[yellow]Index des fichiers en cours de construction...[/yellow]")
+            return
+
+        def done(relative: Optional[str]) -> None:
+            if relative:
+                self._open_path(self.root_dir / relative)
+
+        self.push_screen(FuzzyFinderScreen(self._fuzzy), done)
+
+    def action_search(self) -> None:
+        editor = self.query_one(TextArea)
+        # Selection d'une ligne dans l'editeur: requete pre-remplie.
+        selected = editor.selected_text if "\n" not in editor.selected_text else ""
+        env = self._tools_env()
+        engine = WorkspaceSearch(
+            self.root_dir, self._search_candidates, rg=rg_executable(env), env=env, trigrams=self._trigrams
+        )
+
+        def done(hit: Optional[SearchHit]) -> None:
+            if hit is not None:
+                self._open_path(self.root_dir / hit.path, location=(hit.line - 1, hit.column))
+
+        self.push_screen(SearchScreen(engine, query=selected), done)
+
+    def _content_saved(self, path: Path) -> None:
+        rel = self._ignore.relative(path)
+        if rel:
+            self.run_worker(partial(self._update_saved, rel), thread=True, group="content_save", exit_on_error=False)
+
+    def _update_saved(self, rel: str) -> None:
+        """Met a jour trigrammes et symboles du seul fichier sauvegarde (thread)."""
+        if self._trigrams is not None and self._trigrams_loaded:
+            self._trigrams.update_paths([rel])
+        if self._symbols_loaded and self._symbols.update_paths([rel]):
+            self._rebuild_symbol_palette()
+
+    def _search_candidates(self) -> list[str]:
+        """Fichiers a parcourir (thread de recherche): ceux de l'index, construit au besoin."""
+        paths = self._index.paths()
+        if not paths:
+            self._index.refresh()
+            paths = self._index.paths()
+        return paths
+
+    def action_symbols(self) -> None:
+        if self._symbol_palette is None:
+            self._log_ui("[yellow]Index des symboles en cours de construction...[/yellow]")
+            return
+        matcher, labels = self._symbol_palette
+        self.push_screen(
+            FuzzyFinderScreen(matcher, placeholder=f"Symbole ({len(labels)} indexes)"),
+            lambda label: self._goto_symbol(labels[label]) if label else None,
+        )
+
+    def action_goto_definition(self) -> None:
+        if self.current is None or self.current.read_only:
+            return
+        editor = self.query_one(TextArea)
+        row, column = editor.cursor_location
+        name = self._identifier_at(editor.document.get_line(row), column)
+        if not name:
+            return
+        if not self._symbols_loaded:
+            self._log_ui("[yellow]Index des symboles en cours de construction...[/yellow]")
+            return
+        found = self._symbols.definitions(name, prefer=self._ignore.relative(self.current.path))
+        definitions = [symbol for symbol in found if symbol.kind != "import"] or found
+        if not definitions:
+            self._log_ui(f"[yellow]Aucune definition pour[/yellow] {rich_escape(name)}")
+            return
+        if len(definitions) == 1:
+            self._goto_symbol(definitions[0])
+            return
+        # Plusieurs definitions: choix dans la palette, limitee a celles-ci.
+        labels = {f"{symbol.qualname}  {symbol.path}:{symbol.line}": symbol for symbol in definitions}
+        self.push_screen(
+            FuzzyFinderScreen(FuzzyMatcher(list(labels)), placeholder=f"Definitions de {name}"),
+            lambda label: self._goto_symbol(labels[label]) if label else None,
+        )
+
+    @staticmethod
+    def _identifier_at(line: str, column: int) -> str:
+        """Identifiant Python sous (ou juste avant) le curseur."""
+        for match in re.finditer(r"[A-Za-z_]\w*", line):
+            if match.start() <= column <= match.end():
+                return match.group()
+        return ""
+
+    def _goto_symbol(self, symbol: Symbol) -> None:
+        self._open_path(self.root_dir / symbol.path, location=(symbol.line - 1, symbol.column))
+
     def action_reload_tree(self) -> None:
-        self.query_one(DirectoryTree).reload()
-        self._log_ui("[dim]arborescence rechargee[/dim]")
+        # Les .gitignore ont pu changer depuis leur premiere lecture.
+        self._ignore.invalidate()
+        self._sync_workspace(announce=True)
 
-    def action_save(self) -> bool:
+    async def action_save(self) -> bool:
         if not self.current:
             self._log_issue(
                 "[yellow]Aucun fichier ouvert.[/yellow]",
@@ -1022,46 +1908,57 @@ class USBIDEApp(App):
                 contexte="sauvegarde",
             )
             return False
+        if self.current.read_only:
+            self._log_issue(
+                "[yellow]Fichier ouvert en lecture seule (gros fichier).[/yellow]",
+                niveau="avertissement",
+                contexte="sauvegarde",
+            )
+            return False
 
+        buffer = self.current
         editor = self.query_one(TextArea)
         content = editor.text
-        path = self.current.path
-        encoding = self.current.encoding
+        path = buffer.path
+        started = time.monotonic()
 
-        try:
-            path.write_text(content, encoding=encoding)
-            self.current.dirty = False
-            self._log_ui(f"[green]Sauvegarde[/green] {path}")
-            return True
-        except UnicodeEncodeError:
+        # Une sauvegarde a la fois: deux Ctrl+S rapproches ne se croisent pas sur le disque.
+        async with self._save_lock:
             try:
-                path.write_text(content, encoding="utf-8")
+                # Hachage, encodage, fsync et os.replace hors de la boucle UI.
+                result = await asyncio.to_thread(
+                    save_text, path, content, buffer.encoding, previous_hash=buffer.saved_hash
+                )
             except OSError as exc:
                 self._log_issue(
-                    f"[red]Erreur sauvegarde (UTF-8):[/red] {path} ({exc})",
+                    f"[red]Erreur sauvegarde:[/red] {path} ({exc})",
                     niveau="erreur",
                     contexte="sauvegarde",
                     exc=exc,
                 )
                 return False
-            self.current.encoding = "utf-8"
-            self.current.dirty = False
+
+        buffer.encoding = result.encoding
+        buffer.saved_hash = result.digest
+        if result.written:
+            buffer.disk_sig = await asyncio.to_thread(file_signature, path)
+            self._content_saved(path)
+        if self._last_edit_at < started:
+            # Pas de frappe pendant l'ecriture: le disque reflete l'editeur.
+            buffer.dirty = False
+            await asyncio.to_thread(self._swap.discard, path)
+        if not result.written:
+            self._log_ui(f"[dim]Aucune modification[/dim] {path}")
+        elif result.fallback:
             self._log_issue(
                 f"[yellow]Sauvegarde en UTF-8 (fallback)[/yellow] {path}",
                 niveau="avertissement",
                 contexte="sauvegarde",
             )
-            return True
-        except OSError as exc:
-            self._log_issue(
-                f"[red]Erreur sauvegarde:[/red] {path} ({exc})",
-                niveau="erreur",
-                contexte="sauvegarde",
-                exc=exc,
-            )
-            return False
-        finally:
-            self._refresh_title()
+        else:
+            self._log_ui(f"[green]Sauvegarde[/green] {path}")
+        self._refresh_title()
+        return True
 
     async def action_run(self) -> None:
         if not self.current or self.current.path.suffix.lower() != ".py":
@@ -1072,7 +1969,7 @@ class USBIDEApp(App):
             )
             return
         if self.current.dirty:
-            self.action_save()
+            await self.action_save()
 
         argv = python_run_argv(self.current.path)
         env = self._portable_env(os.environ.copy())
@@ -1286,7 +2183,7 @@ class USBIDEApp(App):
             )
             return
         if self.current.dirty:
-            self.action_save()
+            await self.action_save()
 
         env = self._tools_env()
         if not pyinstaller_available(self.root_dir, env):
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Generic, Iterator, Optional, Protocol, TypeVar
+
+# Budget memoire par defaut des buffers gardes en cache (texte decode).
+DEFAULT_BUFFER_BUDGET_MB = 32
+
+
+def buffer_budget() -> int:
+    """Budget en octets (USBIDE_BUFFER_BUDGET_MB, 32 Mo par defaut)."""
+    raw = os.environ.get("USBIDE_BUFFER_BUDGET_MB", "").strip()
+    try:
+        mb = float(raw) if raw else DEFAULT_BUFFER_BUDGET_MB
+    except ValueError:
+        mb = DEFAULT_BUFFER_BUDGET_MB
+    return max(0, int(mb * 1024 * 1024))
+
+
+class _Buffer(Protocol):
+    path: Path
+    text: str
+    dirty: bool
+
+
+B = TypeVar("B", bound=_Buffer)
+
+
+def buffer_cost(buffer: _Buffer) -> int:
+    """Empreinte approximative d'un buffer (taille reelle de la chaine Python)."""
+    return sys.getsizeof(buffer.text)
+
+
+class BufferCache(Generic[B]):
+    """Buffers recents, du moins au plus recemment utilise (LRU).
+
+    Les buffers propres au-dela du budget sont evinces; un buffer modifie
+    n'est jamais evince (il reste tant qu'il n'est pas sauvegarde).
+    """
+
+    def __init__(self, budget: Optional[int] = None) -> None:
+        self.budget = buffer_budget() if budget is None else budget
+        self._buffers: OrderedDict[Path, B] = OrderedDict()
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._buffers
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __iter__(self) -> Iterator[B]:
+        return iter(self._buffers.values())
+
+    @property
+    def total(self) -> int:
+        return sum(buffer_cost(buffer) for buffer in self._buffers.values())
+
+    def get(self, path: Path) -> Optional[B]:
+        """Retourne le buffer et le marque comme le plus recent."""
+        buffer = self._buffers.get(path)
+        if buffer is not None:
+            self._buffers.move_to_end(path)
+        return buffer
+
+    def peek(self, path: Path) -> Optional[B]:
+        """Retourne le buffer sans changer l'ordre LRU."""
+        return self._buffers.get(path)
+
+    def put(self, buffer: B) -> list[B]:
+        """Ajoute/rafraichit un buffer (le plus recent) et retourne les buffers evinces."""
+        self._buffers[buffer.path] = buffer
+        self._buffers.move_to_end(buffer.path)
+        return self._evict(keep=buffer.path)
+
+    def remove(self, path: Path) -> Optional[B]:
+        return self._buffers.pop(path, None)
+
+    def _evict(self, keep: Path) -> list[B]:
+        evicted: list[B] = []
+        total = self.total
+        for path in list(self._buffers):
+            if total <= self.budget:
+                break
+            buffer = self._buffers[path]
+            if path == keep or buffer.dirty:
+                continue
+            del self._buffers[path]
+            total -= buffer_cost(buffer)
+            evicted.append(buffer)
+        return evicted
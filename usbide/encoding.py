@@ -1,7 +1,34 @@
 from __future__ import annotations
 
+import codecs
+import io
+import os
 import tokenize
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+from usbide.filecache import Classification, ClassificationCache
+
+# Lecture par blocs: un petit echantillon d'abord, puis des blocs plus larges.
+_SAMPLE_BYTES = 64 * 1024
+_CHUNK_BYTES = 1024 * 1024
+# Octets que cp1252 sait decoder (tous sauf 0x81, 0x8D, 0x8F, 0x90, 0x9D).
+_CP1252_DEFINED = bytes(b for b in range(256) if b not in (0x81, 0x8D, 0x8F, 0x90, 0x9D))
+# Caracteres de controle non textuels (tout < 0x20 sauf \t \n \r, plus DEL).
+_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 13)) + b"\x7f"
+
+
+@dataclass(frozen=True)
+class LoadedText:
+    text: str
+    encoding: str
+    # Statistiques utiles a l'UI (titre, choix du mode d'affichage).
+    size: int
+    lines: int
+    binary: bool = False
+    replaced: bool = False
 
 
 def detect_text_encoding(path: Path) -> str:
@@ -21,17 +48,67 @@ def detect_text_encoding(path: Path) -> str:
             # Fallback sûr si le fichier n'est pas accessible.
             return "utf-8"
 
-    for enc in ("utf-8", "utf-8-sig", "cp1252", "latin-1"):
-        try:
-            path.read_text(encoding=enc)
-            return enc
-        except UnicodeDecodeError:
-            continue
-        except OSError:
-            # Fallback sûr si le fichier n'est pas accessible.
-            return "utf-8"
+    try:
+        with path.open("rb") as fh:
+            return _sniff_stream(fh)
+    except OSError:
+        # Fallback sûr si le fichier n'est pas accessible.
+        return "utf-8"
 
-    return "utf-8"
+
+def _sniff_stream(fh: BinaryIO, head: bytes = b"") -> str:
+    """Encodage d'un flux par blocs (echantillon d'abord), arret des que la reponse est sure."""
+    sniffer = EncodingSniffer()
+    if head:
+        sniffer.feed(head)
+    size = _SAMPLE_BYTES
+    while not sniffer.done:
+        chunk = fh.read(size)
+        if not chunk:
+            break
+        sniffer.feed(chunk)
+        size = _CHUNK_BYTES
+    return sniffer.result()
+
+
+class EncodingSniffer:
+    """Detection d'encodage incrementale (memes reponses que le decodage complet).
+
+    Les blocs sont consommes au fil de l'eau, sans garder le fichier en memoire:
+    - utf-8 via un decodeur incremental (sequences coupees entre deux blocs OK);
+    - utf-8-sig accepte exactement les memes octets que utf-8, BOM ou non:
+      utf-8 passe avant lui, il n'est donc jamais decode;
+    - cp1252 est mono-octet: seuls 5 octets sont indefinis, un comptage suffit;
+    - latin-1 accepte tout: des que c'est le seul survivant, `done` est vrai.
+    """
+
+    def __init__(self) -> None:
+        self._utf8: Optional[codecs.IncrementalDecoder] = codecs.getincrementaldecoder("utf-8")()
+        self._cp1252 = True
+
+    @property
+    def done(self) -> bool:
+        """True si aucun bloc supplementaire ne peut changer la reponse."""
+        return self._utf8 is None and not self._cp1252
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        """Alimente les candidats encore valides avec un bloc d'octets."""
+        if self._utf8 is not None:
+            try:
+                self._utf8.decode(data, final)
+            except UnicodeDecodeError:
+                self._utf8 = None
+        if self._cp1252 and data.translate(None, _CP1252_DEFINED):
+            self._cp1252 = False
+
+    def result(self) -> str:
+        """Premier candidat valide sur l'ensemble des octets recus."""
+        self.feed(b"", final=True)
+        if self._utf8 is not None:
+            return "utf-8"
+        if self._cp1252:
+            return "cp1252"
+        return "latin-1"
 
 
 def is_probably_binary(path: Path, sniff_bytes: int = 2048) -> bool:
@@ -52,19 +129,143 @@ def is_probably_binary(path: Path, sniff_bytes: int = 2048) -> bool:
         # On laisse remonter l'erreur pour distinguer "binaire" d'"inaccessible".
         raise
 
+    return _looks_binary(data)
+
+
+def _looks_binary(data: bytes) -> bool:
+    """Heuristique binaire appliquee a un echantillon deja lu."""
     if b"\x00" in data:
         return True
 
     if not data:
         return False
 
-    # Compte des caractères de contrôle (hors \n \r \t)
-    ctrl = 0
-    for b in data:
-        if b in (9, 10, 13):  # \t \n \r
-            continue
-        if b < 32 or b == 127:
-            ctrl += 1
+    # Compte des caractères de contrôle (hors \n \r \t), en C via translate.
+    ctrl = len(data) - len(data.translate(None, _CONTROL_BYTES))
 
     # Seuil empirique : si >10% de contrôles, probable binaire
     return (ctrl / len(data)) > 0.10
+
+
+def _python_source_encoding(data: bytes) -> Optional[str]:
+    """Encodage PEP 263 d'une source Python (None si cookie invalide)."""
+    try:
+        enc, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    except SyntaxError:
+        return None
+    return enc
+
+
+def load_text(path: Path, sniff_bytes: int = 2048, *, encoding: Optional[str] = None) -> LoadedText:
+    """Charge un fichier texte en une seule lecture disque.
+
+    L'echantillon binaire est lu en premier (un binaire n'est jamais charge
+    en entier), puis le reste; ensuite detection de l'encodage et decodage
+    unique (le premier candidat valide sert de texte).
+    Les fins de ligne sont normalisees comme `Path.read_text`.
+    Un `encoding` connu (cache de classification) saute echantillon et detection.
+    Les erreurs d'acces (OSError) remontent a l'appelant.
+    """
+    if encoding is not None:
+        sniff_bytes = 0
+    with path.open("rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        head = handle.read(sniff_bytes) if sniff_bytes > 0 else b""
+        if head and _looks_binary(head):
+            return LoadedText(text="", encoding="", size=size, lines=0, binary=True)
+        data = head + handle.read()
+    size = len(data)
+
+    replaced = False
+    if encoding is None and path.suffix.lower() == ".py":
+        encoding = _python_source_encoding(data)
+    if encoding is not None:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            text = data.decode(encoding, errors="replace")
+            replaced = True
+    else:
+        try:
+            encoding = "utf-8"
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            # utf-8-sig accepte les memes octets que utf-8: on passe a cp1252,
+            # verifie sans decodage avant l'unique decodage definitif.
+            encoding = "latin-1" if data.translate(None, _CP1252_DEFINED) else "cp1252"
+            text = data.decode(encoding)
+
+    if "\r" in text:
+        # Meme normalisation que le mode texte universel de read_text().
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+    return LoadedText(text=text, encoding=encoding, size=size, lines=lines, replaced=replaced)
+
+
+def classify_file(path: Path, sniff_bytes: int = 2048) -> Classification:
+    """Binaire ou texte (et encodage) en une seule ouverture du fichier.
+
+    Memes reponses que `load_text` (un cookie PEP 263 invalide retombe sur la
+    detection generique).
+    Les erreurs d'acces (OSError) remontent a l'appelant.
+    """
+    with path.open("rb") as fh:
+        head = fh.read(sniff_bytes) if sniff_bytes > 0 else b""
+        if head and _looks_binary(head):
+            return Classification(binary=True, encoding="")
+        if path.suffix.lower() == ".py":
+            fh.seek(0)
+            try:
+                encoding, _ = tokenize.detect_encoding(fh.readline)
+            except SyntaxError:
+                # Meme repli que la detection generique d'un cookie invalide.
+                fh.seek(0)
+                encoding = _sniff_stream(fh)
+            return Classification(binary=False, encoding=encoding)
+        return Classification(binary=False, encoding=_sniff_stream(fh, head))
+
+
+def classify_files(
+    paths: Iterable[Path],
+    *,
+    workers: Optional[int] = None,
+    cache: Optional[ClassificationCache] = None,
+    sniff_bytes: int = 2048,
+) -> dict[Path, Optional[Classification]]:
+    """Classe un lot de fichiers en parallele (threads: lectures disque concurrentes).
+
+    Un fichier inaccessible est associe a None. Avec `cache`, les fichiers deja
+    classes (meme taille et mtime_ns) ne sont pas relus et les nouveaux y sont ajoutes.
+    """
+    todo = list(dict.fromkeys(paths))
+
+    def one(path: Path) -> Optional[Classification]:
+        try:
+            st = path.stat() if cache is not None else None
+            if cache is not None and st is not None:
+                known = cache.lookup(path, st)
+                if known is not None:
+                    return known
+            result = classify_file(path, sniff_bytes)
+        except OSError:
+            return None
+        if cache is not None and st is not None:
+            cache.store(path, st, result)
+        return result
+
+    def batch(paths: list[Path]) -> list[Optional[Classification]]:
+        return [one(path) for path in paths]
+
+    max_workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+    if max_workers == 1 or len(todo) < 2:
+        results = dict(zip(todo, batch(todo)))
+    else:
+        # Lots plutot qu'un futur par fichier: le cout de planification domine sinon.
+        size = max(1, len(todo) // (max_workers * 4))
+        batches = [todo[i : i + size] for i in range(0, len(todo), size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            flat = [result for chunk in pool.map(batch, batches) for result in chunk]
+        results = dict(zip(todo, flat))
+    if cache is not None:
+        cache.flush()
+    return results
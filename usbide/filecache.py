@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from usbide.fileio import atomic_write_bytes
+
+# Ecriture groupee: le fichier n'est reecrit qu'apres ce nombre d'entrees nouvelles.
+_FLUSH_EVERY = 32
+# Borne du cache (les entrees les plus anciennes sont oubliees au-dela).
+_MAX_ENTRIES = 20_000
+_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Classification:
+    binary: bool
+    encoding: str
+    lines: Optional[int] = None
+
+
+def classification_cache_path(root_dir: Path) -> Path:
+    """Cache persistant de classification (binaire/encodage) du workspace."""
+    return root_dir / ".usbide" / "classification.json"
+
+
+class ClassificationCache:
+    """Associe (chemin, taille, mtime_ns) a une classification deja calculee.
+
+    Le fichier est lu au premier acces et reecrit par lots (`flush`).
+    Les chemins sont relatifs a la racine: la lettre de la cle USB peut changer.
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, root_dir: Path, *, flush_every: int = _FLUSH_EVERY) -> None:
+        self.root_dir = Path(os.path.abspath(root_dir))
+        self.path = classification_cache_path(root_dir)
+        self._flush_every = flush_every
+        self._entries: Optional[dict[str, list]] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Serialise les ecritures (le fichier temporaire a un nom fixe par process).
+        self._write_lock = threading.Lock()
+
+    def _key(self, path: Path) -> str:
+        # abspath plutot que resolve(): aucun acces disque par recherche.
+        absolute = Path(os.path.abspath(path))
+        try:
+            return absolute.relative_to(self.root_dir).as_posix()
+        except ValueError:
+            return absolute.as_posix()
+
+    def _load(self) -> dict[str, list]:
+        if self._entries is None:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+                entries = raw.get("entries") if raw.get("version") == _VERSION else None
+            except (OSError, ValueError, AttributeError):
+                # Absent ou corrompu: on repart d'un cache vide.
+                entries = None
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def lookup(self, path: Path, st: Optional[os.stat_result] = None) -> Optional[Classification]:
+        """Classification connue si le fichier n'a pas change (taille et mtime_ns)."""
+        try:
+            st = st or path.stat()
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(self._key(path))
+        if not entry or entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+            return None
+        return Classification(binary=bool(entry[2]), encoding=entry[3], lines=entry[4])
+
+    def store(self, path: Path, st: os.stat_result, classification: Classification) -> None:
+        """Memorise une classification (stat pris AVANT la lecture du fichier)."""
+        with self._lock:
+            entries = self._load()
+            key = self._key(path)
+            # Reinsertion en fin: l'ordre du dict sert d'ordre d'anciennete.
+            entries.pop(key, None)
+            entries[key] = [
+                st.st_size,
+                st.st_mtime_ns,
+                classification.binary,
+                classification.encoding,
+                classification.lines,
+            ]
+            while len(entries) > _MAX_ENTRIES:
+                del entries[next(iter(entries))]
+            self._pending += 1
+            due = self._pending >= self._flush_every
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Ecrit les entrees en attente (atomique; erreurs disque ignorees)."""
+        with self._lock:
+            if not self._pending or self._entries is None:
+                return
+            data = json.dumps({"version": _VERSION, "entries": self._entries}, separators=(",", ":"))
+            self._pending = 0
+        with self._write_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(self.path, data.encode("utf-8"))
+            except OSError:
+                # Cache facultatif: une cle en lecture seule ne doit rien casser.
+                pass
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class SaveResult:
+    encoding: str
+    digest: str
+    # False: contenu identique a la derniere version connue, aucune ecriture.
+    written: bool = True
+    # True: l'encodage d'origine ne couvrait pas le texte (repli UTF-8).
+    fallback: bool = False
+
+
+def content_hash(text: str) -> str:
+    """Empreinte du texte de l'editeur (independante de l'encodage disque)."""
+    return hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).hexdigest()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Ecrit via un fichier temporaire voisin, fsync puis os.replace.
+
+    Une coupure (cle arrachee) laisse l'ancienne version intacte.
+    """
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = None
+    try:
+        with open(tmp, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def save_text(path: Path, text: str, encoding: str, *, previous_hash: Optional[str] = None) -> SaveResult:
+    """Sauvegarde atomique; rien n'est ecrit si le texte n'a pas change.
+
+    Meme traduction des fins de ligne que `Path.write_text`; repli UTF-8 si
+    l'encodage d'origine ne couvre pas le texte. OSError remonte a l'appelant.
+    """
+    digest = content_hash(text)
+    if digest == previous_hash:
+        return SaveResult(encoding=encoding, digest=digest, written=False)
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    fallback = False
+    try:
+        data = text.encode(encoding)
+    except UnicodeEncodeError:
+        encoding = "utf-8"
+        data = text.encode(encoding)
+        fallback = True
+    atomic_write_bytes(path, data)
+    return SaveResult(encoding=encoding, digest=digest, fallback=fallback)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import heapq
+import re
+import string
+from dataclasses import dataclass
+from typing import Sequence
+
+# Candidats notes finement (Python); le filtrage passe par des operations C.
+_MAX_SCORED = 400
+# Tests regex par passe (borne le cout des requetes peu selectives).
+_MAX_PROBES = 2500
+_SEPARATORS = "/\\_-. "
+
+# Bonus de notation (inspires de fzf): debut de segment, lettres consecutives, nom de fichier.
+_SCORE_MATCH = 16
+_BONUS_SEGMENT = 24
+_BONUS_CONSECUTIVE = 16
+_BONUS_BASENAME = 12
+_BONUS_FIRST = 8
+
+# Un ensemble de bits par caractere courant; les autres caracteres partagent _OTHER.
+_ALPHABET = string.ascii_lowercase + string.digits + "_.-/ "
+_OTHER = "\0"
+
+
+def _char_bitsets(texts: Sequence[str]) -> dict[str, int]:
+    """Pour chaque caractere, entier dont le bit i vaut 1 si texts[i] le contient."""
+    count = len(texts)
+    rows = {char: bytearray(b"0" * count) for char in _ALPHABET + _OTHER}
+    other = rows[_OTHER]
+    for index, text in enumerate(texts):
+        # Chiffre de poids faible a droite: le bit i correspond a texts[i].
+        offset = count - 1 - index
+        for char in set(text):
+            rows.get(char, other)[offset] = 0x31
+    return {char: int(row, 2) if count else 0 for char, row in rows.items()}
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    path: str
+    score: int
+    # Positions des caracteres retenus (surlignage).
+    positions: tuple[int, ...]
+
+
+class FuzzyMatcher:
+    """Recherche floue (sous-sequence) sur une liste de chemins relatifs.
+
+    Chaque caractere a un ensemble de bits (un bit par chemin): le prefiltre
+    est un ET d'entiers, en C. Les chemins sont tries par longueur et
+    parcourus dans cet ordre, noms de fichier correspondants d'abord, jusqu'a
+    `_MAX_SCORED` correspondances exactes (regex, au plus `_MAX_PROBES`
+    essais par passe); seules celles-ci sont notees en Python. Le cout
+    depend de la requete, plus de la taille du workspace.
+    """
+
+    def __init__(self, paths: Sequence[str]) -> None:
+        # Tri par longueur: l'ordre des indices sert de pre-classement (chemins courts d'abord).
+        self.paths = sorted(paths, key=len)
+        self._lower = [path.lower() for path in self.paths]
+        self._basename_at = [path.rfind("/") + 1 for path in self._lower]
+        self._basenames = [path[start:] for path, start in zip(self._lower, self._basename_at)]
+        self._path_bits = _char_bitsets(self._lower)
+        self._base_bits = _char_bitsets(self._basenames)
+        self._all = (1 << len(self.paths)) - 1
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def search(self, query: str, limit: int = 50) -> list[FuzzyMatch]:
+        """Meilleurs chemins pour la requete (les espaces sont ignores)."""
+        needle = "".join(query.lower().split())
+        if not needle:
+            return [FuzzyMatch(path=path, score=0, positions=()) for path in self.paths[:limit]]
+
+        pattern = re.compile(".*?".join(re.escape(char) for char in needle), re.DOTALL)
+        path_bits = self._require(self._path_bits, needle)
+        selection: list[int] = []
+        # Noms de fichier d'abord, puis chemins complets.
+        self._collect(self._require(self._base_bits, needle) & path_bits, pattern, self._basenames, selection)
+        if len(selection) < _MAX_SCORED:
+            self._collect(path_bits, pattern, self._lower, selection, skip=set(selection))
+
+        scored = []
+        for index in selection:
+            score, positions = self._score(needle, index)
+            scored.append((score, -index, positions))
+        best = heapq.nlargest(limit, scored)
+        return [FuzzyMatch(path=self.paths[-neg], score=score, positions=positions) for score, neg, positions in best]
+
+    def _require(self, bitsets: dict[str, int], needle: str) -> int:
+        bits = self._all
+        for char in set(needle):
+            bits &= bitsets.get(char, bitsets[_OTHER])
+        return bits
+
+    def _collect(
+        self,
+        bits: int,
+        pattern: re.Pattern[str],
+        texts: list[str],
+        selection: list[int],
+        skip: frozenset[int] | set[int] = frozenset(),
+    ) -> None:
+        """Ajoute les indices (croissants) dont le texte contient la sous-sequence."""
+        # Bits en chaine inversee: str.find saute les zeros en C.
+        flags = format(bits, "b")[::-1]
+        index = flags.find("1")
+        probes = 0
+        while index != -1 and len(selection) < _MAX_SCORED and probes < _MAX_PROBES:
+            if index not in skip:
+                probes += 1
+                if pattern.search(texts[index]):
+                    selection.append(index)
+            index = flags.find("1", index + 1)
+
+    def _score(self, needle: str, index: int) -> tuple[int, tuple[int, ...]]:
+        """Aligne la requete (lettres consecutives, debuts de segment, nom de fichier) et la note."""
+        text = self._lower[index]
+        basename_at = self._basename_at[index]
+        # Positions au plus tard: bornes garantissant qu'il reste de quoi placer la suite.
+        latest: list[int] = []
+        pos = len(text)
+        for char in reversed(needle):
+            pos = text.rfind(char, 0, pos)
+            latest.append(pos)
+        latest.reverse()
+
+        positions: list[int] = []
+        previous = -1
+        for char, limit in zip(needle, latest):
+            if previous >= 0 and previous + 1 <= limit and text[previous + 1] == char:
+                pos = previous + 1
+            else:
+                # Premier debut de segment atteignable, sinon la position au plus tard.
+                pos = limit
+                found = text.find(char, previous + 1, limit)
+                while found != -1:
+                    if found == 0 or text[found - 1] in _SEPARATORS:
+                        pos = found
+                        break
+                    found = text.find(char, found + 1, limit)
+            positions.append(pos)
+            previous = pos
+
+        score = 0
+        previous = -2
+        for pos in positions:
+            score += _SCORE_MATCH
+            if pos == 0 or text[pos - 1] in _SEPARATORS:
+                score += _BONUS_SEGMENT
+            if pos == previous + 1:
+                score += _BONUS_CONSECUTIVE
+            if pos >= basename_at:
+                score += _BONUS_BASENAME
+            previous = pos
+        if positions[0] == basename_at:
+            score += _BONUS_FIRST
+        return score, tuple(positions)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Dossiers lourds ou generes: affiches replies dans l'arbre, jamais indexes.
+HEAVY_DIRS = frozenset(
+    {
+        ".git",
+        ".usbide",
+        ".venv",
+        "venv",
+        "__pycache__",
+        "build",
+        "cache",
+        "codex_home",
+        "dist",
+        "node_modules",
+        "tmp",
+        # Python portable (tools/python-x64): sa stdlib n'est pas une source du workspace.
+        "tools",
+        "vendor",
+    }
+)
+
+
+def user_ignore_path(root_dir: Path) -> Path:
+    """Regles propres a l'IDE (meme syntaxe que .gitignore)."""
+    return root_dir / ".usbide" / "ignore"
+
+
+@dataclass(frozen=True)
+class _Rule:
+    regex: re.Pattern[str]
+    negated: bool
+    dir_only: bool
+    # Contient un "/": relatif au dossier du fichier de regles, sinon compare au seul nom.
+    anchored: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def parse_rules(text: str) -> list[_Rule]:
+    """Regles au format .gitignore (commentaires, negation, "/" final et initial, **)."""
+    rules: list[_Rule] = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        try:
+            regex = re.compile(_glob_to_regex(line), re.DOTALL)
+        except re.error:
+            continue
+        rules.append(_Rule(regex=regex, negated=negated, dir_only=dir_only, anchored=anchored))
+    return rules
+
+
+class IgnoreRules:
+    """Regles .gitignore (racine et sous-dossiers) et .usbide/ignore du workspace.
+
+    Les fichiers de regles sont lus a la premiere question sur leur dossier
+    puis gardes en cache. Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, root_dir: Path) -> None:
+        self.root_dir = Path(os.path.abspath(root_dir))
+        self._rules: dict[str, list[_Rule]] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self) -> str:
+        """Empreinte des regles racine (un index persistant est invalide si elles changent)."""
+        digest = hashlib.blake2b(digest_size=8)
+        for path in (self.root_dir / ".gitignore", user_ignore_path(self.root_dir)):
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                pass
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _rules_for(self, rel_dir: str) -> list[_Rule]:
+        with self._lock:
+            cached = self._rules.get(rel_dir)
+        if cached is not None:
+            return cached
+        base = self.root_dir / rel_dir if rel_dir else self.root_dir
+        files = [base / ".gitignore"]
+        if not rel_dir:
+            # .usbide/ignore apres .gitignore: ses regles (et negations) l'emportent.
+            files.append(user_ignore_path(self.root_dir))
+        rules: list[_Rule] = []
+        for file in files:
+            try:
+                rules.extend(parse_rules(file.read_text(encoding="utf-8", errors="replace")))
+            except OSError:
+                continue
+        with self._lock:
+            self._rules[rel_dir] = rules
+        return rules
+
+    def invalidate(self, rel_dir: Optional[str] = None) -> None:
+        """Oublie les regles en cache (d'un dossier, ou toutes)."""
+        with self._lock:
+            if rel_dir is None:
+                self._rules.clear()
+            else:
+                self._rules.pop(rel_dir, None)
+
+    def relative(self, path: Path) -> Optional[str]:
+        """Chemin relatif a la racine ("/"), None hors du workspace."""
+        try:
+            rel = Path(os.path.abspath(path)).relative_to(self.root_dir).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def is_ignored(self, path: Path, is_dir: bool) -> bool:
+        """Vrai si une regle exclut le chemin (la derniere regle qui correspond l'emporte)."""
+        rel = self.relative(path)
+        return bool(rel) and self.is_ignored_relative(rel, is_dir)
+
+    def is_ignored_relative(self, rel: str, is_dir: bool) -> bool:
+        """Comme `is_ignored`, pour un chemin deja relatif a la racine ("/")."""
+        parts = rel.split("/")
+        ignored = False
+        for depth in range(len(parts)):
+            rel_dir = "/".join(parts[:depth])
+            rules = self._rules_for(rel_dir)
+            if not rules:
+                continue
+            local = "/".join(parts[depth:])
+            for rule in rules:
+                if rule.dir_only and not is_dir:
+                    continue
+                subject = local if rule.anchored else parts[-1]
+                if rule.regex.fullmatch(subject):
+                    ignored = not rule.negated
+        return ignored
+
+    @staticmethod
+    def is_heavy(name: str) -> bool:
+        return name in HEAVY_DIRS
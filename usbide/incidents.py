@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from usbide.incidentstore import IncidentRow, IncidentStore
+
+DEFAULT_BUG_MAX_KB = 512
+# Fichiers tournes gardes a cote de bug.md (bug.1.md le plus recent).
+_KEEP_ROTATED = 3
+# Regroupement des ecritures: une rafale d'incidents tient en un seul ajout.
+_FLUSH_SECONDS = 1.0
+
+
+def bug_max_bytes() -> int:
+    """Taille de bug.md avant rotation (USBIDE_BUG_MAX_KB, 512 Ko par defaut)."""
+    raw = os.environ.get("USBIDE_BUG_MAX_KB", "").strip()
+    try:
+        kb = float(raw) if raw else DEFAULT_BUG_MAX_KB
+    except ValueError:
+        kb = DEFAULT_BUG_MAX_KB
+    return max(1024, int(kb * 1024))
+
+
+def fingerprint(contexte: str, message: str, exc_type: str = "") -> str:
+    """Empreinte d'un incident: meme contexte, meme message, meme type d'exception."""
+    raw = "\0".join((contexte, message, exc_type)).encode("utf-8", errors="replace")
+    return hashlib.blake2b(raw, digest_size=6).hexdigest()
+
+
+@dataclass
+class _Seen:
+    niveau: str
+    contexte: str
+    message: str
+    exc_type: str
+    first: datetime
+    last: datetime
+    count: int = 1
+    # Repetitions pas encore ecrites dans bug.md.
+    pending: int = 0
+
+
+class IncidentWriter:
+    """Ajouts a bug.md par un thread de fond, regroupes et dedoublonnes.
+
+    La premiere occurrence d'une empreinte (contexte, message, type
+    d'exception) est ecrite en entier, trace comprise; les suivantes sont
+    seulement comptees et resumees (nombre, premiere/derniere date) a
+    l'ecriture suivante. Au-dela de `max_bytes`, bug.md devient bug.1.md.
+    Avec `store`, chaque occurrence est aussi ajoutee a la base des incidents.
+    """
+
+    def __init__(
+        self, path: Path, *, max_bytes: Optional[int] = None, store: Optional[IncidentStore] = None
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes or bug_max_bytes()
+        self._store = store
+        self._seen: dict[str, _Seen] = {}
+        # Blocs Markdown complets en attente, et empreintes ayant des repetitions a resumer.
+        self._blocks: list[str] = []
+        self._repeats: list[str] = []
+        # Occurrences (repetitions comprises) en attente pour la base.
+        self._rows: list[IncidentRow] = []
+        self._cond = threading.Condition()
+        # Incidents recus / ecrits (flush attend que les deux se rejoignent).
+        self._received = 0
+        self._written = 0
+        self._urgent = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        niveau: str,
+        message: str,
+        *,
+        contexte: str,
+        details: Optional[str] = None,
+        exc: Optional[BaseException] = None,
+    ) -> str:
+        """Consigne un incident sans bloquer; retourne son empreinte."""
+        now = datetime.now()
+        exc_type = type(exc).__name__ if exc is not None else ""
+        key = fingerprint(contexte, message, exc_type)
+        exception = f"{exc_type}: {exc}" if exc is not None else None
+        with self._cond:
+            if self._closed:
+                return key
+            if self._store is not None:
+                self._rows.append(
+                    IncidentRow(now.timestamp(), niveau, contexte, message, exc_type, exception, key, details)
+                )
+            seen = self._seen.get(key)
+            if seen is not None:
+                seen.count += 1
+                seen.pending += 1
+                seen.last = now
+                if seen.pending == 1:
+                    self._repeats.append(key)
+                self._received += 1
+                self._cond.notify_all()
+                repeated = True
+            else:
+                self._seen[key] = _Seen(niveau, contexte, message, exc_type, now, now)
+                repeated = False
+        if not repeated:
+            # Trace formatee une seule fois par empreinte, hors du verrou.
+            block = self._format(now, niveau, contexte, message, key, details, exc)
+            with self._cond:
+                self._blocks.append(block)
+                self._received += 1
+                self._cond.notify_all()
+        self._ensure_thread()
+        return key
+
+    @staticmethod
+    def _format(
+        when: datetime,
+        niveau: str,
+        contexte: str,
+        message: str,
+        key: str,
+        details: Optional[str],
+        exc: Optional[BaseException],
+    ) -> str:
+        # Le format Markdown facilite la lecture des rapports sur la cle USB.
+        lignes = [
+            f"## {when.isoformat(timespec='seconds')}",
+            f"- niveau: {niveau}",
+            f"- contexte: {contexte}",
+            f"- message: {message}",
+            f"- empreinte: {key}",
+        ]
+        if details:
+            lignes.append(f"- details: {details}")
+        if exc is not None:
+            lignes.append(f"- exception: {type(exc).__name__}: {exc}")
+            trace = "".join(traceback.format_exception(exc)).rstrip()
+            if trace:
+                lignes.append("```")
+                lignes.extend(trace.splitlines())
+                lignes.append("```")
+        lignes.append("")
+        return "\n".join(lignes)
+
+    def _summary(self, key: str, seen: _Seen, pending: int) -> str:
+        lignes = [
+            f"## {seen.last.isoformat(timespec='seconds')}",
+            f"- niveau: {seen.niveau}",
+            f"- contexte: {seen.contexte}",
+            f"- message: {seen.message}",
+            f"- empreinte: {key}",
+        ]
+        if seen.exc_type:
+            lignes.append(f"- exception: {seen.exc_type}")
+        lignes.append(
+            f"- repetitions: {pending} (total {seen.count}, premiere {seen.first.isoformat(timespec='seconds')},"
+            f" derniere {seen.last.isoformat(timespec='seconds')})"
+        )
+        lignes.append("")
+        return "\n".join(lignes)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Attend que les incidents deja recus soient ecrits; False si le delai expire."""
+        with self._cond:
+            target = self._received
+            self._urgent = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target or self._thread is None, timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+    # ---------- thread d'ecriture ----------
+    def _ensure_thread(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="usbide-incidents", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while not (self._blocks or self._repeats or self._closed):
+                        self._cond.wait()
+                    if not (self._closed or self._urgent):
+                        self._cond.wait(_FLUSH_SECONDS)
+                    self._urgent = False
+                    blocks, self._blocks = self._blocks, []
+                    repeats, self._repeats = self._repeats, []
+                    rows, self._rows = self._rows, []
+                    received = self._received
+                    for key in repeats:
+                        seen = self._seen[key]
+                        blocks.append(self._summary(key, seen, seen.pending))
+                        seen.pending = 0
+                    closing = self._closed
+                if blocks:
+                    self._append("".join(blocks))
+                if rows:
+                    self._store_rows(rows)
+                with self._cond:
+                    self._written = received
+                    self._cond.notify_all()
+                    if closing and not (self._blocks or self._repeats):
+                        break
+        finally:
+            if self._store is not None:
+                # Connexion propre a ce thread: fermee avec lui.
+                self._store.close()
+            with self._cond:
+                self._thread = None
+                self._cond.notify_all()
+
+    def _store_rows(self, rows: list[IncidentRow]) -> None:
+        assert self._store is not None
+        try:
+            self._store.add(rows)
+        except (sqlite3.Error, OSError):
+            # Base facultative (cle en lecture seule, fichier verrouille): bug.md reste la reference.
+            return
+
+    def _append(self, data: str) -> None:
+        try:
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(data)
+        except OSError:
+            # Ne pas bloquer l'UI si le fichier bug.md est indisponible.
+            return
+
+    def _rotate(self) -> None:
+        def rotated(index: int) -> Path:
+            return self.path.with_name(f"{self.path.stem}.{index}{self.path.suffix}")
+
+        rotated(_KEEP_ROTATED).unlink(missing_ok=True)
+        for index in range(_KEEP_ROTATED - 1, 0, -1):
+            if rotated(index).exists():
+                os.replace(rotated(index), rotated(index + 1))
+        os.replace(self.path, rotated(1))
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    niveau TEXT NOT NULL,
+    contexte TEXT NOT NULL,
+    message TEXT NOT NULL,
+    exc_type TEXT NOT NULL DEFAULT '',
+    exception TEXT,
+    empreinte TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS incidents_ts ON incidents (ts);
+CREATE INDEX IF NOT EXISTS incidents_niveau_ts ON incidents (niveau, ts);
+CREATE INDEX IF NOT EXISTS incidents_contexte_ts ON incidents (contexte, ts);
+"""
+
+# Regroupements proposes par `python -m usbide incidents --by ...`.
+GROUPS = {
+    "contexte": "contexte",
+    "niveau": "niveau",
+    "jour": "date(ts, 'unixepoch', 'localtime')",
+    "empreinte": "empreinte",
+}
+
+
+class IncidentRow(NamedTuple):
+    # Instant (secondes epoch) de l'occurrence.
+    ts: float
+    niveau: str
+    contexte: str
+    message: str
+    exc_type: str
+    exception: Optional[str]
+    empreinte: str
+    details: Optional[str]
+
+
+class GroupCount(NamedTuple):
+    key: str
+    count: int
+    first: float
+    last: float
+    # Message de l'occurrence la plus recente du groupe.
+    message: str
+
+
+def incidents_db_path(root_dir: Path) -> Path:
+    """Base des incidents (une ligne par occurrence, a cote de bug.md)."""
+    return root_dir / ".usbide" / "incidents.sqlite3"
+
+
+class IncidentStore:
+    """Incidents en base SQLite, indexes par date, niveau et contexte.
+
+    Ajout seulement (une ligne par occurrence, repetitions comprises): les
+    agregats restent rapides meme apres des mois d'utilisation. La connexion
+    est ouverte par le thread qui l'utilise en premier (thread d'ecriture de
+    bug.md dans l'IDE, thread principal pour la ligne de commande).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def add(self, rows: list[IncidentRow]) -> None:
+        """Ajoute des occurrences en une transaction (sqlite3.Error / OSError en cas d'echec)."""
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO incidents (ts, niveau, contexte, message, exc_type, exception, empreinte, details)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---------- requetes ----------
+    @staticmethod
+    def _where(since: Optional[float], niveau: Optional[str], contexte: Optional[str]) -> tuple[str, list]:
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if niveau:
+            clauses.append("niveau = ?")
+            params.append(niveau)
+        if contexte:
+            clauses.append("contexte = ?")
+            params.append(contexte)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def summary(
+        self,
+        by: str = "contexte",
+        *,
+        since: Optional[float] = None,
+        niveau: Optional[str] = None,
+        contexte: Optional[str] = None,
+        limit: int = 10,
+    ) -> list[GroupCount]:
+        """Occurrences regroupees (`GROUPS`), les plus nombreuses d'abord."""
+        if not self.path.exists():
+            return []
+        where, params = self._where(since, niveau, contexte)
+        # SQLite: avec MAX(), la colonne `message` vient de la ligne la plus recente.
+        sql = (
+            f"SELECT {GROUPS[by]} AS cle, COUNT(*) AS nombre, MIN(ts), MAX(ts), message"
+            f" FROM incidents{where} GROUP BY cle ORDER BY nombre DESC, MAX(ts) DESC LIMIT ?"
+        )
+        rows = self._connect().execute(sql, [*params, limit]).fetchall()
+        return [GroupCount(*row) for row in rows]
+
+    def recent(
+        self,
+        *,
+        since: Optional[float] = None,
+        niveau: Optional[str] = None,
+        contexte: Optional[str] = None,
+        limit: int = 20,
+    ) -> list[IncidentRow]:
+        """Dernieres occurrences, la plus recente d'abord."""
+        if not self.path.exists():
+            return []
+        where, params = self._where(since, niveau, contexte)
+        sql = (
+            "SELECT ts, niveau, contexte, message, exc_type, exception, empreinte, details"
+            f" FROM incidents{where} ORDER BY ts DESC LIMIT ?"
+        )
+        return [IncidentRow(*row) for row in self._connect().execute(sql, [*params, limit])]
+
+
+def _when(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def _clip(text: str, width: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def report(
+    store: IncidentStore,
+    *,
+    by: str = "contexte",
+    days: Optional[float] = 7,
+    niveau: Optional[str] = None,
+    contexte: Optional[str] = None,
+    limit: int = 10,
+    recent: bool = False,
+    now: Optional[float] = None,
+) -> str:
+    """Texte affiche par `python -m usbide incidents`."""
+    since = (now if now is not None else time.time()) - days * 86400 if days else None
+    periode = f"des {days:g} derniers jours" if days else "depuis le debut"
+    filtres = "".join(f", {name}={value}" for name, value in (("niveau", niveau), ("contexte", contexte)) if value)
+    if recent:
+        rows = store.recent(since=since, niveau=niveau, contexte=contexte, limit=limit)
+        if not rows:
+            return f"Aucun incident {periode}{filtres}."
+        lines = [f"Derniers incidents {periode}{filtres}:"]
+        for row in rows:
+            lines.append(f"  {_when(row.ts)}  {row.niveau:<13} {row.contexte:<20} {_clip(row.message, 70)}")
+        return "\n".join(lines)
+    groups = store.summary(by, since=since, niveau=niveau, contexte=contexte, limit=limit)
+    if not groups:
+        return f"Aucun incident {periode}{filtres}."
+    lines = [
+        f"Incidents {periode} par {by}{filtres}:",
+        f"  {'nombre':>6}  {'dernier':<16}  {by:<20} dernier message",
+    ]
+    for group in groups:
+        lines.append(f"  {group.count:>6}  {_when(group.last)}  {group.key:<20} {_clip(group.message, 60)}")
+    return "\n".join(lines)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from usbide.fileio import atomic_write_bytes
+from usbide.ignore import HEAVY_DIRS, IgnoreRules
+
+_VERSION = 2
+# Resolution du mtime en FAT32 (2 s): un dossier modifie aussi recemment sera relu la fois suivante.
+_RACY_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    # Chemin relatif a la racine, separateurs "/".
+    path: str
+    size: int
+    mtime_ns: int
+    # "f" fichier, "l" lien symbolique (non suivi).
+    kind: str = "f"
+
+
+@dataclass(frozen=True)
+class IndexStats:
+    files: int
+    # Dossiers relus (scandir) / repris tels quels (mtime inchange).
+    scanned_dirs: int
+    reused_dirs: int
+    elapsed_ms: float
+
+
+# Un dossier indexe: [mtime_ns, [[nom, taille, mtime_ns, type], ...], [sous-dossiers]].
+_DirRecord = list
+
+
+def index_path(root_dir: Path) -> Path:
+    """Index persistant des fichiers du workspace."""
+    return root_dir / ".usbide" / "index" / "files.json"
+
+
+class WorkspaceIndex:
+    """Liste des fichiers du workspace, persistee sur la cle et rafraichie par mtime de dossier.
+
+    Un dossier dont le mtime n'a pas change n'est pas relu: seul un stat par
+    dossier est necessaire au lancement suivant. Les ecritures en place d'un
+    fichier (sans renommage) ne changent pas le mtime du dossier: taille et
+    mtime d'un fichier sont indicatifs. Les dossiers lourds (HEAVY_DIRS) et
+    les chemins exclus par .gitignore/.usbide/ignore ne sont pas indexes.
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, root_dir: Path, *, rules: Optional[IgnoreRules] = None) -> None:
+        self.root_dir = Path(os.path.abspath(root_dir))
+        self.path = index_path(self.root_dir)
+        self.rules = rules if rules is not None else IgnoreRules(self.root_dir)
+        self._dirs: dict[str, _DirRecord] = {}
+        self._lock = threading.Lock()
+        # Serialise refresh() et update_dirs() (threads differents).
+        self._refresh_lock = threading.Lock()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(record[1]) for record in self._dirs.values())
+
+    def load(self) -> bool:
+        """Lit l'index persistant; False s'il est absent, corrompu ou d'une autre version.
+
+        Un index construit avec d'autres regles d'exclusion est ignore (parcours complet).
+        """
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            valid = raw.get("version") == _VERSION and raw.get("rules") == self.rules.fingerprint()
+            dirs = raw.get("dirs") if valid else None
+        except (OSError, ValueError, AttributeError):
+            dirs = None
+        if not isinstance(dirs, dict):
+            return False
+        with self._lock:
+            self._dirs = dirs
+            self._dirty = False
+        return True
+
+    def save(self) -> None:
+        """Ecrit l'index s'il a change (atomique; erreurs disque ignorees)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"version": _VERSION, "rules": self.rules.fingerprint(), "dirs": self._dirs}
+            data = json.dumps(payload, separators=(",", ":"))
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.path, data.encode("utf-8"))
+        except OSError:
+            # Index facultatif: une cle en lecture seule ne doit rien casser.
+            pass
+
+    def refresh(self, cancel: Optional[threading.Event] = None) -> IndexStats:
+        """Parcourt l'arborescence; seuls les dossiers dont le mtime a change sont relus."""
+        with self._refresh_lock:
+            return self._refresh(cancel)
+
+    def _refresh(self, cancel: Optional[threading.Event]) -> IndexStats:
+        started = time.perf_counter()
+        racy_after = time.time_ns() - _RACY_NS
+        with self._lock:
+            previous = self._dirs
+        dirs: dict[str, _DirRecord] = {}
+        scanned = reused = 0
+        pending = [""]
+        while pending:
+            if cancel is not None and cancel.is_set():
+                # Index partiel: l'ancien reste en place.
+                return IndexStats(files=len(self), scanned_dirs=scanned, reused_dirs=reused, elapsed_ms=0.0)
+            rel = pending.pop()
+            absolute = os.path.join(self.root_dir, rel) if rel else str(self.root_dir)
+            try:
+                mtime_ns = os.stat(absolute).st_mtime_ns
+            except OSError:
+                continue
+            record = previous.get(rel)
+            if record is not None and record[0] == mtime_ns:
+                reused += 1
+            else:
+                # Mtime trop recent: une modification dans le meme intervalle passerait inapercue.
+                record = self._scan(absolute, rel, mtime_ns if mtime_ns < racy_after else -1)
+                if record is None:
+                    continue
+                scanned += 1
+            dirs[rel] = record
+            pending.extend(f"{rel}/{name}" if rel else name for name in record[2])
+        with self._lock:
+            # Un dossier relu a au moins change de mtime; sinon seuls des dossiers ont pu disparaitre.
+            if scanned or dirs.keys() != previous.keys():
+                self._dirs = dirs
+                self._dirty = True
+        files = sum(len(record[1]) for record in dirs.values())
+        elapsed = (time.perf_counter() - started) * 1000
+        return IndexStats(files=files, scanned_dirs=scanned, reused_dirs=reused, elapsed_ms=elapsed)
+
+    def update_dirs(self, rels: Iterable[str]) -> bool:
+        """Relit seulement les dossiers donnes (evenements du watcher); vrai si des fichiers ont change.
+
+        Les nouveaux sous-dossiers sont indexes, les disparus retires avec leur contenu.
+        Un dossier absent de l'index (exclu, ou index pas encore construit) est ignore.
+        """
+        with self._refresh_lock:
+            racy_after = time.time_ns() - _RACY_NS
+            with self._lock:
+                dirs = dict(self._dirs)
+            changed = False
+            pending = list(rels)
+            while pending:
+                rel = pending.pop()
+                old = dirs.get(rel)
+                if old is None:
+                    continue
+                absolute = os.path.join(self.root_dir, rel) if rel else str(self.root_dir)
+                try:
+                    mtime_ns = os.stat(absolute).st_mtime_ns
+                    record = self._scan(absolute, rel, mtime_ns if mtime_ns < racy_after else -1)
+                except OSError:
+                    record = None
+                if record is None:
+                    changed |= self._drop_subtree(dirs, rel)
+                    continue
+                if [entry[0] for entry in old[1]] != [entry[0] for entry in record[1]]:
+                    changed = True
+                dirs[rel] = record
+                prefix = f"{rel}/" if rel else ""
+                for name in set(old[2]) - set(record[2]):
+                    changed |= self._drop_subtree(dirs, prefix + name)
+                for name in set(record[2]) - set(old[2]):
+                    # Mtime inconnu: le dossier sera relu a la passe suivante de la boucle.
+                    dirs[prefix + name] = [-1, [], []]
+                    pending.append(prefix + name)
+            with self._lock:
+                self._dirs = dirs
+                self._dirty = True
+            return changed
+
+    @staticmethod
+    def _drop_subtree(dirs: dict[str, _DirRecord], rel: str) -> bool:
+        doomed = [key for key in dirs if key == rel or key.startswith(rel + "/")]
+        had_files = any(dirs[key][1] for key in doomed)
+        for key in doomed:
+            del dirs[key]
+        return had_files
+
+    def _scan(self, absolute: str, rel: str, mtime_ns: int) -> Optional[_DirRecord]:
+        files: list[list] = []
+        subdirs: list[str] = []
+        prefix = f"{rel}/" if rel else ""
+        try:
+            with os.scandir(absolute) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in HEAVY_DIRS and not self.rules.is_ignored_relative(
+                                prefix + entry.name, True
+                            ):
+                                subdirs.append(entry.name)
+                            continue
+                        if self.rules.is_ignored_relative(prefix + entry.name, False):
+                            continue
+                        # Sous Windows, stat() d'une entree scandir ne coute aucun appel systeme.
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    kind = "l" if entry.is_symlink() else "f"
+                    files.append([entry.name, st.st_size, st.st_mtime_ns, kind])
+        except OSError:
+            return None
+        files.sort()
+        subdirs.sort()
+        return [mtime_ns, files, subdirs]
+
+    def files(self) -> Iterator[IndexedFile]:
+        """Fichiers indexes (ordre des dossiers, puis alphabetique)."""
+        with self._lock:
+            dirs = self._dirs
+        for rel in sorted(dirs):
+            prefix = f"{rel}/" if rel else ""
+            for name, size, mtime_ns, kind in dirs[rel][1]:
+                yield IndexedFile(path=prefix + name, size=size, mtime_ns=mtime_ns, kind=kind)
+
+    def paths(self) -> list[str]:
+        """Chemins relatifs de tous les fichiers indexes."""
+        return [entry.path for entry in self.files()]
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from usbide.encoding import EncodingSniffer
+from usbide.screens import PromptScreen
+
+# Au-dela de ce seuil, l'editeur bascule en lecture seule paginee.
+DEFAULT_LARGE_FILE_MB = 16
+# Largeur virtuelle pour le defilement horizontal (les lignes ne sont pas mesurees).
+_MAX_COLUMNS = 1024
+# Taille des blocs parcourus par l'indexation et la recherche (annulables entre deux blocs).
+_SCAN_BYTES = 4 * 1024 * 1024
+# Un caractere occupe au plus 4 octets (UTF-8): borne du decodage d'une ligne.
+_MAX_CHAR_BYTES = 4
+
+
+def large_file_threshold() -> int:
+    """Seuil en octets (USBIDE_LARGE_FILE_MB, 16 Mo par defaut)."""
+    raw = os.environ.get("USBIDE_LARGE_FILE_MB", "").strip()
+    try:
+        mb = float(raw) if raw else DEFAULT_LARGE_FILE_MB
+    except ValueError:
+        mb = DEFAULT_LARGE_FILE_MB
+    return int(mb * 1024 * 1024)
+
+
+class LineIndex:
+    """Index des debuts de ligne d'un fichier mappe en memoire (lecture seule).
+
+    `build()` tourne dans un thread de fond; les lignes deja indexees sont
+    lisibles pendant la construction.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle = path.open("rb")
+        self.size = os.fstat(self._handle.fileno()).st_size
+        # mmap refuse les fichiers vides: on garde alors un buffer vide.
+        self._map: mmap.mmap | bytes = (
+            mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        )
+        # Offsets compacts (8 octets par ligne) des debuts de ligne.
+        self._offsets = array("Q", [0])
+        self._lock = threading.Lock()
+        self._sniffer = EncodingSniffer()
+        self.encoding = "utf-8"
+        self.complete = False
+
+    @property
+    def line_count(self) -> int:
+        with self._lock:
+            count = len(self._offsets)
+        if self.complete and count > 1 and self.size and self._ends_with_newline():
+            # Pas de ligne vide fantome apres le dernier saut de ligne.
+            return count - 1
+        return count
+
+    def _ends_with_newline(self) -> bool:
+        return self._map[self.size - 1 : self.size] == b"\n"
+
+    def build(
+        self,
+        *,
+        cancel: Optional[threading.Event] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        chunk_bytes: int = _SCAN_BYTES,
+    ) -> None:
+        """Indexe les sauts de ligne par blocs et affine l'encodage au passage."""
+        pos = 0
+        data = self._map
+        try:
+            while pos < self.size:
+                if cancel is not None and cancel.is_set():
+                    return
+                end = min(pos + chunk_bytes, self.size)
+                if not self._sniffer.done:
+                    self._sniffer.feed(data[pos:end])
+                found: list[int] = []
+                nl = data.find(b"\n", pos, end)
+                while nl != -1:
+                    found.append(nl + 1)
+                    nl = data.find(b"\n", nl + 1, end)
+                with self._lock:
+                    self._offsets.extend(found)
+                pos = end
+                if progress is not None:
+                    progress(pos)
+        except ValueError:
+            # mmap ferme pendant l'indexation (autre fichier ouvert).
+            return
+        self.encoding = self._sniffer.result()
+        self.complete = True
+
+    def offset_of(self, line: int) -> int:
+        with self._lock:
+            if line >= len(self._offsets):
+                return self.size
+            return self._offsets[max(0, line)]
+
+    def line(self, line: int, max_chars: Optional[int] = None) -> str:
+        """Texte d'une ligne (sans fin de ligne), decode avec remplacement.
+
+        `max_chars` borne le decodage aux colonnes visibles (lignes geantes).
+        """
+        with self._lock:
+            if line < 0 or line >= len(self._offsets):
+                return ""
+            start = self._offsets[line]
+            end = self._offsets[line + 1] if line + 1 < len(self._offsets) else None
+        if end is None:
+            # Derniere ligne connue: on borne a la prochaine fin de ligne.
+            nl = self._map.find(b"\n", start)
+            end = self.size if nl == -1 else nl + 1
+        if max_chars is not None and end - start > max_chars * _MAX_CHAR_BYTES:
+            # Ligne tronquee: au moins max_chars caracteres complets sont decodes.
+            raw = self._map[start : start + max_chars * _MAX_CHAR_BYTES]
+            return raw.decode(self.encoding, errors="replace")[:max_chars]
+        raw = self._map[start:end]
+        return raw.decode(self.encoding, errors="replace").rstrip("\r\n")
+
+    def line_of_offset(self, offset: int) -> int:
+        with self._lock:
+            return max(0, bisect_right(self._offsets, offset) - 1)
+
+    def search(
+        self,
+        needle: str,
+        start_line: int,
+        *,
+        backward: bool = False,
+        cancel: Optional[threading.Event] = None,
+        chunk_bytes: int = _SCAN_BYTES,
+    ) -> Optional[int]:
+        """Recherche litterale (sensible a la casse) depuis une ligne; retourne la ligne trouvee.
+
+        Le fichier est parcouru par blocs (chevauchants) pour rester annulable.
+        """
+        if not needle:
+            return None
+        pattern = needle.encode(self.encoding, errors="replace")
+        overlap = len(pattern) - 1
+        step = max(chunk_bytes, len(pattern))
+        try:
+            if backward:
+                end = self.offset_of(start_line)
+                while end >= len(pattern):
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    begin = max(0, end - step)
+                    pos = self._map.rfind(pattern, begin, end)
+                    if pos != -1:
+                        return self.line_of_offset(pos)
+                    end = begin + overlap
+                    if begin == 0:
+                        break
+            else:
+                begin = self.offset_of(start_line + 1)
+                while begin < self.size:
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    end = min(self.size, begin + step)
+                    pos = self._map.find(pattern, begin, end)
+                    if pos != -1:
+                        return self.line_of_offset(pos)
+                    if end == self.size:
+                        break
+                    begin = end - overlap
+        except ValueError:
+            # mmap ferme pendant la recherche (autre fichier ouvert).
+            return None
+        return None
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._handle.close()
+
+
+class LargeFileView(ScrollView, can_focus=True):
+    """Visionneuse paginee: seules les lignes visibles sont decodees et rendues."""
+
+    BINDINGS = [
+        Binding("ctrl+g", "goto_line", "Aller a la ligne"),
+        Binding("ctrl+f", "find", "Rechercher"),
+        Binding("f3", "find_next", "Suivant"),
+        Binding("shift+f3", "find_previous", "Precedent"),
+    ]
+
+    def __init__(self, *, id: Optional[str] = None) -> None:
+        super().__init__(id=id)
+        self.index: Optional[LineIndex] = None
+        self._match_line: Optional[int] = None
+        self._needle = ""
+        self._search_cancel: Optional[threading.Event] = None
+
+    def open(self, index: LineIndex) -> None:
+        """Affiche un nouvel index (l'ancien est ferme)."""
+        self.close_index()
+        self.index = index
+        self._match_line = None
+        self.scroll_to(0, 0, animate=False)
+        self.refresh_lines()
+
+    def close_index(self) -> None:
+        self._cancel_search()
+        if self.index is not None:
+            self.index.close()
+        self.index = None
+
+    def refresh_lines(self) -> None:
+        """Met a jour la hauteur virtuelle (appele pendant l'indexation)."""
+        count = self.index.line_count if self.index is not None else 0
+        self.virtual_size = Size(_MAX_COLUMNS, count)
+        self.refresh()
+
+    def _gutter_width(self) -> int:
+        count = self.index.line_count if self.index is not None else 0
+        return len(str(max(1, count))) + 1
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line_no = scroll_y + y
+        width = self.scrollable_content_region.width
+        if self.index is None or line_no >= self.index.line_count:
+            return Strip.blank(width, self.rich_style)
+        gutter = self._gutter_width()
+        # Seules les colonnes visibles sont decodees (les tabulations n'allongent que le texte).
+        text = self.index.line(line_no, max_chars=scroll_x + width).expandtabs(4)
+        style = self.rich_style
+        if line_no == self._match_line:
+            style = style + Style(reverse=True)
+        segments = [
+            Segment(f"{line_no + 1:>{gutter - 1}} ", self.rich_style + Style(dim=True)),
+            Segment(text[scroll_x:], style),
+        ]
+        return Strip(segments).crop(0, width).extend_cell_length(width, self.rich_style)
+
+    def goto_line(self, line: int) -> None:
+        """Centre la vue sur une ligne (1-based)."""
+        if self.index is None:
+            return
+        target = max(0, min(line - 1, self.index.line_count - 1))
+        self._match_line = target
+        self.scroll_to(y=max(0, target - self.scrollable_content_region.height // 2), animate=False)
+        self.refresh()
+
+    def find(self, needle: str, *, backward: bool = False) -> None:
+        """Cherche depuis la ligne courante dans un thread (la recherche precedente est annulee)."""
+        if self.index is None:
+            return
+        self._needle = needle
+        self._cancel_search()
+        start = self._match_line if self._match_line is not None else self.scroll_offset.y - 1
+        cancel = threading.Event()
+        self._search_cancel = cancel
+        self.run_worker(
+            partial(self._search, self.index, needle, start, backward, cancel),
+            thread=True,
+            group="large_search",
+            exit_on_error=False,
+        )
+
+    def _cancel_search(self) -> None:
+        if self._search_cancel is not None:
+            self._search_cancel.set()
+            self._search_cancel = None
+
+    def _search(
+        self, index: LineIndex, needle: str, start: int, backward: bool, cancel: threading.Event
+    ) -> None:
+        found = index.search(needle, start, backward=backward, cancel=cancel)
+        if not cancel.is_set():
+            self.app.call_from_thread(self._search_done, cancel, found)
+
+    def _search_done(self, cancel: threading.Event, found: Optional[int]) -> None:
+        # Resultat perime: une autre recherche ou un autre fichier a pris la main.
+        if cancel is not self._search_cancel:
+            return
+        self._search_cancel = None
+        if found is None:
+            self.app.bell()
+            return
+        self.goto_line(found + 1)
+
+    def action_goto_line(self) -> None:
+        def done(value: Optional[str]) -> None:
+            if value and value.strip().isdigit():
+                self.goto_line(int(value.strip()))
+
+        self.app.push_screen(PromptScreen("Aller a la ligne", placeholder="numero"), done)
+
+    def action_find(self) -> None:
+        def done(value: Optional[str]) -> None:
+            if value:
+                self.find(value)
+
+        self.app.push_screen(PromptScreen("Rechercher", value=self._needle), done)
+
+    def action_find_next(self) -> None:
+        if self._needle:
+            self.find(self._needle)
+
+    def action_find_previous(self) -> None:
+        if self._needle:
+            self.find(self._needle, backward=True)
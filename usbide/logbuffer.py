@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+
+from rich.errors import MarkupError
+from rich.text import Text
+from textual.widgets import RichLog
+
+DEFAULT_LOG_MAX_LINES = 5000
+_MIN_LOG_MAX_LINES = 100
+
+
+def log_max_lines() -> int:
+    """Lignes gardees par panneau de journal (USBIDE_LOG_MAX_LINES, 5000 par defaut)."""
+    raw = os.environ.get("USBIDE_LOG_MAX_LINES", "").strip()
+    try:
+        value = int(raw) if raw else DEFAULT_LOG_MAX_LINES
+    except ValueError:
+        value = DEFAULT_LOG_MAX_LINES
+    return max(_MIN_LOG_MAX_LINES, value)
+
+
+def logs_dir(root_dir: Path) -> Path:
+    """Journaux de session sur la cle."""
+    return root_dir / ".usbide" / "logs"
+
+
+def plain_lines(content: str, *, markup: bool = True) -> list[str]:
+    """Lignes de texte brut d'un message (balisage Rich retire)."""
+    if markup:
+        try:
+            content = Text.from_markup(content).plain
+        except MarkupError:
+            pass
+    return content.split("\n")
+
+
+class LogHistory:
+    """Dernieres lignes d'un panneau (texte brut), en tampon circulaire."""
+
+    def __init__(self, max_lines: int) -> None:
+        self.max_lines = max_lines
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        # Lignes sorties de l'historique (evincees ou effacees) depuis le debut.
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def lines(self) -> list[str]:
+        return list(self._lines)
+
+    def append(self, lines: list[str]) -> None:
+        self.dropped += max(0, len(self._lines) + len(lines) - self.max_lines)
+        self._lines.extend(lines)
+
+    def clear(self) -> None:
+        self.dropped += len(self._lines)
+        self._lines.clear()
+
+
+class LogPane(RichLog):
+    """RichLog borne: `max_lines` lignes affichees et gardees en historique.
+
+    Chaque ligne ecrite est aussi transmise a `sink` (journal de session sur
+    disque): les lignes evincees y restent. Le sous-titre du cadre indique
+    combien sont sorties de l'historique.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_lines: Optional[int] = None,
+        sink: Optional[Callable[[list[str]], None]] = None,
+        **kwargs,
+    ) -> None:
+        budget = max_lines or log_max_lines()
+        super().__init__(max_lines=budget, **kwargs)
+        self.history = LogHistory(budget)
+        self._sink = sink
+        # Ecritures differees (taille inconnue) rejouees par RichLog: deja dans l'historique.
+        self._replays = 0
+
+    def write(self, content, *args, **kwargs):  # type: ignore[override]
+        if self._replays and self._size_known:
+            self._replays -= 1
+        else:
+            if not self._size_known:
+                self._replays += 1
+            if isinstance(content, str):
+                lines = plain_lines(content, markup=self.markup)
+                self.history.append(lines)
+                if self._sink is not None:
+                    self._sink(lines)
+                self._update_marker()
+        return super().write(content, *args, **kwargs)
+
+    def clear(self):  # type: ignore[override]
+        self.history.clear()
+        self._replays = 0
+        self._update_marker()
+        return super().clear()
+
+    def _update_marker(self) -> None:
+        dropped = self.history.dropped
+        subtitle = f"{dropped} ligne(s) archivee(s)" if dropped else ""
+        if self.border_subtitle != subtitle:
+            self.border_subtitle = subtitle
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Callable, Optional
+
+from usbide.search import compile_query
+from usbide.trigram import required_literals
+
+# Correspondances retenues au plus (la liste affichee n'en montre pas plus).
+MAX_MATCHES = 5000
+# Apercu d'une ligne (sortie minifiee, barres de progression sur une ligne).
+_PREVIEW_CHARS = 300
+
+
+@dataclass(frozen=True)
+class LogMatch:
+    # Indice de la ligne dans le corpus (0: la plus ancienne).
+    line: int
+    # Position du match dans `text` (apercu de la ligne).
+    column: int
+    length: int
+    text: str
+
+
+class LogCorpus:
+    """Historique d'un panneau de journal: lignes archivees puis lignes en memoire.
+
+    Les lignes sont reunies en un seul texte avec l'index de leurs debuts:
+    la regex parcourt le texte d'un bloc (en C) et chaque match est ramene a
+    sa ligne par dichotomie, ce qui reste rapide sur un million de lignes.
+    """
+
+    def __init__(self, lines: list[str], *, archived: int = 0) -> None:
+        # Les `archived` premieres lignes ne sont plus dans le panneau (journal de session).
+        self.archived = archived
+        self.line_count = len(lines)
+        self._text = "\n".join(lines)
+        self._starts = array("Q", accumulate((len(line) + 1 for line in lines), initial=0))
+        self._lowered: Optional[str] = None
+
+    def line(self, index: int) -> str:
+        return self._text[self._starts[index] : self._starts[index + 1] - 1]
+
+    def from_end(self, index: int) -> Optional[int]:
+        """Rang d'une ligne en partant de la fin du panneau; None si elle est archivee."""
+        if index < self.archived:
+            return None
+        return self.line_count - 1 - index
+
+    def find(self, query: str, *, regex: bool = False, limit: int = MAX_MATCHES) -> tuple[list[LogMatch], bool]:
+        """Premiere correspondance de chaque ligne (ordre chronologique) et indicateur de limite atteinte.
+
+        Meme casse intelligente que la recherche de fichiers; re.error si la regex est invalide.
+        """
+        search = self._searcher(query, regex)
+        if not self.line_count:
+            return [], False
+        starts = self._starts
+        matches: list[LogMatch] = []
+        pos = 0
+        while pos <= len(self._text):
+            span = search(pos)
+            if span is None:
+                return matches, False
+            if len(matches) >= limit:
+                return matches, True
+            start, end = span
+            index = bisect_right(starts, start) - 1
+            line_end = starts[index + 1] - 1
+            matches.append(self._match(index, start - starts[index], min(end, line_end) - start))
+            # Une seule entree par ligne: la recherche reprend a la ligne suivante.
+            pos = line_end + 1
+        return matches, False
+
+    def _searcher(self, query: str, regex: bool) -> Callable[[int], Optional[tuple[int, int]]]:
+        """Fonction position -> (debut, fin) de la correspondance suivante."""
+        compiled = compile_query(query, regex=regex)
+        # Fragment obligatoire cherche par str.find (bien plus rapide qu'une regex, surtout sans casse).
+        literals = required_literals(query, regex=regex)
+        literal = max(literals, key=len) if literals else ""
+        haystack = self._text
+        if literal and compiled.flags & re.IGNORECASE:
+            haystack, literal = self._lowered_text(), literal.lower()
+            if not haystack or len(literal) != len(max(literals, key=len)):
+                literal = ""
+        starts = self._starts
+
+        if not literal:
+            # ^ et $ en debut/fin de ligne, comme pour une recherche ligne par ligne.
+            pattern = re.compile(compiled.pattern, compiled.flags | re.MULTILINE)
+
+            def scan(pos: int) -> Optional[tuple[int, int]]:
+                found = pattern.search(self._text, pos)
+                return None if found is None else found.span()
+
+            return scan
+        if not regex:
+
+            def find(pos: int) -> Optional[tuple[int, int]]:
+                start = haystack.find(literal, pos)
+                return None if start < 0 else (start, start + len(literal))
+
+            return find
+
+        def candidates(pos: int) -> Optional[tuple[int, int]]:
+            # La regex ne tourne que sur les lignes contenant le fragment.
+            while True:
+                start = haystack.find(literal, pos)
+                if start < 0:
+                    return None
+                index = bisect_right(starts, start) - 1
+                found = compiled.search(self.line(index))
+                if found is not None:
+                    return starts[index] + found.start(), starts[index] + found.end()
+                pos = starts[index + 1]
+
+        return candidates
+
+    def _lowered_text(self) -> str:
+        """Texte en minuscules (vide si des positions changeraient: quelques caracteres Unicode)."""
+        if self._lowered is None:
+            lowered = self._text.lower()
+            self._lowered = lowered if len(lowered) == len(self._text) else ""
+        return self._lowered
+
+    def _match(self, index: int, column: int, length: int) -> LogMatch:
+        text = self.line(index)
+        if len(text) > _PREVIEW_CHARS:
+            start = max(0, min(column - 40, len(text) - _PREVIEW_CHARS))
+            text = text[start : start + _PREVIEW_CHARS]
+            column -= start
+            length = min(length, _PREVIEW_CHARS - column)
+        return LogMatch(line=index, column=column, length=max(0, length), text=text)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import compileall
+import importlib.util
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+# Dossiers du workspace a ne jamais parcourir (lourds ou generes).
+_SKIP_DIRS = {
+    ".git",
+    ".usbide",
+    ".venv",
+    "venv",
+    "__pycache__",
+    "build",
+    "cache",
+    "codex_home",
+    "dist",
+    "node_modules",
+    "tmp",
+    # Python portable (tools/python-x64): sa stdlib n'est pas une source du workspace.
+    "tools",
+}
+
+
+@dataclass
+class PrecompileReport:
+    compiled: int = 0
+    fresh: int = 0
+    failed: int = 0
+    # Temps reel de la passe (parallele) et temps CPU cumule de compilation.
+    elapsed: float = 0.0
+    saved: float = 0.0
+
+    def summary(self) -> str:
+        """Resume lisible (CLI et journal UI)."""
+        return (
+            f"{self.compiled} module(s) compile(s), {self.fresh} deja a jour, {self.failed} en erreur "
+            f"en {self.elapsed:.2f}s (temps epargne aux prochains lancements: ~{self.saved:.2f}s)"
+        )
+
+
+def pycache_prefix(root_dir: Path) -> Path:
+    """Pycache portable (identique a PYTHONPYCACHEPREFIX des process enfants)."""
+    return root_dir / "cache" / "pycache"
+
+
+def _iter_py_files(base: Path, skip_dirs: Iterable[str] = ()) -> Iterator[Path]:
+    """Parcourt les .py d'un dossier en elaguant les dossiers ignores."""
+    skip = set(skip_dirs)
+    for dirpath, dirnames, filenames in os.walk(base):
+        # Elagage en place pour ne pas descendre dans les dossiers lourds.
+        dirnames[:] = [d for d in dirnames if d not in skip and not d.endswith(".dist-info")]
+        for name in filenames:
+            if name.endswith(".py"):
+                yield Path(dirpath) / name
+
+
+def collect_sources(root_dir: Path, *, include_package: bool = True) -> list[Path]:
+    """Liste les sources a precompiler: vendor, paquet usbide puis workspace."""
+    seen: set[Path] = set()
+    sources: list[Path] = []
+
+    def add_all(paths: Iterable[Path]) -> None:
+        for path in paths:
+            resolved = path.resolve()
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            sources.append(resolved)
+
+    vendor = root_dir / ".usbide" / "vendor"
+    if vendor.is_dir():
+        add_all(_iter_py_files(vendor, {"__pycache__"}))
+    if include_package:
+        add_all(_iter_py_files(Path(__file__).resolve().parent, {"__pycache__"}))
+    add_all(_iter_py_files(root_dir, _SKIP_DIRS))
+    return sources
+
+
+def _init_worker(prefix: str) -> None:
+    """Initialise un process de compilation sur le pycache portable."""
+    sys.pycache_prefix = prefix
+
+
+def _pyc_is_fresh(source: str) -> bool:
+    """Meme test que compileall: en-tete pyc aligne sur le mtime de la source."""
+    try:
+        mtime = int(os.stat(source).st_mtime)
+        expect = struct.pack("<4sLL", importlib.util.MAGIC_NUMBER, 0, mtime & 0xFFFF_FFFF)
+        with open(importlib.util.cache_from_source(source), "rb") as handle:
+            return handle.read(12) == expect
+    except OSError:
+        return False
+
+
+def _compile_one(source: str) -> tuple[str, float]:
+    """Compile un fichier dans le process courant: (statut, duree)."""
+    if _pyc_is_fresh(source):
+        return "fresh", 0.0
+    start = time.perf_counter()
+    ok = compileall.compile_file(source, quiet=2)
+    return ("compiled" if ok else "failed"), time.perf_counter() - start
+
+
+def precompile(
+    root_dir: Path,
+    *,
+    sources: Optional[Sequence[Path]] = None,
+    workers: Optional[int] = None,
+) -> PrecompileReport:
+    """Compile les sources en bytecode dans le pycache portable (pool de process)."""
+    prefix = pycache_prefix(root_dir)
+    prefix.mkdir(parents=True, exist_ok=True)
+    files = [str(path) for path in (sources if sources is not None else collect_sources(root_dir))]
+    report = PrecompileReport()
+    if not files:
+        return report
+
+    max_workers = max(1, workers or os.cpu_count() or 1)
+    # Des lots moyens limitent les allers-retours IPC sans desequilibrer le pool.
+    chunksize = max(1, len(files) // (max_workers * 8))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(str(prefix),)) as pool:
+        for status, duration in pool.map(_compile_one, files, chunksize=chunksize):
+            if status == "compiled":
+                report.compiled += 1
+                report.saved += duration
+            elif status == "fresh":
+                report.fresh += 1
+            else:
+                report.failed += 1
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+def profiles_dir(root_dir: Path) -> Path:
+    """Dossier des profils de demarrage sur la cle."""
+    return root_dir / ".usbide" / "profiles"
+
+
+class StartupProfiler:
+    """Chronologie du demarrage: dump cProfile + trace Chrome (chrome://tracing)."""
+
+    def __init__(self, output_dir: Path, *, origin_ns: Optional[int] = None) -> None:
+        self.output_dir = output_dir
+        # Origine de la chronologie (idealement capturee au tout debut du process).
+        self._origin_ns = origin_ns if origin_ns is not None else time.perf_counter_ns()
+        self._events: list[dict[str, object]] = []
+        self._profile = cProfile.Profile()
+        self._running = False
+        self.finished = False
+
+    def start(self) -> None:
+        """Active cProfile sur le thread courant (boucle Textual)."""
+        if self._running or self.finished:
+            return
+        self._profile.enable()
+        self._running = True
+
+    def _us(self, ns: int) -> float:
+        """Convertit un instant perf_counter_ns en microsecondes depuis l'origine."""
+        return (ns - self._origin_ns) / 1000
+
+    def add_span(self, name: str, begin_ns: int, end_ns: int) -> None:
+        """Ajoute une phase deja mesuree a la chronologie."""
+        self._events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": self._us(begin_ns),
+                "dur": max(0.0, (end_ns - begin_ns) / 1000),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Mesure une phase du demarrage."""
+        begin = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, begin, time.perf_counter_ns())
+
+    def mark(self, name: str) -> None:
+        """Ajoute un evenement instantane (ex: premiere frame)."""
+        self._events.append(
+            {
+                "name": name,
+                "ph": "i",
+                "s": "g",
+                "ts": self._us(time.perf_counter_ns()),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
+    def finish(self) -> tuple[Path, Path]:
+        """Arrete la mesure et ecrit (profil .prof, trace .json)."""
+        if self._running:
+            self._profile.disable()
+            self._running = False
+        self.finished = True
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        prof_path = self.output_dir / f"startup-{stamp}.prof"
+        trace_path = self.output_dir / f"startup-{stamp}.trace.json"
+        self._profile.dump_stats(str(prof_path))
+        trace = {"traceEvents": self._events, "displayTimeUnit": "ms"}
+        trace_path.write_text(json.dumps(trace, ensure_ascii=False), encoding="utf-8")
+        return prof_path, trace_path
@@ -0,0 +1,544 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Optional
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.screen import ModalScreen
+from textual.timer import Timer
+from textual.widgets import Input, Label, OptionList
+
+from usbide.fuzzy import FuzzyMatch, FuzzyMatcher
+
+if TYPE_CHECKING:
+    # usbide.search importe largefile, qui importe ce module.
+    from usbide.logsearch import LogCorpus, LogMatch
+    from usbide.search import SearchHit, WorkspaceSearch
+
+# Pause de frappe (s) avant de relancer la recherche plein texte.
+_SEARCH_DEBOUNCE = 0.15
+
+
+class PromptScreen(ModalScreen[Optional[str]]):
+    """Petite boite de saisie modale (Entree valide, Echap annule)."""
+
+    BINDINGS = [Binding("escape", "cancel", "Annuler")]
+
+    DEFAULT_CSS = """
+    PromptScreen {
+        align: center middle;
+    }
+
+    PromptScreen > Vertical {
+        width: 60;
+        height: auto;
+        border: round $accent;
+        background: $panel;
+        padding: 1 2;
+    }
+    """
+
+    def __init__(self, title: str, *, placeholder: str = "", value: str = "") -> None:
+        super().__init__()
+        self._title = title
+        self._placeholder = placeholder
+        self._value = value
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Label(self._title)
+            yield Input(value=self._value, placeholder=self._placeholder, id="prompt_input")
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        self.dismiss(event.value)
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+class ConfirmScreen(ModalScreen[bool]):
+    """Question oui/non modale (O/Entree = oui, N/Echap = non)."""
+
+    BINDINGS = [
+        Binding("o,y,enter", "answer(True)", "Oui"),
+        Binding("n,escape", "answer(False)", "Non"),
+    ]
+
+    DEFAULT_CSS = """
+    ConfirmScreen {
+        align: center middle;
+    }
+
+    ConfirmScreen > Vertical {
+        width: 70;
+        height: auto;
+        border: round $accent;
+        background: $panel;
+        padding: 1 2;
+    }
+
+    ConfirmScreen #confirm_hint {
+        color: $text-muted;
+        margin-top: 1;
+    }
+    """
+
+    def __init__(self, question: str) -> None:
+        super().__init__()
+        self._question = question
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Label(self._question, id="confirm_question")
+            yield Label("[O]ui / [N]on", id="confirm_hint", markup=False)
+
+    def action_answer(self, value: bool) -> None:
+        self.dismiss(value)
+
+
+class FuzzyFinderScreen(ModalScreen[Optional[str]]):
+    """Palette de recherche floue (fichiers, symboles; Entree ouvre, Echap annule)."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Annuler"),
+        Binding("down", "move(1)", show=False),
+        Binding("up", "move(-1)", show=False),
+    ]
+
+    DEFAULT_CSS = """
+    FuzzyFinderScreen {
+        align: center top;
+        padding-top: 3;
+    }
+
+    FuzzyFinderScreen > Vertical {
+        width: 90;
+        height: auto;
+        max-height: 80%;
+        border: round $accent;
+        background: $panel;
+        padding: 0 1;
+    }
+
+    FuzzyFinderScreen #finder_results {
+        height: auto;
+        max-height: 20;
+        border: none;
+    }
+    """
+
+    def __init__(self, matcher: FuzzyMatcher, *, limit: int = 50, placeholder: Optional[str] = None) -> None:
+        super().__init__()
+        self._matcher = matcher
+        self._limit = limit
+        self._placeholder = placeholder or f"Fichier ({len(matcher)} indexes)"
+        self._paths: list[str] = []
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Input(placeholder=self._placeholder, id="finder_input")
+            yield OptionList(id="finder_results")
+
+    def on_mount(self) -> None:
+        self._update("")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        event.stop()
+        self._update(event.value)
+
+    def _update(self, query: str) -> None:
+        matches = self._matcher.search(query, limit=self._limit)
+        self._paths = [match.path for match in matches]
+        results = self.query_one("#finder_results", OptionList)
+        results.clear_options()
+        results.add_options([_highlight(match) for match in matches])
+        if matches:
+            results.highlighted = 0
+
+    def action_move(self, delta: int) -> None:
+        results = self.query_one("#finder_results", OptionList)
+        if self._paths:
+            current = results.highlighted or 0
+            results.highlighted = max(0, min(len(self._paths) - 1, current + delta))
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        highlighted = self.query_one("#finder_results", OptionList).highlighted
+        self.dismiss(self._paths[highlighted] if self._paths and highlighted is not None else None)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        event.stop()
+        self.dismiss(self._paths[event.option_index])
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+class SearchScreen(ModalScreen[Optional["SearchHit"]]):
+    """Recherche plein texte: resultats au fil de l'eau, Entree ouvre a la ligne (Alt+R: regex)."""
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Annuler"),
+        Binding("down", "move(1)", show=False),
+        Binding("up", "move(-1)", show=False),
+        Binding("alt+r", "toggle_regex", "Regex"),
+    ]
+
+    DEFAULT_CSS = """
+    SearchScreen {
+        align: center top;
+        padding-top: 3;
+    }
+
+    SearchScreen > Vertical {
+        width: 110;
+        height: auto;
+        max-height: 85%;
+        border: round $accent;
+        background: $panel;
+        padding: 0 1;
+    }
+
+    SearchScreen #search_status {
+        color: $text-muted;
+    }
+
+    SearchScreen #search_results {
+        height: auto;
+        max-height: 24;
+        border: none;
+    }
+    """
+
+    def __init__(self, engine: WorkspaceSearch, *, query: str = "") -> None:
+        super().__init__()
+        self._engine = engine
+        self._query = query
+        self._regex = False
+        self._hits: list[SearchHit] = []
+        # Jeton de la recherche affichee: les resultats d'une recherche annulee sont ignores.
+        self._generation = 0
+        self._cancel: Optional[threading.Event] = None
+        self._timer: Optional[Timer] = None
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Input(value=self._query, placeholder="Rechercher dans les fichiers", id="search_input")
+            yield Label("", id="search_status")
+            yield OptionList(id="search_results")
+
+    def on_mount(self) -> None:
+        if self._query:
+            self._start()
+
+    def on_unmount(self) -> None:
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        event.stop()
+        self._query = event.value
+        if self._timer is not None:
+            self._timer.stop()
+        self._timer = self.set_timer(_SEARCH_DEBOUNCE, self._start)
+
+    def action_toggle_regex(self) -> None:
+        self._regex = not self._regex
+        self._start()
+
+    def _start(self) -> None:
+        """Annule la recherche en cours et lance la nouvelle (thread)."""
+        self._timer = None
+        if self._cancel is not None:
+            self._cancel.set()
+        self._generation += 1
+        self._hits = []
+        self.query_one("#search_results", OptionList).clear_options()
+        query = self._query
+        if not query.strip():
+            self._cancel = None
+            self._status("")
+            return
+        self._cancel = threading.Event()
+        self._status(f"Recherche ({self._mode_label()})...")
+        self.run_worker(
+            partial(self._search, query, self._regex, self._generation, self._cancel),
+            thread=True,
+            group="search",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _search(self, query: str, regex: bool, generation: int, cancel: threading.Event) -> None:
+        started = time.perf_counter()
+        try:
+            count = self._engine.run(
+                query, lambda hits: self.app.call_from_thread(self._add_hits, generation, hits), cancel, regex=regex
+            )
+        except re.error as exc:
+            self.app.call_from_thread(self._finished, generation, f"Expression invalide: {exc}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        if not cancel.is_set():
+            limit = " (limite atteinte)" if count >= self._engine.max_hits else ""
+            self.app.call_from_thread(
+                self._finished, generation, f"{count} resultat(s){limit} en {elapsed:.0f} ms ({self._mode_label()})"
+            )
+
+    def _mode_label(self) -> str:
+        return f"{self._engine.backend}, {'regex' if self._regex else 'texte'}"
+
+    def _add_hits(self, generation: int, hits: list[SearchHit]) -> None:
+        if generation != self._generation:
+            return
+        results = self.query_one("#search_results", OptionList)
+        first = not self._hits
+        self._hits.extend(hits)
+        results.add_options([_hit_label(hit) for hit in hits])
+        if first:
+            results.highlighted = 0
+
+    def _finished(self, generation: int, message: str) -> None:
+        if generation == self._generation:
+            self._status(message)
+
+    def _status(self, message: str) -> None:
+        self.query_one("#search_status", Label).update(message)
+
+    def action_move(self, delta: int) -> None:
+        results = self.query_one("#search_results", OptionList)
+        if self._hits:
+            current = results.highlighted or 0
+            results.highlighted = max(0, min(len(self._hits) - 1, current + delta))
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        highlighted = self.query_one("#search_results", OptionList).highlighted
+        if self._hits and highlighted is not None:
+            self.dismiss(self._hits[highlighted])
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        event.stop()
+        self.dismiss(self._hits[event.option_index])
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+class LogFilterScreen(ModalScreen[Optional[int]]):
+    """Filtre d'un panneau de journal (historique et lignes archivees).
+
+    F3 / Maj+F3: correspondance suivante / precedente, avec ses lignes voisines.
+    Entree renvoie le rang depuis la fin du panneau (None si la ligne est archivee).
+    """
+
+    BINDINGS = [
+        Binding("escape", "cancel", "Annuler"),
+        Binding("down", "move(1)", show=False),
+        Binding("up", "move(-1)", show=False),
+        Binding("f3", "jump(1)", "Suivant"),
+        Binding("shift+f3", "jump(-1)", "Precedent"),
+        Binding("alt+r", "toggle_regex", "Regex"),
+    ]
+
+    DEFAULT_CSS = """
+    LogFilterScreen {
+        align: center top;
+        padding-top: 3;
+    }
+
+    LogFilterScreen > Vertical {
+        width: 110;
+        height: auto;
+        max-height: 85%;
+        border: round $accent;
+        background: $panel;
+        padding: 0 1;
+    }
+
+    LogFilterScreen #log_filter_status {
+        color: $text-muted;
+    }
+
+    LogFilterScreen #log_filter_results {
+        height: auto;
+        max-height: 16;
+        border: none;
+    }
+
+    LogFilterScreen #log_filter_context {
+        height: auto;
+        border-top: solid $accent;
+    }
+    """
+
+    def __init__(self, load: Callable[[], "LogCorpus"], *, title: str, query: str = "") -> None:
+        super().__init__()
+        # Construit le corpus (lecture des segments archives): appele dans un thread.
+        self._load = load
+        self._title = title
+        self._query = query
+        self._regex = False
+        self._corpus: Optional[LogCorpus] = None
+        self._matches: list[LogMatch] = []
+        self._generation = 0
+        self._timer: Optional[Timer] = None
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Input(value=self._query, placeholder=f"Filtrer: {self._title}", id="log_filter_input")
+            yield Label("Chargement de l'historique...", id="log_filter_status")
+            yield OptionList(id="log_filter_results")
+            yield Label("", id="log_filter_context")
+
+    def on_mount(self) -> None:
+        self.run_worker(self._load_corpus, thread=True, group="log_filter_load", exit_on_error=False)
+
+    def _load_corpus(self) -> None:
+        corpus = self._load()
+        self.app.call_from_thread(self._loaded, corpus)
+
+    def _loaded(self, corpus: LogCorpus) -> None:
+        self._corpus = corpus
+        self._start()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        event.stop()
+        self._query = event.value
+        if self._timer is not None:
+            self._timer.stop()
+        self._timer = self.set_timer(_SEARCH_DEBOUNCE, self._start)
+
+    def action_toggle_regex(self) -> None:
+        self._regex = not self._regex
+        self._start()
+
+    def _start(self) -> None:
+        self._timer = None
+        if self._corpus is None:
+            return
+        self._generation += 1
+        self._matches = []
+        self.query_one("#log_filter_results", OptionList).clear_options()
+        self.query_one("#log_filter_context", Label).update("")
+        if not self._query:
+            self._status(self._summary())
+            return
+        self.run_worker(
+            partial(self._filter, self._corpus, self._query, self._regex, self._generation),
+            thread=True,
+            group="log_filter",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _filter(self, corpus: LogCorpus, query: str, regex: bool, generation: int) -> None:
+        started = time.perf_counter()
+        try:
+            matches, truncated = corpus.find(query, regex=regex)
+        except re.error as exc:
+            self.app.call_from_thread(self._show, generation, [], f"Expression invalide: {exc}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        limit = " (limite atteinte)" if truncated else ""
+        status = f"{len(matches)} ligne(s){limit} en {elapsed:.0f} ms - {self._summary()}"
+        self.app.call_from_thread(self._show, generation, matches, status)
+
+    def _summary(self) -> str:
+        corpus = self._corpus
+        if corpus is None:
+            return ""
+        mode = "regex" if self._regex else "texte"
+        return f"{corpus.line_count} ligne(s) dont {corpus.archived} archivee(s), {mode}"
+
+    def _show(self, generation: int, matches: list[LogMatch], status: str) -> None:
+        if generation != self._generation:
+            return
+        self._matches = matches
+        results = self.query_one("#log_filter_results", OptionList)
+        results.add_options([_log_match_label(match) for match in matches])
+        self._status(status)
+        if matches:
+            # Les plus recentes d'abord a l'ecran: on part de la derniere.
+            results.highlighted = len(matches) - 1
+
+    def _status(self, message: str) -> None:
+        self.query_one("#log_filter_status", Label).update(message)
+
+    def on_option_list_option_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        event.stop()
+        corpus = self._corpus
+        if corpus is None or not 0 <= event.option_index < len(self._matches):
+            return
+        match = self._matches[event.option_index]
+        context = Text()
+        for index in range(max(0, match.line - 2), min(corpus.line_count, match.line + 3)):
+            style = "bold" if index == match.line else "dim"
+            context.append(f"{index + 1:>8}  {corpus.line(index)[:200]}\n", style=style)
+        context.rstrip()
+        self.query_one("#log_filter_context", Label).update(context)
+
+    def action_move(self, delta: int) -> None:
+        results = self.query_one("#log_filter_results", OptionList)
+        if self._matches:
+            current = results.highlighted or 0
+            results.highlighted = max(0, min(len(self._matches) - 1, current + delta))
+
+    def action_jump(self, delta: int) -> None:
+        """Correspondance suivante/precedente, en bouclant."""
+        results = self.query_one("#log_filter_results", OptionList)
+        if self._matches:
+            current = results.highlighted if results.highlighted is not None else -delta
+            results.highlighted = (current + delta) % len(self._matches)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        event.stop()
+        highlighted = self.query_one("#log_filter_results", OptionList).highlighted
+        if self._matches and highlighted is not None:
+            self._select(highlighted)
+
+    def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+        event.stop()
+        self._select(event.option_index)
+
+    def _select(self, index: int) -> None:
+        assert self._corpus is not None
+        self.dismiss(self._corpus.from_end(self._matches[index].line))
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+
+def _log_match_label(match: LogMatch) -> Text:
+    """Numero de ligne et texte, avec le match en surbrillance."""
+    prefix = f"{match.line + 1:>8}  "
+    text = Text.assemble((prefix, "dim"), match.text)
+    if match.length:
+        start = len(prefix) + match.column
+        text.stylize("bold #2dd4bf", start, start + match.length)
+    return text
+
+
+def _hit_label(hit: SearchHit) -> Text:
+    """Chemin, ligne et texte, avec le match en surbrillance."""
+    prefix = f"{hit.path}:{hit.line}  "
+    text = Text.assemble((prefix, "dim"), hit.text)
+    if hit.length:
+        start = len(prefix) + hit.column
+        text.stylize("bold #2dd4bf", start, start + hit.length)
+    return text
+
+
+def _highlight(match: FuzzyMatch) -> Text:
+    """Chemin avec les lettres retenues en surbrillance."""
+    text = Text(match.path)
+    for position in match.positions:
+        text.stylize("bold #2dd4bf", position, position + 1)
+    return text
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+from usbide.encoding import load_text
+from usbide.ignore import HEAVY_DIRS, user_ignore_path
+from usbide.largefile import large_file_threshold
+from usbide.trigram import TrigramIndex
+
+# Resultats au-dela desquels la recherche s'arrete (l'UI n'en affiche pas plus).
+MAX_HITS = 2000
+# Apercu de ligne (les lignes minifiees peuvent faire des megaoctets).
+_PREVIEW_CHARS = 300
+# Fichiers par tache du pool: assez pour amortir la soumission, assez peu pour streamer.
+_BATCH_FILES = 16
+# Envoi des resultats de rg par paquets: au plus toutes les 0,1 s ou tous les 64 resultats.
+_FLUSH_HITS = 64
+_FLUSH_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    # Chemin relatif a la racine, separateurs "/".
+    path: str
+    # Ligne (a partir de 1) et colonne en caracteres (a partir de 0) du premier match.
+    line: int
+    column: int
+    text: str
+    # Longueur du match dans `text` (surlignage).
+    length: int = 0
+
+
+def compile_query(query: str, *, regex: bool = False) -> re.Pattern[str]:
+    """Motif de recherche; casse ignoree sauf si la requete contient une majuscule.
+
+    Meme convention que `rg --smart-case`. Une regex invalide leve re.error.
+    """
+    flags = 0 if any(char.isupper() for char in query) else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+def rg_executable(env: Optional[dict[str, str]] = None) -> Optional[str]:
+    """Chemin de ripgrep sur le PATH donne (celui de tools_env), None s'il est absent."""
+    return shutil.which("rg", path=(env or os.environ).get("PATH"))
+
+
+def rg_argv(rg: str, query: str, *, regex: bool = False, ignore_file: Optional[Path] = None) -> list[str]:
+    """Commande ripgrep equivalente a la recherche integree (sortie "chemin\\0ligne:colonne:texte")."""
+    argv = [
+        rg,
+        "--no-heading",
+        "--line-number",
+        "--column",
+        "--null",
+        "--color=never",
+        "--no-messages",
+        "--smart-case",
+        "--hidden",
+        # .gitignore applique meme hors depot git (cle USB copiee sans .git).
+        "--no-require-git",
+        f"--max-filesize={large_file_threshold()}",
+        f"--max-columns={_PREVIEW_CHARS}",
+        "--max-columns-preview",
+    ]
+    for name in sorted(HEAVY_DIRS):
+        argv += ["--glob", f"!{name}"]
+    if ignore_file is not None and ignore_file.is_file():
+        argv += ["--ignore-file", str(ignore_file)]
+    if not regex:
+        argv.append("--fixed-strings")
+    argv += ["-e", query, "--", "."]
+    return argv
+
+
+def parse_rg_line(line: str, pattern: Optional[re.Pattern[str]] = None) -> Optional[SearchHit]:
+    """Analyse une ligne de `rg_argv`; None si elle est mal formee.
+
+    La colonne de rg compte des octets: elle est recalculee avec `pattern` si fourni.
+    """
+    path, sep, rest = line.partition("\0")
+    parts = rest.split(":", 2)
+    if not sep or len(parts) != 3:
+        return None
+    try:
+        line_no, column = int(parts[0]), int(parts[1]) - 1
+    except ValueError:
+        return None
+    if path.startswith("./"):
+        path = path[2:]
+    return _hit(path.replace("\\", "/"), line_no, parts[2].rstrip("\r"), pattern, column)
+
+
+def _hit(path: str, line_no: int, text: str, pattern: Optional[re.Pattern[str]], column: int = 0) -> SearchHit:
+    length = 0
+    match = pattern.search(text) if pattern is not None else None
+    if match is not None:
+        column, length = match.start(), match.end() - match.start()
+    if len(text) > _PREVIEW_CHARS:
+        # Apercu centre sur le match pour les lignes tres longues.
+        start = max(0, min(column - 40, len(text) - _PREVIEW_CHARS))
+        text = text[start : start + _PREVIEW_CHARS]
+        column -= start
+        length = min(length, _PREVIEW_CHARS - column)
+    return SearchHit(path=path, line=line_no, column=max(0, column), text=text, length=length)
+
+
+def search_file(root_dir: Path, rel: str, pattern: re.Pattern[str], limit: int = MAX_HITS) -> list[SearchHit]:
+    """Lignes d'un fichier correspondant au motif (binaires, gros fichiers et erreurs ignores)."""
+    path = root_dir / rel
+    try:
+        if path.stat().st_size >= large_file_threshold():
+            return []
+        loaded = load_text(path)
+    except OSError:
+        return []
+    # Test global d'abord (en C): la plupart des fichiers ne contiennent pas la requete.
+    if loaded.binary or pattern.search(loaded.text) is None:
+        return []
+    hits = []
+    for line_no, text in enumerate(loaded.text.split("\n"), start=1):
+        if pattern.search(text) is not None:
+            hits.append(_hit(rel, line_no, text, pattern))
+            if len(hits) >= limit:
+                break
+    return hits
+
+
+class WorkspaceSearch:
+    """Recherche plein texte dans le workspace, resultats transmis au fil de l'eau.
+
+    Delegue a ripgrep quand `rg` est fourni, sinon lit les fichiers candidats
+    (chemins de l'index: exclusions deja appliquees) avec un pool de threads;
+    les lectures sur cle USB se recouvrent. Avec `trigrams`, seuls les
+    fichiers pouvant contenir la requete sont relus. `on_hits` est appele depuis le
+    thread de `run`, annulable via `cancel`.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        candidates: Callable[[], Iterable[str]],
+        *,
+        rg: Optional[str] = None,
+        env: Optional[dict[str, str]] = None,
+        workers: Optional[int] = None,
+        max_hits: int = MAX_HITS,
+        trigrams: Optional[TrigramIndex] = None,
+    ) -> None:
+        self.root_dir = root_dir
+        self._candidates = candidates
+        self._rg = rg
+        self._env = env
+        self._workers = max(1, workers or min(32, (os.cpu_count() or 1) + 4))
+        self.max_hits = max_hits
+        self._trigrams = trigrams
+
+    @property
+    def backend(self) -> str:
+        if self._rg:
+            return "rg"
+        return "threads+trigrammes" if self._trigrams is not None else "threads"
+
+    def run(
+        self,
+        query: str,
+        on_hits: Callable[[list[SearchHit]], None],
+        cancel: threading.Event,
+        *,
+        regex: bool = False,
+    ) -> int:
+        """Lance la recherche; retourne le nombre de resultats transmis. re.error si regex invalide."""
+        pattern = compile_query(query, regex=regex)
+        if self._rg:
+            return self._run_rg(query, pattern, on_hits, cancel, regex)
+        paths = list(self._candidates())
+        if self._trigrams is not None:
+            paths = self._trigrams.narrow(paths, query, regex=regex)
+        return self._run_threads(paths, pattern, on_hits, cancel)
+
+    def _run_threads(
+        self,
+        paths: list[str],
+        pattern: re.Pattern[str],
+        on_hits: Callable[[list[SearchHit]], None],
+        cancel: threading.Event,
+    ) -> int:
+        batches = [paths[i : i + _BATCH_FILES] for i in range(0, len(paths), _BATCH_FILES)]
+
+        def batch(rels: Sequence[str]) -> list[SearchHit]:
+            hits: list[SearchHit] = []
+            for rel in rels:
+                if cancel.is_set():
+                    break
+                hits.extend(search_file(self.root_dir, rel, pattern, self.max_hits))
+            return hits
+
+        total = 0
+        executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="usbide-search")
+        try:
+            # Soumission bornee: une annulation n'attend pas des milliers de taches deja en file.
+            pending: set[Future[list[SearchHit]]] = set()
+            queue = iter(batches)
+            while not cancel.is_set():
+                for rels in queue:
+                    pending.add(executor.submit(batch, rels))
+                    if len(pending) >= self._workers * 2:
+                        break
+                if not pending:
+                    break
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    hits = future.result()[: self.max_hits - total]
+                    if hits and not cancel.is_set():
+                        total += len(hits)
+                        on_hits(hits)
+                if total >= self.max_hits:
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return total
+
+    def _run_rg(
+        self,
+        query: str,
+        pattern: re.Pattern[str],
+        on_hits: Callable[[list[SearchHit]], None],
+        cancel: threading.Event,
+        regex: bool,
+    ) -> int:
+        assert self._rg is not None
+        argv = rg_argv(self._rg, query, regex=regex, ignore_file=user_ignore_path(self.root_dir))
+        proc = subprocess.Popen(
+            argv,
+            cwd=str(self.root_dir),
+            env=self._env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert proc.stdout is not None
+        total = 0
+        chunk: list[SearchHit] = []
+        flushed_at = time.monotonic()
+        try:
+            for raw in proc.stdout:
+                if cancel.is_set():
+                    break
+                hit = parse_rg_line(raw.decode("utf-8", errors="replace").rstrip("\n"), pattern)
+                if hit is None:
+                    continue
+                chunk.append(hit)
+                if len(chunk) >= _FLUSH_HITS or time.monotonic() - flushed_at >= _FLUSH_SECONDS:
+                    on_hits(chunk)
+                    total += len(chunk)
+                    chunk = []
+                    flushed_at = time.monotonic()
+                if total + len(chunk) >= self.max_hits:
+                    break
+            if chunk and not cancel.is_set():
+                on_hits(chunk)
+                total += len(chunk)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
+        return total
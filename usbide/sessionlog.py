@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from usbide.logbuffer import logs_dir
+
+DEFAULT_SEGMENT_MB = 4.0
+DEFAULT_RETENTION_MB = 64.0
+# Ecriture au plus tard apres ce delai, ou des que ce nombre de lignes attend.
+_FLUSH_SECONDS = 0.5
+_FLUSH_LINES = 2000
+# Au-dela (disque bloque), les nouvelles lignes sont comptees puis perdues.
+_MAX_PENDING = 100_000
+
+
+def _env_mb(name: str, default: float) -> int:
+    raw = os.environ.get(name, "").strip()
+    try:
+        mb = float(raw) if raw else default
+    except ValueError:
+        mb = default
+    return max(1, int(mb * 1024 * 1024))
+
+
+def session_log_settings() -> tuple[int, int]:
+    """Taille d'un segment et total conserve, en octets.
+
+    USBIDE_LOG_SEGMENT_MB (4 Mo par defaut), USBIDE_LOG_RETENTION_MB (64 Mo par defaut).
+    """
+    segment = _env_mb("USBIDE_LOG_SEGMENT_MB", DEFAULT_SEGMENT_MB)
+    return segment, _env_mb("USBIDE_LOG_RETENTION_MB", DEFAULT_RETENTION_MB)
+
+
+def session_segments(directory: Path, stamp: Optional[str] = None) -> list[Path]:
+    """Segments de journal (ou ceux d'une session), du plus ancien au plus recent.
+
+    Ordre: "session-<ts>.<n>.log.gz" (rotations, n croissant) puis "session-<ts>.log" (courant).
+    """
+    pattern = f"session-{stamp}.*" if stamp else "session-*"
+
+    def key(path: Path) -> tuple[str, int, int]:
+        parts = path.name.split(".")
+        rotation = int(parts[1]) if len(parts) > 2 and parts[1].isdigit() else 0
+        return parts[0], rotation == 0, rotation
+
+    try:
+        found = [path for path in directory.glob(pattern) if path.name.endswith((".log", ".log.gz"))]
+    except OSError:
+        return []
+    return sorted(found, key=key)
+
+
+class SessionLog:
+    """Journal de session sur disque (.usbide/logs/session-<ts>.log), ecrit par un thread de fond.
+
+    `write` ne fait qu'ajouter a un tampon: une cle USB lente ne bloque jamais
+    l'UI. Le segment courant tourne au-dela de `segment_bytes`; les segments
+    precedents (et ceux des sessions passees) sont compresses en gzip, et les
+    plus anciens supprimes pour rester sous `retention_bytes`.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        *,
+        stamp: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        retention_bytes: Optional[int] = None,
+        on_error: Optional[Callable[[OSError], None]] = None,
+    ) -> None:
+        default_segment, default_retention = session_log_settings()
+        self.dir = logs_dir(root_dir)
+        self.stamp = stamp or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = self.dir / f"session-{self.stamp}.log"
+        self.segment_bytes = segment_bytes or default_segment
+        self.retention_bytes = retention_bytes or default_retention
+        self._on_error = on_error
+        # Lignes en attente: (panneau, ligne horodatee).
+        self._pending: list[tuple[str, str]] = []
+        self._lost = 0
+        self._rotations = 0
+        self._size = 0
+        self._handle = None
+        # Lignes par panneau du segment courant, des rotations de la session, et supprimees
+        # par la retention (rang de la premiere ligne encore sur disque).
+        self._segment_counts: Counter[str] = Counter()
+        self._rotated_counts: dict[Path, Counter[str]] = {}
+        self._removed: Counter[str] = Counter()
+        self._cond = threading.Condition()
+        # Nombre de lignes recues / ecrites (flush attend que les deux se rejoignent).
+        self._received = 0
+        self._written = 0
+        self._closed = False
+        self._failed = False
+        # Demande d'ecriture immediate (flush): pas d'attente de regroupement.
+        self._urgent = False
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, source: str, lines: list[str]) -> None:
+        """Ajoute des lignes d'un panneau ("journal", "codex"); ne bloque pas."""
+        if not lines:
+            return
+        clock = time.strftime("%H:%M:%S")
+        with self._cond:
+            if self._closed or self._failed:
+                return
+            room = _MAX_PENDING - len(self._pending)
+            if room < len(lines):
+                self._lost += len(lines) - max(0, room)
+                lines = lines[: max(0, room)]
+            self._pending.extend((source, f"{clock} [{source}] {line}") for line in lines)
+            self._received += len(lines)
+            # Reveil a la premiere ligne (le thread regroupe ensuite) ou tampon plein.
+            if len(self._pending) == len(lines) or len(self._pending) >= _FLUSH_LINES:
+                self._cond.notify_all()
+        self._ensure_thread()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Attend que les lignes deja recues soient ecrites; False si le delai expire."""
+        with self._cond:
+            target = self._received
+            self._urgent = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: self._written >= target or self._failed or self._thread is None, timeout
+            )
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+    # ---------- thread d'ecriture ----------
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="usbide-session-log", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            # Sessions precedentes (arret brutal, arrachage): compressees au demarrage.
+            for path in session_segments(self.dir):
+                if path.suffix == ".log" and path != self.path:
+                    self._compress(path)
+            self._enforce_retention()
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closed:
+                        self._cond.wait()
+                    if not (self._closed or self._urgent) and len(self._pending) < _FLUSH_LINES:
+                        # Regroupe les lignes qui suivent: une ecriture pour beaucoup de lignes.
+                        self._cond.wait(_FLUSH_SECONDS)
+                    self._urgent = False
+                    batch, self._pending = self._pending, []
+                    lost, self._lost = self._lost, 0
+                    closing = self._closed
+                if lost:
+                    clock = time.strftime("%H:%M:%S")
+                    batch.append(("session", f"{clock} [session] {lost} ligne(s) perdue(s) (ecriture trop lente)"))
+                if batch:
+                    self._append(batch)
+                with self._cond:
+                    self._written += len(batch) - (1 if lost else 0)
+                    self._cond.notify_all()
+                if closing and not self._pending:
+                    break
+        except OSError as exc:
+            with self._cond:
+                self._failed = True
+                self._pending = []
+                self._cond.notify_all()
+            if self._on_error is not None:
+                self._on_error(exc)
+        finally:
+            if self._handle is not None:
+                try:
+                    self._handle.close()
+                except OSError:
+                    pass
+                self._handle = None
+            with self._cond:
+                self._thread = None
+                self._cond.notify_all()
+
+    def _append(self, batch: list[tuple[str, str]]) -> None:
+        if self._handle is None:
+            self._handle = self.path.open("a", encoding="utf-8", errors="replace", newline="\n")
+            self._size = self._handle.tell()
+        data = "\n".join(line for _, line in batch) + "\n"
+        self._segment_counts.update(source for source, _ in batch)
+        self._handle.write(data)
+        self._handle.flush()
+        self._size += len(data.encode("utf-8", errors="replace"))
+        if self._size >= self.segment_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        assert self._handle is not None
+        self._handle.close()
+        self._handle = None
+        self._size = 0
+        self._rotations += 1
+        rotated = self.dir / f"session-{self.stamp}.{self._rotations}.log"
+        os.replace(self.path, rotated)
+        counts, self._segment_counts = self._segment_counts, Counter()
+        self._rotated_counts[self._compress(rotated)] = counts
+        self._enforce_retention()
+
+    @staticmethod
+    def _compress(path: Path) -> Path:
+        """Compresse un segment; retourne le fichier obtenu (le segment en clair en cas d'erreur)."""
+        target = path.with_name(path.name + ".gz")
+        try:
+            with path.open("rb") as source, gzip.open(target, "wb", compresslevel=6) as dest:
+                shutil.copyfileobj(source, dest)
+            path.unlink()
+        except OSError:
+            # Segment laisse en clair: relu tel quel, retire par la retention.
+            target.unlink(missing_ok=True)
+            return path
+        return target
+
+    def _enforce_retention(self) -> None:
+        segments = [path for path in session_segments(self.dir) if path != self.path]
+        sizes = {}
+        for path in segments:
+            try:
+                sizes[path] = path.stat().st_size
+            except OSError:
+                continue
+        total = sum(sizes.values()) + self._size
+        # Ordre des horodatages: les sessions les plus anciennes partent d'abord.
+        for path in segments:
+            if total <= self.retention_bytes:
+                break
+            if path in sizes:
+                path.unlink(missing_ok=True)
+                total -= sizes[path]
+                counts = self._rotated_counts.pop(path, None)
+                if counts:
+                    with self._cond:
+                        self._removed.update(counts)
+
+    # ---------- relecture ----------
+    def read_lines(self, source: str) -> tuple[int, list[str]]:
+        """Lignes d'un panneau ecrites pendant cette session, sans horodatage.
+
+        Retourne aussi le rang de la premiere (lignes plus anciennes supprimees par la retention).
+        Appeler `flush` avant pour inclure les lignes encore en attente.
+        """
+        with self._cond:
+            first = self._removed[source]
+        tag = f"[{source}] "
+        # "HH:MM:SS [panneau] texte"
+        start = 9 + len(tag)
+        lines: list[str] = []
+        for path in session_segments(self.dir, self.stamp):
+            opener = gzip.open if path.suffix == ".gz" else open
+            try:
+                with opener(path, "rt", encoding="utf-8", errors="replace", newline="\n") as handle:
+                    lines.extend(raw[start:].rstrip("\n") for raw in handle if raw.startswith(tag, 9))
+            except (OSError, EOFError):
+                # Segment supprime ou tronque pendant la lecture.
+                continue
+        return first, lines
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from usbide.fileio import atomic_write_bytes, content_hash
+
+
+@dataclass(frozen=True)
+class SwapEntry:
+    path: Path
+    encoding: str
+    text: str
+    saved_at: float
+
+
+def swap_dir(root_dir: Path) -> Path:
+    """Journal des buffers non sauvegardes (restauration apres crash/arrachage)."""
+    return root_dir / ".usbide" / "swap"
+
+
+class SwapJournal:
+    """Instantanes des buffers modifies, un fichier JSON par buffer.
+
+    Un instantane identique au precedent n'est pas reecrit (usure de la flash).
+    Les chemins sont stockes relativement a la racine quand c'est possible.
+    """
+
+    def __init__(self, root_dir: Path) -> None:
+        self.root_dir = Path(os.path.abspath(root_dir))
+        self.dir = swap_dir(self.root_dir)
+        # Empreinte du dernier instantane ecrit, par chemin relatif.
+        self._written: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _relative(self, path: Path) -> str:
+        absolute = Path(os.path.abspath(path))
+        try:
+            return absolute.relative_to(self.root_dir).as_posix()
+        except ValueError:
+            return absolute.as_posix()
+
+    def _file_for(self, path: Path) -> Path:
+        digest = hashlib.blake2b(self._relative(path).encode("utf-8"), digest_size=8).hexdigest()
+        return self.dir / f"{digest}.json"
+
+    def write(self, path: Path, text: str, encoding: str) -> bool:
+        """Ecrit l'instantane d'un buffer; False s'il etait deja a jour."""
+        digest = content_hash(text)
+        key = self._relative(path)
+        with self._lock:
+            if self._written.get(key) == digest:
+                return False
+            payload = {
+                "path": key,
+                "encoding": encoding,
+                "text": text,
+                "saved_at": time.time(),
+            }
+            self.dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self._file_for(path), json.dumps(payload).encode("utf-8"))
+            self._written[key] = digest
+            return True
+
+    def discard(self, path: Path) -> None:
+        """Supprime l'instantane (buffer sauvegarde, restauration refusee)."""
+        with self._lock:
+            self._written.pop(self._relative(path), None)
+            try:
+                self._file_for(path).unlink()
+            except OSError:
+                pass
+
+    def pending(self) -> list[SwapEntry]:
+        """Instantanes laisses par une session precedente (du plus ancien au plus recent)."""
+        entries: list[SwapEntry] = []
+        try:
+            files = sorted(self.dir.glob("*.json"))
+        except OSError:
+            return entries
+        for file in files:
+            try:
+                raw = json.loads(file.read_text(encoding="utf-8"))
+                path = Path(raw["path"])
+                entry = SwapEntry(
+                    path=path if path.is_absolute() else self.root_dir / path,
+                    encoding=str(raw["encoding"]),
+                    text=str(raw["text"]),
+                    saved_at=float(raw["saved_at"]),
+                )
+            except (OSError, ValueError, KeyError, TypeError):
+                # Instantane tronque (coupure pendant l'ecriture): ignore.
+                continue
+            entries.append(entry)
+        return sorted(entries, key=lambda entry: entry.saved_at)
+
+    def clear(self, entries: Optional[list[SwapEntry]] = None) -> None:
+        """Supprime les instantanes donnes (ou tous)."""
+        for entry in entries if entries is not None else self.pending():
+            self.discard(entry.path)
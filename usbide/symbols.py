@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import ast
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from usbide.fileio import atomic_write_bytes
+
+_VERSION = 1
+# En dessous, l'analyse se fait dans le process courant (demarrer un pool coute plus cher).
+_POOL_MIN_FILES = 16
+# Au-dela, un fichier .py (genere, donnees) n'est pas analyse.
+_MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# Une entree: [nom, type, ligne, colonne, conteneur].
+_Entry = list
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str
+    # "class", "function", "method", "variable" ou "import".
+    kind: str
+    # Chemin relatif a la racine, separateurs "/".
+    path: str
+    # Ligne a partir de 1, colonne a partir de 0 (conventions de ast).
+    line: int
+    column: int
+    # Classe(s) englobante(s) d'une methode ("Outer.Inner"), vide au niveau module.
+    container: str = ""
+
+    @property
+    def qualname(self) -> str:
+        return f"{self.container}.{self.name}" if self.container else self.name
+
+
+def symbols_path(root_dir: Path) -> Path:
+    """Index persistant des symboles Python."""
+    return root_dir / ".usbide" / "index" / "symbols.json"
+
+
+def _class_entries(node: ast.ClassDef, container: str, out: list[_Entry]) -> None:
+    out.append([node.name, "class", node.lineno, node.col_offset, container])
+    inner = f"{container}.{node.name}" if container else node.name
+    for child in node.body:
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            out.append([child.name, "method", child.lineno, child.col_offset, inner])
+        elif isinstance(child, ast.ClassDef):
+            _class_entries(child, inner, out)
+
+
+def _module_entries(body: list[ast.stmt], out: list[_Entry]) -> None:
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            _class_entries(node, "", out)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            out.append([node.name, "function", node.lineno, node.col_offset, ""])
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        out.append([name.id, "variable", name.lineno, name.col_offset, ""])
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == "*":
+                    continue
+                # "import a.b" lie le nom "a"; "from m import x as y" lie "y".
+                bound = alias.asname or alias.name.split(".")[0]
+                out.append([bound, "import", node.lineno, node.col_offset, ""])
+        elif isinstance(node, (ast.If, ast.Try, ast.With)):
+            # Definitions conditionnelles de niveau module (try/except ImportError, if TYPE_CHECKING).
+            _module_entries(node.body, out)
+            for handler in getattr(node, "handlers", []):
+                _module_entries(handler.body, out)
+            _module_entries(getattr(node, "orelse", []), out)
+            _module_entries(getattr(node, "finalbody", []), out)
+
+
+def parse_symbols(path: str) -> Optional[list[_Entry]]:
+    """Symboles d'un fichier source (process du pool); None si illisible ou invalide."""
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read(_MAX_FILE_BYTES + 1)
+    except OSError:
+        return None
+    if len(data) > _MAX_FILE_BYTES:
+        return []
+    try:
+        # Octets: ast respecte le cookie d'encodage PEP 263 et le BOM.
+        tree = ast.parse(data, filename=path)
+    except (SyntaxError, ValueError, RecursionError):
+        return None
+    out: list[_Entry] = []
+    _module_entries(tree.body, out)
+    return out
+
+
+class SymbolIndex:
+    """Classes, fonctions, methodes, noms de module et imports des .py du workspace.
+
+    L'analyse (ast) se fait dans un pool de process; seuls les fichiers dont
+    la taille ou le mtime a change sont reanalyses. Un fichier en erreur de
+    syntaxe garde ses symboles precedents. Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, root_dir: Path, *, workers: Optional[int] = None) -> None:
+        self.root_dir = Path(os.path.abspath(root_dir))
+        self.path = symbols_path(self.root_dir)
+        self._workers = max(1, workers or min(4, os.cpu_count() or 1))
+        # Chemin relatif -> [taille, mtime_ns, [entrees]].
+        self._files: dict[str, list] = {}
+        self._by_name: Optional[dict[str, list[Symbol]]] = None
+        # Incremente a chaque modification (invalide le dictionnaire par nom).
+        self._generation = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(record[2]) for record in self._files.values())
+
+    def load(self) -> bool:
+        """Lit l'index persistant; False s'il est absent, corrompu ou d'une autre version."""
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            files = raw.get("files") if raw.get("version") == _VERSION else None
+        except (OSError, ValueError, AttributeError):
+            files = None
+        if not isinstance(files, dict):
+            return False
+        with self._lock:
+            self._files = files
+            self._by_name = None
+            self._generation += 1
+            self._dirty = False
+        return True
+
+    def save(self) -> None:
+        """Ecrit l'index s'il a change (atomique; erreurs disque ignorees)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": _VERSION, "files": self._files}, separators=(",", ":"))
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.path, data.encode("utf-8"))
+        except OSError:
+            pass
+
+    def update(self, rels: Iterable[str], cancel: Optional[threading.Event] = None) -> int:
+        """Synchronise l'index avec la liste des sources .py; retourne le nombre de fichiers analyses."""
+        rels = [rel for rel in rels if rel.endswith(".py")]
+        with self._update_lock:
+            with self._lock:
+                for rel in set(self._files) - set(rels):
+                    del self._files[rel]
+                    self._changed()
+            return self._reparse(rels, cancel)
+
+    def update_paths(self, rels: Iterable[str]) -> int:
+        """Reanalyse seulement les fichiers donnes (sauvegarde dans l'IDE)."""
+        with self._update_lock:
+            return self._reparse([rel for rel in rels if rel.endswith(".py")], None)
+
+    def _reparse(self, rels: list[str], cancel: Optional[threading.Event]) -> int:
+        stale: list[tuple[str, int, int]] = []
+        for rel in rels:
+            if cancel is not None and cancel.is_set():
+                return 0
+            try:
+                st = os.stat(self.root_dir / rel)
+            except OSError:
+                with self._lock:
+                    if self._files.pop(rel, None) is not None:
+                        self._changed()
+                continue
+            with self._lock:
+                record = self._files.get(rel)
+            if record is None or record[0] != st.st_size or record[1] != st.st_mtime_ns:
+                stale.append((rel, st.st_size, st.st_mtime_ns))
+        if not stale:
+            return 0
+        sources = [str(self.root_dir / rel) for rel, _, _ in stale]
+        if len(stale) < _POOL_MIN_FILES or self._workers == 1:
+            results = map(parse_symbols, sources)
+            self._merge(stale, results, cancel)
+        else:
+            chunksize = max(1, len(sources) // (self._workers * 8))
+            with ProcessPoolExecutor(max_workers=self._workers) as pool:
+                self._merge(stale, pool.map(parse_symbols, sources, chunksize=chunksize), cancel)
+        return len(stale)
+
+    def _merge(
+        self,
+        stale: list[tuple[str, int, int]],
+        results: Iterable[Optional[list[_Entry]]],
+        cancel: Optional[threading.Event],
+    ) -> None:
+        for (rel, size, mtime_ns), entries in zip(stale, results):
+            if cancel is not None and cancel.is_set():
+                break
+            with self._lock:
+                previous = self._files.get(rel)
+                if entries is None:
+                    # Erreur de syntaxe (edition en cours): les anciens symboles restent utiles.
+                    entries = previous[2] if previous is not None else []
+                self._files[rel] = [size, mtime_ns, entries]
+                self._changed()
+
+    def _changed(self) -> None:
+        self._by_name = None
+        self._generation += 1
+        self._dirty = True
+
+    # ---------- requetes ----------
+    def symbols(self) -> list[Symbol]:
+        """Tous les symboles (ordre des fichiers, puis des lignes)."""
+        with self._lock:
+            files = dict(self._files)
+        result = []
+        for rel in sorted(files):
+            for name, kind, line, column, container in files[rel][2]:
+                result.append(Symbol(name, kind, rel, line, column, container))
+        return result
+
+    def definitions(self, name: str, *, prefer: Optional[str] = None) -> list[Symbol]:
+        """Definitions d'un nom: celles du fichier `prefer` d'abord, les imports en dernier."""
+        with self._lock:
+            by_name = self._by_name
+            generation = self._generation
+        if by_name is None:
+            by_name = {}
+            for symbol in self.symbols():
+                by_name.setdefault(symbol.name, []).append(symbol)
+            with self._lock:
+                # Une mise a jour concurrente a pu rendre ce dictionnaire perime.
+                if self._generation == generation:
+                    self._by_name = by_name
+        found = by_name.get(name, [])
+        return sorted(found, key=lambda s: (s.kind == "import", s.path != prefer, s.path, s.line))
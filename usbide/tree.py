@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from rich.text import Text
+from textual import work
+from textual.await_complete import AwaitComplete
+from textual.message import Message
+from textual.widgets import DirectoryTree, Tree
+from textual.widgets.directory_tree import DirEntry
+from textual.widgets.tree import TreeNode
+from textual.worker import WorkerCancelled, WorkerFailed, get_current_worker
+
+from usbide.ignore import IgnoreRules
+
+# Enfants affiches par page dans un dossier volumineux.
+DEFAULT_PAGE_SIZE = 200
+
+
+def tree_page_size() -> int:
+    """Taille de page de l'arbre (USBIDE_TREE_PAGE, 200 par defaut)."""
+    raw = os.environ.get("USBIDE_TREE_PAGE", "").strip()
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_PAGE_SIZE
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+
+
+class _MoreEntry(DirEntry):
+    """Noeud "... N autres": la suite d'un dossier pagine."""
+
+    def __init__(self, path: Path, remaining: list[Path]) -> None:
+        super().__init__(path)
+        self.remaining = remaining
+
+
+class WorkspaceTree(DirectoryTree):
+    """Arborescence du workspace: regles d'exclusion, dossiers lourds replies, pagination.
+
+    Notifie aussi la fin de peuplement des dossiers (profilage du demarrage).
+    """
+
+    class Populated(Message):
+        """Un dossier vient d'etre peuple dans l'arbre."""
+
+        def __init__(self, node: TreeNode[DirEntry], count: int) -> None:
+            self.node = node
+            self.count = count
+            super().__init__()
+
+    class DirectoryListed(Message):
+        """Un dossier vient d'etre liste (poste depuis le thread de chargement)."""
+
+        def __init__(self, path: Path) -> None:
+            self.path = path
+            super().__init__()
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        rules: Optional[IgnoreRules] = None,
+        page_size: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        self.rules = rules if rules is not None else IgnoreRules(Path(path))
+        self.page_size = page_size if page_size is not None else tree_page_size()
+        # Type des entrees deja lu par scandir: evite un stat par noeud sur le thread UI.
+        self._entry_is_dir: dict[Path, bool] = {}
+        # Dossiers listes -> mtime_ns au moment de la lecture (verification de coherence).
+        self._listed: dict[Path, int] = {}
+        super().__init__(path, **kwargs)
+
+    # Surcharges de methodes privees (verifiees avec Textual 8.2.8): le chargeur
+    # appelle _load_directory dans un thread puis _populate_node, seulement pour
+    # un dossier non vide. tests/test_tree.py echoue si ces points d'accroche
+    # disparaissent lors d'une mise a jour de Textual.
+    @work(thread=True, exit_on_error=False)
+    def _load_directory(self, node: TreeNode[DirEntry]) -> list[Path]:
+        assert node.data is not None
+        location = node.data.path.expanduser().resolve()
+        worker = get_current_worker()
+        dirs: list[tuple[str, Path]] = []
+        files: list[tuple[str, Path]] = []
+        try:
+            # Mtime lu avant scandir: une modification pendant la lecture sera revue.
+            self._listed[node.data.path] = os.stat(location).st_mtime_ns
+            with os.scandir(location) as it:
+                for entry in it:
+                    if worker.is_cancelled:
+                        break
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    path = location / entry.name
+                    if self.rules.is_ignored(path, is_dir):
+                        continue
+                    self._entry_is_dir[path] = is_dir
+                    (dirs if is_dir else files).append((entry.name.lower(), path))
+        except OSError:
+            self._listed.pop(node.data.path, None)
+        else:
+            self.post_message(self.DirectoryListed(node.data.path))
+        dirs.sort()
+        files.sort()
+        return list(self.filter_paths([path for _, path in dirs] + [path for _, path in files]))
+
+    def _populate_node(self, node: TreeNode[DirEntry], content: Iterable[Path]) -> None:
+        paths = list(content)
+        node.remove_children()
+        self._add_page(node, paths)
+        node.expand()
+        self.post_message(self.Populated(node, len(paths)))
+
+    def _add_page(self, node: TreeNode[DirEntry], paths: list[Path]) -> None:
+        """Ajoute une page d'enfants; le reste est derriere un noeud "... N autres"."""
+        page, rest = paths[: self.page_size], paths[self.page_size :]
+        for path in page:
+            self._add_entry(node, path)
+        if rest:
+            assert node.data is not None
+            node.add_leaf(
+                Text(f"... {len(rest)} autres (Entree pour afficher)", style="dim italic"),
+                data=_MoreEntry(node.data.path, rest),
+            )
+
+    def _add_entry(self, node: TreeNode[DirEntry], path: Path, **position) -> TreeNode[DirEntry]:
+        is_dir = self._entry_is_dir.pop(path, None)
+        if is_dir is None:
+            is_dir = self._safe_is_dir(path)
+        label: str | Text = path.name
+        if is_dir and self.rules.is_heavy(path.name):
+            # Dossier lourd: visible mais replie, liste seulement a la demande (et pagine).
+            label = Text.assemble(path.name, (" (lourd)", "dim italic"))
+        return node.add(label, data=DirEntry(path), allow_expand=is_dir, **position)
+
+    # ---------- mise a jour incrementale ----------
+    def changed_directories(self) -> list[Path]:
+        """Dossiers listes dont le mtime a change depuis leur lecture (un stat chacun, hors UI)."""
+        changed = []
+        for path, mtime_ns in list(self._listed.items()):
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime_ns:
+                changed.append(path)
+        return changed
+
+    def refresh_directories(self, paths: Sequence[Path]) -> AwaitComplete:
+        """Relit les dossiers donnes et ne modifie que leurs enfants directs.
+
+        Les noeuds inchanges (et donc leurs sous-arbres deplies) sont conserves.
+        """
+        return AwaitComplete(self._refresh_directories(list(paths)))
+
+    async def _refresh_directories(self, paths: list[Path]) -> None:
+        async with self.lock:
+            for path in paths:
+                node = self._listed_node(path)
+                if node is None or not await asyncio.to_thread(self._safe_is_dir, path):
+                    # Dossier supprime: son noeud part avec la mise a jour du parent.
+                    self._listed.pop(path, None)
+                    continue
+                try:
+                    content = await self._load_directory(node).wait()
+                except (WorkerCancelled, WorkerFailed):
+                    continue
+                self._patch_node(node, content)
+
+    def _listed_node(self, path: Path) -> Optional[TreeNode[DirEntry]]:
+        node: Optional[TreeNode[DirEntry]] = self.root
+        while node is not None and node.data is not None and node.data.path != path:
+            node = next(
+                (
+                    child
+                    for child in node.children
+                    if child.data is not None
+                    and not isinstance(child.data, _MoreEntry)
+                    and (child.data.path == path or child.data.path in path.parents)
+                ),
+                None,
+            )
+        if node is None or node.data is None or not node.data.loaded:
+            return None
+        return node
+
+    def _patch_node(self, node: TreeNode[DirEntry], paths: list[Path]) -> None:
+        children = list(node.children)
+        if len(paths) > self.page_size or any(isinstance(child.data, _MoreEntry) for child in children):
+            # Dossier pagine: la premiere page est reconstruite.
+            node.remove_children()
+            self._add_page(node, paths)
+        else:
+            wanted = set(paths)
+            kept: dict[Path, TreeNode[DirEntry]] = {}
+            for child in children:
+                entry = child.data
+                if (
+                    entry is None
+                    or entry.path not in wanted
+                    or child.allow_expand != self._entry_is_dir.get(entry.path, child.allow_expand)
+                ):
+                    child.remove()
+                else:
+                    kept[entry.path] = child
+            previous: Optional[TreeNode[DirEntry]] = None
+            for path in paths:
+                child = kept.get(path)
+                if child is None:
+                    if previous is not None:
+                        child = self._add_entry(node, path, after=previous)
+                    elif node.children:
+                        child = self._add_entry(node, path, before=0)
+                    else:
+                        child = self._add_entry(node, path)
+                previous = child
+        for path in paths:
+            self._entry_is_dir.pop(path, None)
+
+    def _on_tree_node_selected(self, event: Tree.NodeSelected[DirEntry]) -> None:
+        entry = event.node.data
+        if not isinstance(entry, _MoreEntry):
+            # Comportement standard de DirectoryTree (gestionnaire de la classe parente).
+            return
+        # Page suivante: le noeud "... N autres" est remplace sur place.
+        event.prevent_default()
+        event.stop()
+        parent = event.node.parent
+        event.node.remove()
+        if parent is not None:
+            self._add_page(parent, entry.remaining)
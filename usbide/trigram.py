@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from usbide.encoding import load_text
+from usbide.fileio import atomic_write_bytes
+
+_MAGIC = b"USBTRI1\n"
+_LENGTH = struct.Struct("<I")
+# Au-dela, un fichier n'est pas indexe: il reste candidat a chaque recherche.
+_MAX_FILE_BYTES = 1024 * 1024
+# Compactage des identifiants quand les fichiers supprimes/relus depassent les vivants.
+_COMPACT_MIN_DEAD = 256
+
+# Etat d'un fichier dans la table: trigrammes indexes, binaire (jamais candidat), non indexe.
+_INDEXED, _BINARY, _ALWAYS = 0, 1, 2
+
+
+def trigram_path(root_dir: Path) -> Path:
+    """Index de trigrammes persistant."""
+    return root_dir / ".usbide" / "index" / "trigrams.bin"
+
+
+def trigram_enabled() -> bool:
+    """Index de trigrammes actif (USBIDE_TRIGRAM=0 le desactive)."""
+    return os.environ.get("USBIDE_TRIGRAM", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrammes (en minuscules) d'un texte; zip/set travaillent en C."""
+    lowered = text.lower()
+    return {a + b + c for a, b, c in set(zip(lowered, lowered[1:], lowered[2:]))}
+
+
+def required_literals(query: str, *, regex: bool = False) -> list[str]:
+    """Fragments presents dans tout texte correspondant a la requete.
+
+    Analyse prudente d'une regex: une alternative ou un groupe (qui peut etre
+    optionnel) ne donne aucun fragment, et la recherche n'est pas restreinte.
+    """
+    if not regex:
+        return [query]
+    if "|" in query or "(" in query:
+        return []
+    runs: list[str] = []
+    current = ""
+    i = 0
+    while i < len(query):
+        char = query[i]
+        if char == "\\":
+            if i + 1 >= len(query):
+                break
+            literal = query[i + 1]
+            i += 2
+            if literal.isalnum():
+                # \d, \w, \b, reference arriere...: pas un caractere fixe.
+                runs.append(current)
+                current = ""
+                continue
+        elif char == "[":
+            end = query.find("]", i + 2)
+            runs.append(current)
+            current = ""
+            i = len(query) if end == -1 else end + 1
+            continue
+        elif char in ".^$*+?{}":
+            if char == "{":
+                end = query.find("}", i)
+                i = len(query) if end == -1 else end
+            runs.append(current)
+            current = ""
+            i += 1
+            continue
+        else:
+            literal = char
+            i += 1
+        if i < len(query) and query[i] in "*?{":
+            # Caractere optionnel (ou repete zero fois): il coupe le fragment.
+            runs.append(current)
+            current = ""
+            continue
+        current += literal
+    runs.append(current)
+    return [run for run in runs if run]
+
+
+def query_trigrams(query: str, *, regex: bool = False) -> Optional[set[str]]:
+    """Trigrammes obligatoires d'une requete; None si elle ne permet aucun filtrage."""
+    found: set[str] = set()
+    for literal in required_literals(query, regex=regex):
+        if len(literal) >= 3:
+            found |= trigrams(literal)
+    return found or None
+
+
+class TrigramIndex:
+    """Index trigramme -> fichiers, pour restreindre les candidats d'une recherche.
+
+    Les fichiers sont relus quand leur taille ou leur mtime change (mise a
+    jour en fond apres l'indexation, les sauvegardes et les commandes). Un
+    fichier absent de l'index ou trop gros reste candidat; les candidats sont
+    toujours verifies en relisant les fichiers.
+    Stockage: table des fichiers (JSON) et listes d'identifiants, compresses.
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, root_dir: Path, *, workers: Optional[int] = None) -> None:
+        self.root_dir = Path(os.path.abspath(root_dir))
+        self.path = trigram_path(self.root_dir)
+        self._workers = max(1, workers or min(8, (os.cpu_count() or 1) + 4))
+        # Identifiant -> [chemin, taille, mtime_ns, etat] (None: entree morte).
+        self._files: list[Optional[list]] = []
+        self._ids: dict[str, int] = {}
+        self._postings: dict[str, array] = {}
+        self._dead = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        # Une seule mise a jour a la fois (threads differents).
+        self._update_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    # ---------- persistance ----------
+    def load(self) -> bool:
+        """Lit l'index persistant; False s'il est absent, corrompu ou d'une autre version."""
+        try:
+            raw = self.path.read_bytes()
+            if not raw.startswith(_MAGIC):
+                return False
+            data = zlib.decompress(raw[len(_MAGIC) :])
+            (size,) = _LENGTH.unpack_from(data, 0)
+            offset = _LENGTH.size + size
+            files = json.loads(data[_LENGTH.size : offset].decode("utf-8"))
+            postings: dict[str, array] = {}
+            while offset < len(data):
+                key_len = data[offset]
+                key = data[offset + 1 : offset + 1 + key_len].decode("utf-8")
+                offset += 1 + key_len
+                (count,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                ids = array("I")
+                ids.frombytes(data[offset : offset + count * 4])
+                offset += count * 4
+                if sys.byteorder == "big":
+                    ids.byteswap()
+                postings[key] = ids
+        except (OSError, ValueError, zlib.error, struct.error, IndexError, UnicodeDecodeError):
+            return False
+        if not isinstance(files, list):
+            return False
+        with self._lock:
+            self._files = files
+            self._ids = {entry[0]: file_id for file_id, entry in enumerate(files) if entry is not None}
+            self._dead = len(files) - len(self._ids)
+            self._postings = postings
+            self._dirty = False
+        return True
+
+    def save(self) -> None:
+        """Ecrit l'index s'il a change (atomique; erreurs disque ignorees)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            header = json.dumps(self._files, separators=(",", ":")).encode("utf-8")
+            chunks = [_LENGTH.pack(len(header)), header]
+            for key, ids in self._postings.items():
+                encoded = key.encode("utf-8")
+                if sys.byteorder == "big":
+                    ids = array("I", ids)
+                    ids.byteswap()
+                chunks += [bytes((len(encoded),)), encoded, _LENGTH.pack(len(ids)), ids.tobytes()]
+            self._dirty = False
+        data = _MAGIC + zlib.compress(b"".join(chunks), 6)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.path, data)
+        except OSError:
+            # Index facultatif: une cle en lecture seule ne doit rien casser.
+            pass
+
+    # ---------- mise a jour ----------
+    def update(self, rels: Iterable[str], cancel: Optional[threading.Event] = None) -> int:
+        """Synchronise l'index avec la liste complete des fichiers; retourne le nombre de fichiers relus.
+
+        Les fichiers absents de `rels` sont retires.
+        """
+        rels = list(rels)
+        with self._update_lock:
+            with self._lock:
+                removed = set(self._ids) - set(rels)
+                for rel in removed:
+                    self._forget(rel)
+            return self._reindex(rels, cancel)
+
+    def update_paths(self, rels: Iterable[str]) -> int:
+        """Relit seulement les fichiers donnes (sauvegarde dans l'IDE); les disparus sont retires."""
+        with self._update_lock:
+            return self._reindex(list(rels), None)
+
+    def _reindex(self, rels: list[str], cancel: Optional[threading.Event]) -> int:
+        def scan(rel: str) -> Optional[tuple[str, int, int, int, set[str]]]:
+            if cancel is not None and cancel.is_set():
+                return None
+            path = self.root_dir / rel
+            try:
+                st = path.stat()
+            except OSError:
+                return (rel, -1, -1, _BINARY, set())
+            with self._lock:
+                file_id = self._ids.get(rel)
+                entry = self._files[file_id] if file_id is not None else None
+            if entry is not None and entry[1] == st.st_size and entry[2] == st.st_mtime_ns:
+                return None
+            if st.st_size > _MAX_FILE_BYTES:
+                return (rel, st.st_size, st.st_mtime_ns, _ALWAYS, set())
+            try:
+                loaded = load_text(path)
+            except OSError:
+                return None
+            if loaded.binary:
+                return (rel, st.st_size, st.st_mtime_ns, _BINARY, set())
+            return (rel, st.st_size, st.st_mtime_ns, _INDEXED, trigrams(loaded.text))
+
+        count = 0
+        # Lectures concurrentes (cle USB); la fusion dans l'index reste sequentielle.
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="usbide-trigram") as executor:
+            for result in executor.map(scan, rels):
+                if result is None:
+                    continue
+                rel, size, mtime_ns, state, found = result
+                with self._lock:
+                    self._forget(rel)
+                    if size >= 0:
+                        self._add(rel, size, mtime_ns, state, found)
+                count += 1
+        with self._lock:
+            if self._dead >= _COMPACT_MIN_DEAD and self._dead > len(self._ids):
+                self._compact()
+        return count
+
+    def _forget(self, rel: str) -> None:
+        file_id = self._ids.pop(rel, None)
+        if file_id is None:
+            return
+        # Entree morte: ses identifiants restent dans les listes jusqu'au compactage.
+        self._files[file_id] = None
+        self._dead += 1
+        self._dirty = True
+
+    def _add(self, rel: str, size: int, mtime_ns: int, state: int, found: set[str]) -> None:
+        file_id = len(self._files)
+        self._files.append([rel, size, mtime_ns, state])
+        self._ids[rel] = file_id
+        for key in found:
+            ids = self._postings.get(key)
+            if ids is None:
+                ids = self._postings[key] = array("I")
+            # Identifiants croissants: les listes restent triees.
+            ids.append(file_id)
+        self._dirty = True
+
+    def _compact(self) -> None:
+        remap: dict[int, int] = {}
+        files: list[Optional[list]] = []
+        for file_id, entry in enumerate(self._files):
+            if entry is not None:
+                remap[file_id] = len(files)
+                files.append(entry)
+        postings: dict[str, array] = {}
+        for key, ids in self._postings.items():
+            kept = array("I", (remap[i] for i in ids if i in remap))
+            if kept:
+                postings[key] = kept
+        self._files = files
+        self._ids = {entry[0]: file_id for file_id, entry in enumerate(files) if entry is not None}
+        self._postings = postings
+        self._dead = 0
+        self._dirty = True
+
+    # ---------- requetes ----------
+    def narrow(self, paths: Iterable[str], query: str, *, regex: bool = False) -> list[str]:
+        """Candidats pouvant correspondre a la requete, dans l'ordre de `paths`."""
+        paths = list(paths)
+        wanted = query_trigrams(query, regex=regex)
+        if wanted is None:
+            return paths
+        with self._lock:
+            lists = [self._postings.get(key) for key in wanted]
+            matched: set[int] = set()
+            if all(ids is not None for ids in lists):
+                # Intersection en partant de la liste la plus courte.
+                lists.sort(key=len)
+                matched = set(lists[0])
+                for ids in lists[1:]:
+                    if not matched:
+                        break
+                    matched.intersection_update(ids)
+            ids_by_path = self._ids
+            files = self._files
+            result = []
+            for rel in paths:
+                file_id = ids_by_path.get(rel)
+                entry = files[file_id] if file_id is not None else None
+                if entry is None or entry[3] == _ALWAYS or file_id in matched:
+                    result.append(rel)
+        return result
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import marshal
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import zipfile
+
+# Fichiers qui restent compatibles avec un chargement depuis une archive.
+_ZIP_SAFE_SUFFIXES = {".py", ".pyi", ".pyc", ".typed"}
+
+
+@dataclass
+class BundleReport:
+    path: Path
+    bundled: list[str] = field(default_factory=list)
+    unpacked: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Resume lisible (CLI)."""
+        return (
+            f"Bundle {self.path}: {len(self.bundled)} entree(s) zippee(s), "
+            f"{len(self.unpacked)} laissee(s) dans vendor ({', '.join(self.unpacked) or '-'})"
+        )
+
+
+def vendor_dir(root_dir: Path) -> Path:
+    """Repertoire vendor portable."""
+    return root_dir / ".usbide" / "vendor"
+
+
+def bundle_path(root_dir: Path) -> Path:
+    """Archive zipimport des dependances pures Python."""
+    return root_dir / ".usbide" / "vendor.zip"
+
+
+def manifest_path(root_dir: Path) -> Path:
+    """Manifeste de fraicheur du bundle."""
+    return root_dir / ".usbide" / "vendor-bundle.json"
+
+
+def vendor_signature(vendor: Path) -> list[list[object]]:
+    """Signature du vendor: entrees de premier niveau et leur mtime.
+
+    `pip install --target` remplace les dossiers de paquets, ce qui suffit a
+    invalider le bundle sans parcourir les milliers de fichiers vendor.
+    """
+    with os.scandir(vendor) as it:
+        return sorted([entry.name, entry.stat(follow_symlinks=False).st_mtime_ns] for entry in it)
+
+
+def _needs_unpacked(package: Path) -> bool:
+    """Extensions natives ou fichiers de donnees lus via __file__ => hors archive."""
+    for dirpath, dirnames, filenames in os.walk(package):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for name in filenames:
+            if Path(name).suffix.lower() not in _ZIP_SAFE_SUFFIXES:
+                return True
+    return False
+
+
+def _unchecked_pyc(source: bytes, dfile: str) -> Optional[bytes]:
+    """Bytecode PEP 552 'unchecked-hash': zipimport l'utilise sans comparer de mtime."""
+    try:
+        code = compile(source, dfile, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError):
+        # Fichiers de test volontairement invalides: la source suffit.
+        return None
+    flags = (0b01).to_bytes(4, "little")
+    return importlib.util.MAGIC_NUMBER + flags + importlib.util.source_hash(source) + marshal.dumps(code)
+
+
+def _add_source(bundle: zipfile.ZipFile, archive: Path, source: Path, arcname: str) -> None:
+    data = source.read_bytes()
+    bundle.writestr(arcname, data)
+    pyc = _unchecked_pyc(data, str(archive / arcname))
+    if pyc is not None:
+        # zipimport cherche "module.pyc" a cote de la source (pas de __pycache__).
+        bundle.writestr(arcname[: -len(".py")] + ".pyc", pyc)
+
+
+def build_vendor_bundle(root_dir: Path) -> BundleReport:
+    """Empaquette les paquets purs Python du vendor (sources + bytecode) dans un zip."""
+    # Import local: ce module est charge a chaque demarrage (fresh_vendor_bundle).
+    import zipfile
+
+    vendor = vendor_dir(root_dir)
+    if not vendor.is_dir():
+        raise FileNotFoundError(f"vendor introuvable: {vendor}")
+
+    target = bundle_path(root_dir)
+    report = BundleReport(path=target)
+    tmp = target.with_name(target.name + ".tmp")
+    # ZIP_STORED: aucune decompression au demarrage, une seule ouverture de fichier.
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as bundle:
+        for entry in sorted(vendor.iterdir()):
+            name = entry.name
+            if entry.is_dir():
+                if name == "__pycache__" or "." in name:
+                    # *.dist-info & co: lus depuis vendor (qui reste sur sys.path).
+                    continue
+                if _needs_unpacked(entry):
+                    report.unpacked.append(name)
+                    continue
+                for dirpath, dirnames, filenames in os.walk(entry):
+                    dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+                    for filename in sorted(filenames):
+                        source = Path(dirpath) / filename
+                        arcname = source.relative_to(vendor).as_posix()
+                        if filename.endswith(".py"):
+                            _add_source(bundle, target, source, arcname)
+                        elif not filename.endswith(".pyc"):
+                            bundle.write(source, arcname)
+                report.bundled.append(name)
+            elif entry.suffix == ".py":
+                _add_source(bundle, target, entry, name)
+                report.bundled.append(name)
+    os.replace(tmp, target)
+
+    manifest = {
+        "cache_tag": sys.implementation.cache_tag,
+        "signature": vendor_signature(vendor),
+        "bundled": report.bundled,
+        "unpacked": report.unpacked,
+    }
+    manifest_path(root_dir).write_text(json.dumps(manifest), encoding="utf-8")
+    return report
+
+
+def fresh_vendor_bundle(root_dir: Path) -> Optional[Path]:
+    """Retourne le bundle s'il correspond encore au vendor et a l'interpreteur."""
+    target = bundle_path(root_dir)
+    try:
+        manifest = json.loads(manifest_path(root_dir).read_text(encoding="utf-8"))
+        if not target.is_file():
+            return None
+        if manifest.get("cache_tag") != sys.implementation.cache_tag:
+            return None
+        if manifest.get("signature") != vendor_signature(vendor_dir(root_dir)):
+            return None
+    except (OSError, ValueError, AttributeError):
+        # Manifeste absent/corrompu: on retombe sur le vendor classique.
+        return None
+    return target
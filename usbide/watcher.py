@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+# Evenements inotify utiles: fin d'ecriture, renommages (os.replace), creations/suppressions.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+Signature = tuple[int, int]
+
+
+def file_signature(path: Path) -> Optional[Signature]:
+    """(taille, mtime_ns) d'un chemin, None s'il n'existe plus."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def watcher_settings() -> tuple[str, float]:
+    """Mode (USBIDE_WATCHER: auto/poll/off) et intervalle de scrutation (USBIDE_WATCH_INTERVAL)."""
+    mode = os.environ.get("USBIDE_WATCHER", "auto").strip().lower() or "auto"
+    try:
+        interval = float(os.environ.get("USBIDE_WATCH_INTERVAL", "") or DEFAULT_POLL_INTERVAL)
+    except ValueError:
+        interval = DEFAULT_POLL_INTERVAL
+    return mode, max(0.05, interval)
+
+
+class _Inotify:
+    """Acces minimal a inotify via ctypes (Linux, sans dependance)."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._libc = libc
+        self.fd = fd
+
+    def add(self, directory: Path) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _IN_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(directory))
+        return wd
+
+    def remove(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: float) -> list[tuple[int, int, str]]:
+        """Evenements disponibles (wd, masque, nom), apres au plus `timeout` secondes."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PathWatcher:
+    """Surveille des fichiers et des dossiers; `callback(path)` est appele depuis un thread.
+
+    inotify sous Linux (dossier parent surveille: os.replace change l'inode),
+    sinon scrutation (taille, mtime_ns) a intervalle fixe. Pour un dossier,
+    seuls les ajouts/suppressions/renommages d'entrees directes sont signales.
+    Les evenements sont des indices: l'appelant reverifie l'etat du disque.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Path], None],
+        *,
+        mode: str = "auto",
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self._callback = callback
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._files: set[Path] = set()
+        self._dirs: set[Path] = set()
+        self._signatures: dict[Path, Optional[Signature]] = {}
+        # inotify: dossier surveille -> wd, et wd -> dossier.
+        self._wds: dict[Path, int] = {}
+        self._wd_dirs: dict[int, Path] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self.backend = "off" if mode == "off" else "poll"
+        if mode == "auto" and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+                self.backend = "inotify"
+            except (OSError, AttributeError):
+                # Noyau sans inotify ou libc introuvable: scrutation.
+                self._inotify = None
+
+    # ---------- abonnements ----------
+    def watch(self, path: Path) -> None:
+        if self.backend == "off":
+            return
+        is_dir = path.is_dir()
+        with self._lock:
+            target = self._dirs if is_dir else self._files
+            if path in target:
+                return
+            target.add(path)
+            self._signatures[path] = self._signature(path, is_dir)
+            if self._inotify is not None:
+                self._add_wd(path if is_dir else path.parent)
+        self._ensure_thread()
+
+    def unwatch(self, path: Path) -> None:
+        with self._lock:
+            self._files.discard(path)
+            self._dirs.discard(path)
+            self._signatures.pop(path, None)
+            if self._inotify is not None:
+                for directory in (path, path.parent):
+                    if directory in self._wds and not self._needs_wd(directory):
+                        wd = self._wds.pop(directory)
+                        self._wd_dirs.pop(wd, None)
+                        self._inotify.remove(wd)
+
+    def watched(self) -> set[Path]:
+        with self._lock:
+            return self._files | self._dirs
+
+    def _needs_wd(self, directory: Path) -> bool:
+        return directory in self._dirs or any(path.parent == directory for path in self._files)
+
+    def _add_wd(self, directory: Path) -> None:
+        assert self._inotify is not None
+        if directory in self._wds:
+            return
+        try:
+            wd = self._inotify.add(directory)
+        except OSError:
+            # Limite max_user_watches atteinte ou dossier disparu: l'appelant reverifie.
+            return
+        self._wds[directory] = wd
+        self._wd_dirs[wd] = directory
+
+    @staticmethod
+    def _signature(path: Path, is_dir: bool) -> Optional[Signature]:
+        sig = file_signature(path)
+        # Un dossier change de mtime (pas de taille fiable) quand ses entrees changent.
+        return (0, sig[1]) if sig is not None and is_dir else sig
+
+    # ---------- boucle ----------
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="usbide-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                changed = self._read_inotify() if self._inotify is not None else self._poll()
+            except (OSError, ValueError):
+                # Descripteur ferme pendant l'arret.
+                return
+            for path in sorted(changed):
+                self._callback(path)
+
+    def _read_inotify(self) -> set[Path]:
+        assert self._inotify is not None
+        events = self._inotify.read(0.5)
+        changed: set[Path] = set()
+        with self._lock:
+            for wd, mask, name in events:
+                if mask & _IN_Q_OVERFLOW:
+                    # File d'evenements saturee: tout est a reverifier.
+                    return self._files | self._dirs
+                directory = self._wd_dirs.get(wd)
+                if directory is None:
+                    continue
+                if directory in self._dirs and (mask & ~_IN_CLOSE_WRITE):
+                    changed.add(directory)
+                if name and directory / name in self._files:
+                    changed.add(directory / name)
+        return changed
+
+    def _poll(self) -> set[Path]:
+        if self._stop.wait(self._poll_interval):
+            return set()
+        with self._lock:
+            watched = [(path, path in self._dirs) for path in self._files | self._dirs]
+        changed: set[Path] = set()
+        for path, is_dir in watched:
+            sig = self._signature(path, is_dir)
+            with self._lock:
+                if path not in self._signatures:
+                    continue
+                if self._signatures[path] != sig:
+                    self._signatures[path] = sig
+                    changed.add(path)
+        return changed